@@ -11,6 +11,8 @@ import random
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
+
 from database import Database
 from divine_arsenal.backend.data_loader import data_loader
 
@@ -293,7 +295,30 @@ class AdvancedGodAnalyzer:
         if god_name not in self.god_stats:
             return ItemSynergy(0.5, 0.5, 0.5, 0.5, 0.5)  # Default neutral
 
+        return self._item_synergy(self.god_stats[god_name], god_name, item, role)
+
+    def calculate_item_synergies(
+        self, god_name: str, items: List[Dict[str, Any]], role: str
+    ) -> np.ndarray:
+        """Total synergy of each item for one god and role, as a float array.
+
+        Same scores as calculate_item_synergy(...).total_synergy, with the god lookup
+        done once for the whole batch.
+        """
+        if god_name not in self.god_stats:
+            return np.full(len(items), ItemSynergy(0.5, 0.5, 0.5, 0.5, 0.5).total_synergy)
+
         god_stats = self.god_stats[god_name]
+        return np.fromiter(
+            (self._item_synergy(god_stats, god_name, item, role).total_synergy for item in items),
+            dtype=np.float64,
+            count=len(items),
+        )
+
+    def _item_synergy(
+        self, god_stats: GodStats, god_name: str, item: Dict[str, Any], role: str
+    ) -> ItemSynergy:
+        """Synergy components of one item for an already looked-up god."""
         item_stats = item.get("stats", {})
 
         # 1. Stat Efficiency (how well item stats complement god stats)
@@ -114,10 +114,11 @@ except Exception as e:
 
 # Initialize user authentication and community components
 try:
-    from user_auth import UserAuth
+    from user_auth import get_user_auth
     from community_dashboard import CommunityDashboard
 
-    user_auth = UserAuth()
+    # Same instance community_api validates tokens with, so logouts here apply there
+    user_auth = get_user_auth()
     community_dashboard = CommunityDashboard()
     print("✅ User Authentication & Community Dashboard initialized successfully")
 except Exception as e:
@@ -12,7 +12,7 @@ from typing import Dict, Any
 from flask import Blueprint, request, jsonify, current_app, g
 from flask_cors import CORS
 
-from user_auth import UserAuth
+from user_auth import get_user_auth
 from community_dashboard import CommunityDashboard
 
 # Configure logging
@@ -23,7 +23,7 @@ community_bp = Blueprint('community', __name__, url_prefix='/api/community')
 CORS(community_bp)
 
 # Initialize components
-user_auth = UserAuth()
+user_auth = get_user_auth()
 community_dashboard = CommunityDashboard()
 
 
@@ -196,7 +196,7 @@ def get_profile():
     from flask import g
     return jsonify({
         "success": True,
-        "user": g.current_user
+        "user": user_auth.get_user_by_id(g.current_user['user_id'])
     })
 
 
@@ -392,15 +392,17 @@ class CommunityDashboard:
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT u.user_id, u.username, u.avatar_url, u.rank, u.level,
-                       u.favorite_role, u.is_online, u.status, pm.role as party_role
+                       u.favorite_role, COALESCE(os.is_online, FALSE) AS is_online,
+                       COALESCE(os.status, 'offline') AS status, pm.role as party_role
                 FROM party_members pm
                 JOIN users u ON pm.user_id = u.user_id
+                LEFT JOIN online_status os ON os.user_id = u.user_id
                 WHERE pm.party_id = ?
                 ORDER BY pm.role DESC, u.username ASC
             """, (party_id,))
 
             members = []
-            for _row in cursor.fetchall():
+            for row in cursor.fetchall():
                 members.append({
                     'user_id': row[0],
                     'username': row[1],
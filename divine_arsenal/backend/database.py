@@ -1,11 +1,53 @@
 """Database setup and operations for Divine Arsenal."""
 
+import json
 import sqlite3
 from contextlib import contextmanager
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 
+GOD_INSERT_SQL = """
+    INSERT OR REPLACE INTO gods (
+        name, role, damage_type, pantheon, type,
+        health, mana, physical_power, magical_power,
+        physical_protection, magical_protection,
+        attack_speed, movement_speed, speed, range_val,
+        intelligence, strength, scaling_info, lore, image_url
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+ITEM_INSERT_SQL = """
+    INSERT OR REPLACE INTO items (
+        name, type, tier, cost, category, description, passive, active,
+        physical_power, magical_power, physical_protection, magical_protection,
+        health, mana, movement_speed, attack_speed, cooldown_reduction,
+        penetration, lifesteal, crit_chance, crit_damage, image_url, updated_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+"""
+
+PATCH_INSERT_SQL = (
+    "INSERT INTO patches (version, title, date, content, url, source) VALUES (?, ?, ?, ?, ?, ?)"
+)
+
+# Item stats stored as columns of the items table; anything else goes to item_stats
+ITEM_STAT_COLUMNS = (
+    "physical_power",
+    "magical_power",
+    "physical_protection",
+    "magical_protection",
+    "health",
+    "mana",
+    "movement_speed",
+    "attack_speed",
+    "cooldown_reduction",
+    "penetration",
+    "lifesteal",
+    "crit_chance",
+    "crit_damage",
+)
+
+
 class Database:
     """Handles database operations for Divine Arsenal."""
 
@@ -303,10 +345,7 @@ class Database:
         """
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                "INSERT INTO patches (version, title, date, content, url, source) VALUES (?, ?, ?, ?, ?, ?)",
-                (version, title, date, notes, url, source),
-            )
+            cursor.execute(PATCH_INSERT_SQL, (version, title, date, notes, url, source))
             conn.commit()
             return cursor.lastrowid if cursor.lastrowid is not None else 0
 
@@ -411,39 +450,7 @@ class Database:
             cursor = conn.cursor()
 
             # Insert or update god
-            cursor.execute(
-                """
-                INSERT OR REPLACE INTO gods (
-                    name, role, damage_type, pantheon, type,
-                    health, mana, physical_power, magical_power,
-                    physical_protection, magical_protection,
-                    attack_speed, movement_speed, speed, range_val, 
-                    intelligence, strength, scaling_info, lore, image_url
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    god_data.get("name", ""),
-                    god_data.get("role", ""),
-                    god_data.get("damage_type", ""),
-                    god_data.get("pantheon", ""),
-                    god_data.get("type", ""),
-                    god_data.get("health", 0),
-                    god_data.get("mana", 0),
-                    god_data.get("physical_power", 0),
-                    god_data.get("magical_power", 0),
-                    god_data.get("physical_protection", 0),
-                    god_data.get("magical_protection", 0),
-                    god_data.get("attack_speed", 0),
-                    god_data.get("movement_speed", 0),
-                    god_data.get("speed", 0),
-                    god_data.get("range_val", 0),
-                    god_data.get("intelligence", ""),
-                    god_data.get("strength", ""),
-                    god_data.get("scaling_info", ""),
-                    god_data.get("lore", ""),
-                    god_data.get("image_url", ""),
-                ),
-            )
+            cursor.execute(GOD_INSERT_SQL, self._god_row(god_data))
 
             god_id = (
                 cursor.lastrowid
@@ -457,45 +464,9 @@ class Database:
             cursor.execute("DELETE FROM god_relationships WHERE god_id = ?", (god_id,))
             cursor.execute("DELETE FROM god_playstyles WHERE god_id = ?", (god_id,))
 
-            # Add abilities
-            if "abilities" in god_data and isinstance(god_data["abilities"], list):
-                for ability in god_data["abilities"]:
-                    if isinstance(ability, dict):
-                        cursor.execute(
-                            """
-                            INSERT INTO god_abilities (god_id, name, description, ability_type)
-                            VALUES (?, ?, ?, ?)
-                            """,
-                            (
-                                god_id,
-                                ability.get("name", ""),
-                                ability.get("description", ""),
-                                ability.get("type", ""),
-                            ),
-                        )
-
-            # Add relationships (counter_gods, strong_against, weak_against)
-            for relationship_type in ["counter_gods", "strong_against", "weak_against"]:
-                if relationship_type in god_data and isinstance(god_data[relationship_type], list):
-                    for related_god in god_data[relationship_type]:
-                        cursor.execute(
-                            """
-                            INSERT INTO god_relationships (god_id, related_god_name, relationship_type)
-                            VALUES (?, ?, ?)
-                            """,
-                            (god_id, related_god, relationship_type),
-                        )
-
-            # Add playstyles
-            if "playstyle" in god_data and isinstance(god_data["playstyle"], list):
-                for style in god_data["playstyle"]:
-                    cursor.execute(
-                        """
-                        INSERT INTO god_playstyles (god_id, playstyle)
-                        VALUES (?, ?)
-                        """,
-                        (god_id, style),
-                    )
+            # Add abilities, relationships and playstyles
+            abilities, relationships, playstyles = self._god_child_rows(god_id, god_data)
+            self._insert_god_children(cursor, abilities, relationships, playstyles)
 
             conn.commit()
             return god_id
@@ -599,53 +570,9 @@ class Database:
         with self.get_connection() as conn:
             cursor = conn.cursor()
 
-            # Extract stats from nested dict if present, handle JSON strings
-            stats_raw = item_data.get("stats", {})
-            if isinstance(stats_raw, str):
-                try:
-                    import json
-
-                    stats = json.loads(stats_raw)
-                except (json.JSONDecodeError, TypeError):
-                    stats = {}
-            else:
-                stats = stats_raw if isinstance(stats_raw, dict) else {}
-
             # Insert or update item
-            cursor.execute(
-                """
-                INSERT OR REPLACE INTO items (
-                    name, type, tier, cost, category, description, passive, active,
-                    physical_power, magical_power, physical_protection, magical_protection,
-                    health, mana, movement_speed, attack_speed, cooldown_reduction,
-                    penetration, lifesteal, crit_chance, crit_damage, image_url, updated_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                """,
-                (
-                    item_data.get("name", ""),
-                    item_data.get("type", ""),
-                    item_data.get("tier", ""),
-                    item_data.get("cost", 0),
-                    item_data.get("category", ""),
-                    item_data.get("description", ""),
-                    item_data.get("passive", ""),
-                    item_data.get("active", ""),
-                    stats.get("physical_power", 0),
-                    stats.get("magical_power", 0),
-                    stats.get("physical_protection", 0),
-                    stats.get("magical_protection", 0),
-                    stats.get("health", 0),
-                    stats.get("mana", 0),
-                    stats.get("movement_speed", 0),
-                    stats.get("attack_speed", 0),
-                    stats.get("cooldown_reduction", 0),
-                    stats.get("penetration", 0),
-                    stats.get("lifesteal", 0),
-                    stats.get("crit_chance", 0),
-                    stats.get("crit_damage", 0),
-                    item_data.get("image_url", ""),
-                ),
-            )
+            stats = self._item_stats(item_data)
+            cursor.execute(ITEM_INSERT_SQL, self._item_row(item_data, stats))
 
             item_id = (
                 cursor.lastrowid
@@ -658,46 +585,288 @@ class Database:
             cursor.execute("DELETE FROM item_tags WHERE item_id = ?", (item_id,))
             cursor.execute("DELETE FROM item_stats WHERE item_id = ?", (item_id,))
 
-            # Add tags - handle JSON strings
-            tags_raw = item_data.get("tags", [])
-            if isinstance(tags_raw, str):
-                try:
-                    import json
-
-                    tags = json.loads(tags_raw)
-                except (json.JSONDecodeError, TypeError):
-                    tags = []
-            else:
-                tags = tags_raw if isinstance(tags_raw, list) else []
-
-            for tag in tags:
-                cursor.execute("INSERT INTO item_tags (item_id, tag) VALUES (?, ?)", (item_id, tag))
-
-            # Add any additional stats that don't fit in main table
-            for stat_name, stat_value in stats.items():
-                if stat_name not in [
-                    "physical_power",
-                    "magical_power",
-                    "physical_protection",
-                    "magical_protection",
-                    "health",
-                    "mana",
-                    "movement_speed",
-                    "attack_speed",
-                    "cooldown_reduction",
-                    "penetration",
-                    "lifesteal",
-                    "crit_chance",
-                    "crit_damage",
-                ]:
-                    cursor.execute(
-                        "INSERT INTO item_stats (item_id, stat_name, stat_value) VALUES (?, ?, ?)",
-                        (item_id, stat_name, stat_value),
-                    )
+            # Add tags and any additional stats that don't fit in main table
+            tags, extra_stats = self._item_child_rows(item_id, item_data, stats)
+            cursor.executemany("INSERT INTO item_tags (item_id, tag) VALUES (?, ?)", tags)
+            cursor.executemany(
+                "INSERT INTO item_stats (item_id, stat_name, stat_value) VALUES (?, ?, ?)",
+                extra_stats,
+            )
 
             conn.commit()
             return item_id
 
+    def add_gods_bulk(
+        self, gods: List[Dict[str, Any]], cursor: Optional[sqlite3.Cursor] = None
+    ) -> int:
+        """Add or update many gods using batched statements.
+
+        Args:
+            gods: God dictionaries in the format accepted by add_god
+            cursor: Cursor of an open transaction to write into; if omitted, a
+                connection is opened and committed here
+
+        Returns:
+            The number of gods written
+        """
+        if cursor is None:
+            with self.get_connection() as conn:
+                count = self.add_gods_bulk(gods, conn.cursor())
+                conn.commit()
+                return count
+
+        if not gods:
+            return 0
+
+        cursor.executemany(GOD_INSERT_SQL, [self._god_row(god) for god in gods])
+        god_ids = self._ids_by_name(cursor, "gods", (god.get("name") for god in gods))
+
+        id_rows = [(god_id,) for god_id in set(god_ids.values())]
+        cursor.executemany("DELETE FROM god_abilities WHERE god_id = ?", id_rows)
+        cursor.executemany("DELETE FROM god_relationships WHERE god_id = ?", id_rows)
+        cursor.executemany("DELETE FROM god_playstyles WHERE god_id = ?", id_rows)
+
+        # Later duplicates replace earlier ones, as with repeated add_god calls
+        latest = {god.get("name"): god for god in gods}
+        abilities: List[tuple] = []
+        relationships: List[tuple] = []
+        playstyles: List[tuple] = []
+        for name, god in latest.items():
+            god_abilities, god_relationships, god_playstyles = self._god_child_rows(
+                god_ids[name], god
+            )
+            abilities.extend(god_abilities)
+            relationships.extend(god_relationships)
+            playstyles.extend(god_playstyles)
+        self._insert_god_children(cursor, abilities, relationships, playstyles)
+
+        return len(gods)
+
+    def add_items_bulk(
+        self, items: List[Dict[str, Any]], cursor: Optional[sqlite3.Cursor] = None
+    ) -> int:
+        """Add or update many items using batched statements.
+
+        Args:
+            items: Item dictionaries in the format accepted by add_item
+            cursor: Cursor of an open transaction to write into; if omitted, a
+                connection is opened and committed here
+
+        Returns:
+            The number of items written
+        """
+        if cursor is None:
+            with self.get_connection() as conn:
+                count = self.add_items_bulk(items, conn.cursor())
+                conn.commit()
+                return count
+
+        if not items:
+            return 0
+
+        item_stats = [self._item_stats(item) for item in items]
+        cursor.executemany(
+            ITEM_INSERT_SQL,
+            [self._item_row(item, stats) for item, stats in zip(items, item_stats)],
+        )
+        item_ids = self._ids_by_name(cursor, "items", (item.get("name") for item in items))
+
+        id_rows = [(item_id,) for item_id in set(item_ids.values())]
+        cursor.executemany("DELETE FROM item_tags WHERE item_id = ?", id_rows)
+        cursor.executemany("DELETE FROM item_stats WHERE item_id = ?", id_rows)
+
+        # Later duplicates replace earlier ones, as with repeated add_item calls
+        latest = {item.get("name"): (item, stats) for item, stats in zip(items, item_stats)}
+        tags: List[tuple] = []
+        extra_stats: List[tuple] = []
+        for name, (item, stats) in latest.items():
+            item_tags, item_extra_stats = self._item_child_rows(item_ids[name], item, stats)
+            tags.extend(item_tags)
+            extra_stats.extend(item_extra_stats)
+        cursor.executemany("INSERT INTO item_tags (item_id, tag) VALUES (?, ?)", tags)
+        cursor.executemany(
+            "INSERT INTO item_stats (item_id, stat_name, stat_value) VALUES (?, ?, ?)",
+            extra_stats,
+        )
+
+        return len(items)
+
+    def add_patches_bulk(
+        self, patches: List[Dict[str, Any]], cursor: Optional[sqlite3.Cursor] = None
+    ) -> int:
+        """Add many patches in one batched insert.
+
+        Args:
+            patches: Dictionaries with version, date, notes and optional title, url and source
+            cursor: Cursor of an open transaction to write into; if omitted, a
+                connection is opened and committed here
+
+        Returns:
+            The number of patches written
+        """
+        if cursor is None:
+            with self.get_connection() as conn:
+                count = self.add_patches_bulk(patches, conn.cursor())
+                conn.commit()
+                return count
+
+        cursor.executemany(
+            PATCH_INSERT_SQL,
+            [
+                (
+                    patch["version"],
+                    patch.get("title", ""),
+                    patch["date"],
+                    patch["notes"],
+                    patch.get("url", ""),
+                    patch.get("source", "manual"),
+                )
+                for patch in patches
+            ],
+        )
+        return len(patches)
+
+    @staticmethod
+    def _ids_by_name(cursor: sqlite3.Cursor, table: str, names) -> Dict[str, int]:
+        """Map names to row ids in the gods or items table."""
+        wanted = set(names)
+        return {
+            name: row_id
+            for row_id, name in cursor.execute(f"SELECT id, name FROM {table}")
+            if name in wanted
+        }
+
+    @staticmethod
+    def _god_row(god_data: Dict[str, Any]) -> tuple:
+        """Build the gods table row for a god dictionary."""
+        return (
+            god_data.get("name", ""),
+            god_data.get("role", ""),
+            god_data.get("damage_type", ""),
+            god_data.get("pantheon", ""),
+            god_data.get("type", ""),
+            god_data.get("health", 0),
+            god_data.get("mana", 0),
+            god_data.get("physical_power", 0),
+            god_data.get("magical_power", 0),
+            god_data.get("physical_protection", 0),
+            god_data.get("magical_protection", 0),
+            god_data.get("attack_speed", 0),
+            god_data.get("movement_speed", 0),
+            god_data.get("speed", 0),
+            god_data.get("range_val", 0),
+            god_data.get("intelligence", ""),
+            god_data.get("strength", ""),
+            god_data.get("scaling_info", ""),
+            god_data.get("lore", ""),
+            god_data.get("image_url", ""),
+        )
+
+    @staticmethod
+    def _god_child_rows(god_id: int, god_data: Dict[str, Any]):
+        """Build ability, relationship and playstyle rows for a god."""
+        abilities = []
+        if "abilities" in god_data and isinstance(god_data["abilities"], list):
+            for ability in god_data["abilities"]:
+                if isinstance(ability, dict):
+                    abilities.append(
+                        (
+                            god_id,
+                            ability.get("name", ""),
+                            ability.get("description", ""),
+                            ability.get("type", ""),
+                        )
+                    )
+
+        # Relationships: counter_gods, strong_against, weak_against
+        relationships = []
+        for relationship_type in ["counter_gods", "strong_against", "weak_against"]:
+            if relationship_type in god_data and isinstance(god_data[relationship_type], list):
+                for related_god in god_data[relationship_type]:
+                    relationships.append((god_id, related_god, relationship_type))
+
+        playstyles = []
+        if "playstyle" in god_data and isinstance(god_data["playstyle"], list):
+            playstyles = [(god_id, style) for style in god_data["playstyle"]]
+
+        return abilities, relationships, playstyles
+
+    @staticmethod
+    def _insert_god_children(cursor: sqlite3.Cursor, abilities, relationships, playstyles):
+        """Insert prepared ability, relationship and playstyle rows."""
+        cursor.executemany(
+            """
+            INSERT INTO god_abilities (god_id, name, description, ability_type)
+            VALUES (?, ?, ?, ?)
+            """,
+            abilities,
+        )
+        cursor.executemany(
+            """
+            INSERT INTO god_relationships (god_id, related_god_name, relationship_type)
+            VALUES (?, ?, ?)
+            """,
+            relationships,
+        )
+        cursor.executemany(
+            """
+            INSERT INTO god_playstyles (god_id, playstyle)
+            VALUES (?, ?)
+            """,
+            playstyles,
+        )
+
+    @staticmethod
+    def _item_stats(item_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract stats from nested dict if present, handling JSON strings."""
+        stats_raw = item_data.get("stats", {})
+        if isinstance(stats_raw, str):
+            try:
+                stats = json.loads(stats_raw)
+            except (json.JSONDecodeError, TypeError):
+                stats = {}
+        else:
+            stats = stats_raw
+        return stats if isinstance(stats, dict) else {}
+
+    @staticmethod
+    def _item_row(item_data: Dict[str, Any], stats: Dict[str, Any]) -> tuple:
+        """Build the items table row for an item dictionary."""
+        return (
+            item_data.get("name", ""),
+            item_data.get("type", ""),
+            item_data.get("tier", ""),
+            item_data.get("cost", 0),
+            item_data.get("category", ""),
+            item_data.get("description", ""),
+            item_data.get("passive", ""),
+            item_data.get("active", ""),
+            *(stats.get(column, 0) for column in ITEM_STAT_COLUMNS),
+            item_data.get("image_url", ""),
+        )
+
+    @staticmethod
+    def _item_child_rows(item_id: int, item_data: Dict[str, Any], stats: Dict[str, Any]):
+        """Build tag rows and rows for stats that don't fit in the items table."""
+        tags_raw = item_data.get("tags", [])
+        if isinstance(tags_raw, str):
+            try:
+                tags = json.loads(tags_raw)
+            except (json.JSONDecodeError, TypeError):
+                tags = []
+        else:
+            tags = tags_raw
+        if not isinstance(tags, list):
+            tags = []
+
+        tag_rows = [(item_id, tag) for tag in tags]
+        stat_rows = [
+            (item_id, stat_name, stat_value)
+            for stat_name, stat_value in stats.items()
+            if stat_name not in ITEM_STAT_COLUMNS
+        ]
+        return tag_rows, stat_rows
+
     def get_item(self, name: str) -> Optional[Dict[str, Any]]:
         """Get item data by name.
 
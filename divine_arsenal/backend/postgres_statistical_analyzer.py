@@ -6,10 +6,12 @@ Migration from SQLite to PostgreSQL using the unified database adapter
 
 import json
 import logging
-import statistics
-from collections import defaultdict
+import os
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from itertools import combinations
 from typing import Any, Dict, List, Optional, Tuple
 import numpy as np
 from sqlalchemy import text
@@ -18,8 +20,41 @@ from postgres_database_adapter import PostgreSQLDatabaseAdapter
 
 logger = logging.getLogger(__name__)
 
+# Pair enumeration is sharded across processes above this many matches
+PARALLEL_PAIR_THRESHOLD = 10_000
+PAIR_SHARD_SIZE = 2_500
 
-@dataclass
+
+def _count_item_pairs(
+    shard: Tuple[int, List[Tuple[List[str], bool]]]
+) -> Tuple[Counter, Counter, Dict[Tuple[str, str], int]]:
+    """Count matches and wins per item pair for one shard of (items, win) rows.
+
+    Returns pair match counts, pair win counts and the first match index each
+    pair was seen at, offset by the shard's starting position.
+    """
+    offset, rows = shard
+    pair_counts: Counter = Counter()
+    pair_wins: Counter = Counter()
+    first_seen: Dict[Tuple[str, str], int] = {}
+
+    for match_idx, (items, win) in enumerate(rows, offset):
+        # Repeated items would otherwise produce self-pairs and double counts
+        items = list(dict.fromkeys(items))
+        if len(items) < 2:
+            continue
+
+        for a, b in combinations(items, 2):
+            pair = (a, b) if a <= b else (b, a)
+            pair_counts[pair] += 1
+            if win:
+                pair_wins[pair] += 1
+            first_seen.setdefault(pair, match_idx)
+
+    return pair_counts, pair_wins, first_seen
+
+
+@dataclass(slots=True, frozen=True)
 class MatchData:
     """Represents match performance data."""
     match_id: str
@@ -40,7 +75,7 @@ class MatchData:
     player_skill: str = "Average"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ItemSynergy:
     """Statistical item synergy data."""
     item1: str
@@ -52,7 +87,7 @@ class ItemSynergy:
     patch_relevant: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GodPerformance:
     """God statistical performance data."""
     god_name: str
@@ -68,7 +103,7 @@ class GodPerformance:
     meta_tier: str  # S+, S, A, B, C
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MetaTrend:
     """Meta trend analysis."""
     trend_type: str  # "item_popularity", "god_tier", "role_shift"
@@ -279,33 +314,30 @@ class PostgreSQLStatisticalAnalyzer:
                 logger.error(f"Error loading match data: {e}")
                 return []
 
-        # Group matches by item combinations
-        item_combinations = defaultdict(list)
+        # Count matches and wins per item pair
+        pair_counts, pair_wins, first_seen = self._count_pairs(match_data)
 
+        # Individual item [wins, matches] counts, gathered in a single pass
+        item_stats: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
         for match in match_data:
-            items = match.items
-            # Generate all pairs of items
-            for i in range(len(items)):
-                for j in range(i + 1, len(items)):
-                    pair = tuple(sorted([items[i], items[j]]))
-                    item_combinations[pair].append(match)
+            for item in set(match.items):
+                item_stats[item][0] += int(match.win)
+                item_stats[item][1] += 1
 
         # Analyze each combination
-        for (item1, item2), matches in item_combinations.items():
-            if len(matches) < min_matches:
+        for (item1, item2), pair_count in pair_counts.items():
+            if pair_count < min_matches:
                 continue
 
             # Calculate synergy metrics
-            win_rate = sum(1 for m in matches if m.win) / len(matches)
+            win_rate = pair_wins[(item1, item2)] / pair_count
 
             # Compare to individual item win rates
-            item1_matches = [m for m in match_data if item1 in m.items]
-            item2_matches = [m for m in match_data if item2 in m.items]
+            item1_wins, item1_count = item_stats[item1]
+            item2_wins, item2_count = item_stats[item2]
 
-            item1_wr = (sum(1 for m in item1_matches if m.win) / len(item1_matches)
-                       if item1_matches else 0.5)
-            item2_wr = (sum(1 for m in item2_matches if m.win) / len(item2_matches)
-                       if item2_matches else 0.5)
+            item1_wr = item1_wins / item1_count if item1_count else 0.5
+            item2_wr = item2_wins / item2_count if item2_count else 0.5
 
             # Calculate synergy score
             expected_wr = (item1_wr + item2_wr) / 2
@@ -313,22 +345,50 @@ class PostgreSQLStatisticalAnalyzer:
             synergy_score = min(100, max(0, synergy_boost * 200))
 
             # Calculate confidence level
-            confidence = min(1.0, len(matches) / 200)
+            confidence = min(1.0, pair_count / 200)
 
             synergies.append(ItemSynergy(
                 item1=item1,
                 item2=item2,
                 synergy_score=synergy_score,
                 win_rate_boost=synergy_boost,
-                matches_analyzed=len(matches),
+                matches_analyzed=pair_count,
                 confidence_level=confidence,
-                patch_relevant=matches[0].patch_version if matches else "Unknown"
+                patch_relevant=match_data[first_seen[(item1, item2)]].patch_version
             ))
 
         # Store synergies in PostgreSQL
         self._store_synergies(synergies)
         return synergies
 
+    def _count_pairs(
+        self, match_data: List[MatchData]
+    ) -> Tuple[Counter, Counter, Dict[Tuple[str, str], int]]:
+        """Enumerate item pairs across matches, sharding large datasets across processes."""
+        rows = [(match.items, match.win) for match in match_data]
+        if len(rows) <= PARALLEL_PAIR_THRESHOLD:
+            return _count_item_pairs((0, rows))
+
+        shards = [
+            (start, rows[start : start + PAIR_SHARD_SIZE])
+            for start in range(0, len(rows), PAIR_SHARD_SIZE)
+        ]
+        workers = os.cpu_count() or 1
+        chunksize = max(1, len(shards) // (workers * 2))
+
+        pair_counts: Counter = Counter()
+        pair_wins: Counter = Counter()
+        first_seen: Dict[Tuple[str, str], int] = {}
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Shards come back in order, so the first index seen for a pair is the lowest
+            for counts, wins, seen in executor.map(_count_item_pairs, shards, chunksize=chunksize):
+                pair_counts.update(counts)
+                pair_wins.update(wins)
+                for pair, match_idx in seen.items():
+                    first_seen.setdefault(pair, match_idx)
+
+        return pair_counts, pair_wins, first_seen
+
     def predict_build_success(self, god: str, role: str, items: List[str], 
                             enemy_comp: List[str], patch: str = "OB12") -> Dict[str, float]:
         """Predict build success using statistical analysis."""
@@ -370,11 +430,15 @@ class PostgreSQLStatisticalAnalyzer:
             similar_builds = [m for m in matches if len(set(m.items) & set(items)) >= 3]
             
             if similar_builds:
-                win_rate = sum(1 for m in similar_builds if m.win) / len(similar_builds)
-                avg_kda = statistics.mean(
-                    (m.kills + m.assists) / max(1, m.deaths) for m in similar_builds
-                )
-                avg_damage = statistics.mean(m.damage_dealt for m in similar_builds)
+                wins = np.array([m.win for m in similar_builds], dtype=bool)
+                kills = np.array([m.kills for m in similar_builds], dtype=float)
+                deaths = np.array([m.deaths for m in similar_builds], dtype=float)
+                assists = np.array([m.assists for m in similar_builds], dtype=float)
+                damage = np.array([m.damage_dealt for m in similar_builds], dtype=float)
+
+                win_rate = int(np.count_nonzero(wins)) / len(similar_builds)
+                avg_kda = float(((kills + assists) / np.maximum(deaths, 1)).mean())
+                avg_damage = float(damage.mean())
             else:
                 return self._heuristic_prediction(god, role, items, enemy_comp, patch)
 
@@ -2,16 +2,132 @@
 
 import json
 import logging
+import operator
 import re
+import threading
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 from urllib.parse import urljoin
 
 import requests
 from bs4 import BeautifulSoup, Tag
+from cachetools import TTLCache, cachedmethod
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
 
 logger = logging.getLogger(__name__)
 
+# Patch-note patterns are applied once per heading/page, so compile them at import time.
+_PATCH_HEADING_VERSION_RE = re.compile(r"(\d+\.?\d*\.?\d*)")
+_VERSION_RE = re.compile(r"(\d+\.\d+(?:\.\d+)?)")
+_DATE_RE = re.compile(r"(\d{4}-\d{2}-\d{2}|\w+ \d+, \d{4})")
+
+# (connect, read) timeout in seconds for every wiki request
+REQUEST_TIMEOUT = (3.05, 10)
+
+# Known Smite 2 gods based on the official wiki
+SMITE2_GODS = (
+    # Arthurian
+    "Merlin",
+    "Mordred",
+    # Celtic
+    "Cernunnos",
+    "The Morrigan",
+    # Chinese
+    "Guan Yu",
+    "Hua Mulan",
+    "Jing Wei",
+    "Nu Wa",
+    "Sun Wukong",
+    # Egyptian
+    "Anhur",
+    "Anubis",
+    "Geb",
+    "Khepri",
+    "Neith",
+    "Ra",
+    "Sobek",
+    # Greek
+    "Achilles",
+    "Aphrodite",
+    "Apollo",
+    "Ares",
+    "Artemis",
+    "Athena",
+    "Cerberus",
+    "Hades",
+    "Hecate",
+    "Medusa",
+    "Nemesis",
+    "Poseidon",
+    "Scylla",
+    "Thanatos",
+    "Zeus",
+    # Hindu
+    "Agni",
+    "Ganesha",
+    "Kali",
+    "Rama",
+    # Japanese
+    "Amaterasu",
+    "Danzaburou",
+    "Izanami",
+    "Susano",
+    # Korean
+    "Princess Bari",
+    # Maya
+    "Awilix",
+    "Cabrakan",
+    "Chaac",
+    "Hun Batz",
+    "Kukulkan",
+    # Norse
+    "Fenrir",
+    "Loki",
+    "Odin",
+    "Sol",
+    "Thor",
+    "Ullr",
+    "Ymir",
+    # Polynesian
+    "Pele",
+    # Roman
+    "Bacchus",
+    "Bellona",
+    "Cupid",
+    "Hercules",
+    "Mercury",
+    "Vulcan",
+    # Tales of Arabia
+    "Aladdin",
+    # Voodoo
+    "Baron Samedi",
+    # Yoruba
+    "Yemoja",
+)
+
+
+def _parse_json(response: requests.Response) -> Any:
+    """Decode a JSON response body straight from bytes, using orjson when installed.
+
+    Decode failures are raised as a RequestException so callers' existing
+    error handling keeps working.
+    """
+    try:
+        return _json_loads(response.content)
+    except ValueError as e:
+        raise requests.exceptions.InvalidJSONError(
+            f"Invalid JSON from {response.url}: {e}", response=response
+        ) from e
+
 
 class WikiSmite2Scraper:
     """Scraper for Smite 2 Wiki at wiki.smite2.com.
@@ -20,8 +136,13 @@ class WikiSmite2Scraper:
     The wiki uses MediaWiki structure which provides predictable HTML patterns.
     """
 
-    def __init__(self) -> None:
-        """Initialize the scraper with base URL and headers."""
+    def __init__(self, session: Optional[requests.Session] = None) -> None:
+        """Initialize the scraper with base URL and headers.
+
+        Args:
+            session: Session to send wiki requests through, e.g. a cached session;
+                a new requests.Session is created when omitted
+        """
         self.base_url = "https://wiki.smite2.com"
         self.api_url = f"{self.base_url}/api.php"
         self.headers = {
@@ -29,6 +150,36 @@ class WikiSmite2Scraper:
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
             "Accept-Language": "en-US,en;q=0.5",
         }
+        # Shared keep-alive session; idempotent GETs are retried on transient failures
+        retry = Retry(
+            total=3,
+            status_forcelist=(429, 500, 502, 503, 504),
+            backoff_factor=0.5,
+            allowed_methods=frozenset(["GET"]),
+        )
+        adapter = HTTPAdapter(max_retries=retry, pool_maxsize=16, pool_block=False)
+        self.session = session if session is not None else requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        # Patch pages and search results change on the order of hours, so repeat
+        # lookups within the TTL are served without an HTTP round-trip.
+        self._wiki_cache: TTLCache = TTLCache(maxsize=256, ttl=900)
+        self._wiki_cache_lock = threading.Lock()
+
+    def iter_gods(self) -> Iterator[Dict[str, str]]:
+        """Scrape gods from the wiki one at a time.
+
+        Yields:
+            Dictionaries containing god information, as soon as each is fetched
+        """
+        for god_name in SMITE2_GODS:
+            god_data = self.get_god_details(god_name)
+            if not god_data:
+                # If direct name doesn't work, try with "(SMITE 2)" suffix
+                god_data = self.get_god_details(f"{god_name} (SMITE 2)")
+            if god_data:
+                yield god_data
 
     def get_all_gods(self) -> List[Dict[str, str]]:
         """Scrape all gods from the wiki.
@@ -37,101 +188,7 @@ class WikiSmite2Scraper:
             List of dictionaries containing god information
         """
         try:
-            gods_data = []
-
-            # Known Smite 2 gods based on the official wiki
-            smite2_gods = [
-                # Arthurian
-                "Merlin",
-                "Mordred",
-                # Celtic
-                "Cernunnos",
-                "The Morrigan",
-                # Chinese
-                "Guan Yu",
-                "Hua Mulan",
-                "Jing Wei",
-                "Nu Wa",
-                "Sun Wukong",
-                # Egyptian
-                "Anhur",
-                "Anubis",
-                "Geb",
-                "Khepri",
-                "Neith",
-                "Ra",
-                "Sobek",
-                # Greek
-                "Achilles",
-                "Aphrodite",
-                "Apollo",
-                "Ares",
-                "Artemis",
-                "Athena",
-                "Cerberus",
-                "Hades",
-                "Hecate",
-                "Medusa",
-                "Nemesis",
-                "Poseidon",
-                "Scylla",
-                "Thanatos",
-                "Zeus",
-                # Hindu
-                "Agni",
-                "Ganesha",
-                "Kali",
-                "Rama",
-                # Japanese
-                "Amaterasu",
-                "Danzaburou",
-                "Izanami",
-                "Susano",
-                # Korean
-                "Princess Bari",
-                # Maya
-                "Awilix",
-                "Cabrakan",
-                "Chaac",
-                "Hun Batz",
-                "Kukulkan",
-                # Norse
-                "Fenrir",
-                "Loki",
-                "Odin",
-                "Sol",
-                "Thor",
-                "Ullr",
-                "Ymir",
-                # Polynesian
-                "Pele",
-                # Roman
-                "Bacchus",
-                "Bellona",
-                "Cupid",
-                "Hercules",
-                "Mercury",
-                "Vulcan",
-                # Tales of Arabia
-                "Aladdin",
-                # Voodoo
-                "Baron Samedi",
-                # Yoruba
-                "Yemoja",
-            ]
-
-            # Get detailed info for each god
-            for god_name in smite2_gods:
-                god_data = self.get_god_details(god_name)
-                if god_data:
-                    gods_data.append(god_data)
-                else:
-                    # If direct name doesn't work, try with "(SMITE 2)" suffix
-                    alt_name = f"{god_name} (SMITE 2)"
-                    god_data = self.get_god_details(alt_name)
-                    if god_data:
-                        gods_data.append(god_data)
-
+            gods_data = list(self.iter_gods())
             logger.info(f"Successfully scraped {len(gods_data)} gods from wiki")
             return gods_data
 
@@ -152,9 +209,9 @@ class WikiSmite2Scraper:
             # Get page content using MediaWiki API
             params = {"action": "parse", "page": god_name, "format": "json", "prop": "text"}
 
-            response = requests.get(self.api_url, params=params, headers=self.headers)
+            response = self.session.get(self.api_url, params=params, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
-            data = response.json()
+            data = _parse_json(response)
 
             if "parse" not in data:
                 logger.warning(f"God page not found: {god_name}")
@@ -312,9 +369,9 @@ class WikiSmite2Scraper:
                 }
                 if cmcontinue:
                     params["cmcontinue"] = cmcontinue
-                response = requests.get(self.api_url, params=params, headers=self.headers)
+                response = self.session.get(self.api_url, params=params, timeout=REQUEST_TIMEOUT)
                 print(f"[DEBUG] API URL: {response.url}")
-                data = response.json()
+                data = _parse_json(response)
                 print(f"[DEBUG] API response: {json.dumps(data, indent=2)[:1000]}")
                 members = data.get("query", {}).get("categorymembers", [])
                 for m in members:
@@ -340,7 +397,7 @@ class WikiSmite2Scraper:
 
             for items_page_url in item_urls_to_try:
                 print(f"[DEBUG] Trying URL: {items_page_url}")
-                response = requests.get(items_page_url, headers=self.headers)
+                response = self.session.get(items_page_url, timeout=REQUEST_TIMEOUT)
                 print(f"[DEBUG] Response status: {response.status_code}")
                 if response.status_code == 200:
                     soup = BeautifulSoup(response.text, "html.parser")
@@ -394,10 +451,10 @@ class WikiSmite2Scraper:
                         "srlimit": "50",
                         "format": "json",
                     }
-                    response = requests.get(
-                        self.api_url, params=search_params, headers=self.headers
+                    response = self.session.get(
+                        self.api_url, params=search_params, timeout=REQUEST_TIMEOUT
                     )
-                    data = response.json()
+                    data = _parse_json(response)
                     search_results = data.get("query", {}).get("search", [])
                     print(
                         f"[DEBUG] Search for '{item_name}' returned {len(search_results)} results"
@@ -422,21 +479,20 @@ class WikiSmite2Scraper:
                 print(f"[DEBUG] Total titles list now has {len(titles)} items")
         return titles
 
+    def iter_items(self) -> Iterator[Dict[str, str]]:
+        """Scrape items from the wiki one at a time, as soon as each is fetched."""
+        for item_name in self.get_all_item_titles():
+            item_data = self.get_item_details(item_name)
+            if not item_data:
+                # If direct name doesn't work, try with (SMITE 2) suffix
+                item_data = self.get_item_details(f"{item_name} (SMITE 2)")
+            if item_data:
+                yield item_data
+
     def get_all_items(self) -> List[Dict[str, str]]:
         """Scrape all items from the wiki dynamically."""
         try:
-            items_data = []
-            item_titles = self.get_all_item_titles()
-            for item_name in item_titles:
-                item_data = self.get_item_details(item_name)
-                if item_data:
-                    items_data.append(item_data)
-                else:
-                    # If direct name doesn't work, try with (SMITE 2) suffix
-                    alt_name = f"{item_name} (SMITE 2)"
-                    item_data = self.get_item_details(alt_name)
-                    if item_data:
-                        items_data.append(item_data)
+            items_data = list(self.iter_items())
             logger.info(f"Successfully scraped {len(items_data)} items from wiki dynamically")
             return items_data
         except Exception as e:
@@ -456,9 +512,9 @@ class WikiSmite2Scraper:
             # Get page content using MediaWiki API
             params = {"action": "parse", "page": item_name, "format": "json", "prop": "text"}
 
-            response = requests.get(self.api_url, params=params, headers=self.headers)
+            response = self.session.get(self.api_url, params=params, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
-            data = response.json()
+            data = _parse_json(response)
 
             if "parse" not in data:
                 logger.warning(f"Item page not found: {item_name}")
@@ -646,9 +702,9 @@ class WikiSmite2Scraper:
                 "prop": "text",
             }
 
-            response = requests.get(self.api_url, params=params, headers=self.headers)
+            response = self.session.get(self.api_url, params=params, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
-            data = response.json()
+            data = _parse_json(response)
 
             if "parse" not in data:
                 logger.warning("Patch notes page not found")
@@ -669,7 +725,7 @@ class WikiSmite2Scraper:
                     patch_title = heading.get_text(strip=True)
 
                     # Extract version number
-                    version_match = re.search(r"(\d+\.?\d*\.?\d*)", patch_title)
+                    version_match = _PATCH_HEADING_VERSION_RE.search(patch_title)
                     version = version_match.group(1) if version_match else "Unknown"
 
                     # Get patch content
@@ -683,7 +739,7 @@ class WikiSmite2Scraper:
                     content = "\n".join(content_parts)
 
                     # Try to extract date
-                    date_match = re.search(r"(\d{4}-\d{2}-\d{2}|\w+ \d+, \d{4})", content)
+                    date_match = _DATE_RE.search(content)
                     date = date_match.group(1) if date_match else "Unknown"
 
                     patches.append(
@@ -724,39 +780,42 @@ class WikiSmite2Scraper:
             Dictionary containing patch details or None if not found
         """
         try:
-            params = {"action": "parse", "page": patch_title, "format": "json", "prop": "text"}
+            return self._fetch_patch_details(patch_title)
+        except requests.RequestException as e:
+            logger.error(f"Error fetching patch details for {patch_title}: {e}")
+            return None
 
-            response = requests.get(self.api_url, params=params, headers=self.headers)
-            response.raise_for_status()
-            data = response.json()
+    @cachedmethod(operator.attrgetter("_wiki_cache"), lock=operator.attrgetter("_wiki_cache_lock"))
+    def _fetch_patch_details(self, patch_title: str) -> Optional[Dict[str, str]]:
+        """Fetch and parse a patch note page, raising on request errors so failures aren't cached."""
+        params = {"action": "parse", "page": patch_title, "format": "json", "prop": "text"}
 
-            if "parse" not in data:
-                return None
+        response = self.session.get(self.api_url, params=params, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        data = _parse_json(response)
 
-            html_content = data["parse"]["text"]["*"]
-            soup = BeautifulSoup(html_content, "html.parser")
+        if "parse" not in data:
+            return None
 
-            # Extract version from title
-            version_match = re.search(r"(\d+\.\d+(?:\.\d+)?)", patch_title)
-            version = version_match.group(1) if version_match else patch_title
+        html_content = data["parse"]["text"]["*"]
+        soup = BeautifulSoup(html_content, "html.parser")
 
-            # Get patch content
-            content_paragraphs = soup.find_all("p")
-            content = "\n".join(
-                [p.get_text(strip=True) for p in content_paragraphs if p.get_text(strip=True)]
-            )
+        # Extract version from title
+        version_match = _VERSION_RE.search(patch_title)
+        version = version_match.group(1) if version_match else patch_title
 
-            return {
-                "version": version,
-                "title": patch_title,
-                "date": datetime.now().strftime("%Y-%m-%d"),  # Wiki may not have explicit dates
-                "content": content,
-                "url": urljoin(self.base_url, f"/wiki/{patch_title.replace(' ', '_')}"),
-            }
+        # Get patch content
+        content_paragraphs = soup.find_all("p")
+        paragraph_texts = (p.get_text(strip=True) for p in content_paragraphs)
+        content = "\n".join(text for text in paragraph_texts if text)
 
-        except requests.RequestException as e:
-            logger.error(f"Error fetching patch details for {patch_title}: {e}")
-            return None
+        return {
+            "version": version,
+            "title": patch_title,
+            "date": datetime.now().strftime("%Y-%m-%d"),  # Wiki may not have explicit dates
+            "content": content,
+            "url": urljoin(self.base_url, f"/wiki/{patch_title.replace(' ', '_')}"),
+        }
 
     def search_wiki(self, query: str, limit: int = 10) -> List[Dict[str, str]]:
         """Search the wiki for pages matching a query.
@@ -769,31 +828,7 @@ class WikiSmite2Scraper:
             List of search results
         """
         try:
-            params = {
-                "action": "query",
-                "list": "search",
-                "srsearch": query,
-                "srlimit": limit,
-                "format": "json",
-            }
-
-            response = requests.get(self.api_url, params=params, headers=self.headers)
-            response.raise_for_status()
-            data = response.json()
-
-            if "query" not in data or "search" not in data["query"]:
-                return []
-
-            results = []
-            for result in data["query"]["search"]:
-                results.append(
-                    {
-                        "title": result["title"],
-                        "snippet": result.get("snippet", ""),
-                        "url": urljoin(self.base_url, f"/wiki/{result['title'].replace(' ', '_')}"),
-                    }
-                )
-
+            results = self._fetch_search_results(query, limit)
             logger.info(f"Found {len(results)} search results for query: {query}")
             return results
 
@@ -801,6 +836,36 @@ class WikiSmite2Scraper:
             logger.error(f"Error searching wiki: {e}")
             return []
 
+    @cachedmethod(operator.attrgetter("_wiki_cache"), lock=operator.attrgetter("_wiki_cache_lock"))
+    def _fetch_search_results(self, query: str, limit: int) -> List[Dict[str, str]]:
+        """Run a wiki search, keyed on both query and limit in the response cache."""
+        params = {
+            "action": "query",
+            "list": "search",
+            "srsearch": query,
+            "srlimit": limit,
+            "format": "json",
+        }
+
+        response = self.session.get(self.api_url, params=params, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        data = _parse_json(response)
+
+        if "query" not in data or "search" not in data["query"]:
+            return []
+
+        results = []
+        for result in data["query"]["search"]:
+            results.append(
+                {
+                    "title": result["title"],
+                    "snippet": result.get("snippet", ""),
+                    "url": urljoin(self.base_url, f"/wiki/{result['title'].replace(' ', '_')}"),
+                }
+            )
+
+        return results
+
     def _extract_scaling_from_text(self, text: str) -> Optional[Dict[str, str]]:
         """Extract Intelligence and Strength scaling information from text."""
         scaling_data = {}
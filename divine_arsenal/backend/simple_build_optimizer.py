@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """Simple Build Optimizer for Divine Arsenal."""
 
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 # Import both database types
 from database import Database
@@ -15,6 +15,8 @@ class SimpleBuildOptimizer:
         self.db = db
         # Check if this is the PostgreSQL adapter (has app attribute)
         self.is_postgres_adapter = hasattr(db, 'app')
+        # (name, description) -> (is_physical_protection, is_magical_protection)
+        self._protection_flags_cache: Dict[Tuple[str, str], Tuple[bool, bool]] = {}
 
     def get_optimal_build(
         self, god_name: str, role: str, enemy_comp: Optional[List[str]] = None
@@ -144,20 +146,10 @@ class SimpleBuildOptimizer:
 
         if physical_threats > magical_threats:
             # Look for physical protection items
-            for item in all_items:
-                if (
-                    "protection" in item["name"].lower()
-                    and "physical" in item.get("description", "").lower()
-                ):
-                    counter_items.append(item)
+            counter_items = [item for item in all_items if self._protection_flags(item)[0]]
         elif magical_threats > physical_threats:
             # Look for magical protection items
-            for item in all_items:
-                if (
-                    "protection" in item["name"].lower()
-                    and "magical" in item.get("description", "").lower()
-                ):
-                    counter_items.append(item)
+            counter_items = [item for item in all_items if self._protection_flags(item)[1]]
 
         # Replace one offensive item with a counter item if available
         if counter_items and len(build_items) > 0:
@@ -165,6 +157,25 @@ class SimpleBuildOptimizer:
 
         return build_items
 
+    def _protection_flags(self, item: Dict[str, Any]) -> Tuple[bool, bool]:
+        """Return (is_physical_protection, is_magical_protection) for an item.
+
+        The lowercased name/description checks are computed once per distinct item text
+        and reused across build requests.
+        """
+        key = (item["name"], item.get("description") or "")
+        flags = self._protection_flags_cache.get(key)
+        if flags is None:
+            name_lower = key[0].lower()
+            desc_lower = key[1].lower()
+            is_protection = "protection" in name_lower
+            flags = (
+                is_protection and "physical" in desc_lower,
+                is_protection and "magical" in desc_lower,
+            )
+            self._protection_flags_cache[key] = flags
+        return flags
+
     def _analyze_build(self, build_items: List[Dict[str, Any]], role: str) -> Dict[str, Any]:
         """Analyze the build and provide insights."""
         total_cost = sum(item.get("cost", 0) for item in build_items)
@@ -6,19 +6,59 @@ Analyzes patch data, god/item performance, and meta trends to enhance build reco
 
 import json
 import logging
+import os
+import pickle
 import sqlite3
-from collections import defaultdict
-from dataclasses import dataclass, field
+import threading
+from collections import Counter
+from dataclasses import asdict, dataclass, field
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from itertools import combinations, count
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
-logger = logging.getLogger(__name__)
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+# Maximum number of memoized predict_build_success results kept per analyzer
+PREDICTION_CACHE_SIZE = 4096
+
+# Name substrings counted as build features, per item and per enemy god
+ITEM_FEATURE_KEYWORDS = ("power", "protection")
+GOD_FEATURE_KEYWORDS = ("mage", "assassin")
+
+# Bump when the snapshot frame layout or pickled cache structure changes
+SNAPSHOT_SCHEMA_VERSION = 1
+
+# Column layout of the match column store built from MatchData: (field, dtype).
+# Counters use the narrowest integer type that fits; low-cardinality strings are categorical.
+MATCH_COLUMNS: Tuple[Tuple[str, Any], ...] = (
+    ("match_id", object),
+    ("god_name", "category"),
+    ("role", "category"),
+    ("items", object),
+    ("win", bool),
+    ("kills", np.int16),
+    ("deaths", np.int16),
+    ("assists", np.int16),
+    ("damage_dealt", np.int32),
+    ("damage_mitigated", np.int32),
+    ("healing", np.int32),
+    ("match_duration", np.int32),
+    ("enemy_comp", object),
+    ("patch_version", "category"),
+    ("game_mode", "category"),
+    ("player_skill", "category"),
+)
+
+
+@dataclass(slots=True, frozen=True)
 class MatchData:
     """Represents match performance data."""
 
@@ -40,7 +80,7 @@ class MatchData:
     player_skill: str = "Average"  # Bronze, Silver, Gold, Platinum, Diamond, Masters, Grandmaster
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ItemSynergy:
     """Statistical item synergy data."""
 
@@ -53,7 +93,7 @@ class ItemSynergy:
     patch_relevant: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GodPerformance:
     """God statistical performance data."""
 
@@ -70,7 +110,7 @@ class GodPerformance:
     meta_tier: str  # S+, S, A, B, C
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MetaTrend:
     """Meta trend analysis."""
 
@@ -82,15 +122,118 @@ class MetaTrend:
     recommendation: str
 
 
+# Source of versions for _MatchList and _GodPerformanceMap; never reused, so a replaced
+# container cannot match the version of the one it replaced
+_data_versions = count(1)
+
+
+class _MatchList(list):
+    """List of matches that takes a new version number whenever it is modified.
+
+    Caches derived from match_data record the version they were built from.
+    rewrite_version changes only when existing entries may have changed, so
+    aggregates over a prefix stay valid across appends.
+    """
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.version = self.rewrite_version = next(_data_versions)
+
+    def _bump(self, appended: bool):
+        self.version = next(_data_versions)
+        if not appended:
+            self.rewrite_version = self.version
+
+
+class _GodPerformanceMap(dict):
+    """God performance records that take a new version number whenever they change."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.version = next(_data_versions)
+
+    def _bump(self, appended: bool):
+        self.version = next(_data_versions)
+
+
+def _bumping(base: type, name: str, appended: bool = False):
+    """Wrap a mutating base-class method so the container bumps its version after it."""
+    method = getattr(base, name)
+
+    def wrapper(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        self._bump(appended)
+        return result
+
+    wrapper.__name__ = name
+    return wrapper
+
+
+for _name in ("append", "extend", "__iadd__"):
+    setattr(_MatchList, _name, _bumping(list, _name, appended=True))
+for _name in (
+    "insert",
+    "pop",
+    "remove",
+    "clear",
+    "sort",
+    "reverse",
+    "__setitem__",
+    "__delitem__",
+    "__imul__",
+):
+    setattr(_MatchList, _name, _bumping(list, _name))
+for _name in (
+    "__setitem__",
+    "__delitem__",
+    "__ior__",
+    "update",
+    "setdefault",
+    "pop",
+    "popitem",
+    "clear",
+):
+    setattr(_GodPerformanceMap, _name, _bumping(dict, _name))
+
+
+class GodRoleBaseline(NamedTuple):
+    """Historical averages for one god/role combination."""
+
+    win_rate: float
+    kda: float
+    damage: float
+    matches: int
+
+
 class StatisticalAnalyzer:
     """Advanced statistical analysis for SMITE 2 builds."""
 
     def __init__(self, db_path: str = "smite_stats.db"):
         self.db_path = db_path
-        self.match_data: List[MatchData] = []
-        self.god_performance: Dict[str, GodPerformance] = {}
+        self.match_data = []
+        # Column-oriented copy of match_data for vectorized queries, rebuilt lazily
+        self._match_df: Optional[pd.DataFrame] = None
+        # match_data version the column store and its derived caches belong to
+        self._match_df_version = 0
+        self._god_role_stats: Optional[Dict[Tuple[str, str], GodRoleBaseline]] = None
+        self._prediction_cache: Dict[Tuple[Any, ...], Dict[str, float]] = {}
+        # Name -> keyword indicator row, filled lazily by _extract_build_features
+        self._item_features: Dict[str, np.ndarray] = {}
+        self._god_features: Dict[str, np.ndarray] = {}
+        # Running per-pair and per-item aggregates over match_data[:_indexed_matches],
+        # valid while match_data.rewrite_version equals _indexed_rewrite_version
+        self._pair_index: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._item_index: Dict[str, Dict[str, int]] = {}
+        self._indexed_matches = 0
+        self._indexed_rewrite_version = 0
+        self.god_performance = {}
+        # DataFrame view of god_performance and the god_performance version it reflects
+        self._god_performance_df: Optional[pd.DataFrame] = None
+        self._god_performance_df_version = 0
         self.item_synergies: List[ItemSynergy] = []
         self.meta_trends: List[MetaTrend] = []
+        # Generator-API random source for simulations
+        self._rng = np.random.default_rng()
         self.patch_weights = {
             "OB12": 1.0,  # Current patch
             "OB11": 0.8,  # Recent patch
@@ -98,12 +241,101 @@ class StatisticalAnalyzer:
             "OB9": 0.4,  # Historical
             "OB8": 0.2,  # Legacy data
         }
+        # One long-lived connection in autocommit mode; writes use explicit transactions
+        self._conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+        self._conn_lock = threading.Lock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
         self._init_database()
 
+    @property
+    def match_data(self) -> List[MatchData]:
+        """Match records; every change to the list or its replacement stales derived caches."""
+        return self._match_data
+
+    @match_data.setter
+    def match_data(self, matches: Iterable[MatchData]):
+        self._match_data = _MatchList(matches)
+
+    @property
+    def god_performance(self) -> Dict[str, GodPerformance]:
+        """Per-god performance records; any write stales the cached DataFrame view."""
+        return self._god_performance
+
+    @god_performance.setter
+    def god_performance(self, performance: Dict[str, GodPerformance]):
+        self._god_performance = _GodPerformanceMap(performance)
+
+    @property
+    def _df(self) -> pd.DataFrame:
+        """Match data as a DataFrame with one typed column per MatchData field.
+
+        Rebuilt when invalidated or when match_data has changed since the last build.
+        """
+        self._check_match_caches()
+        if self._match_df is None:
+            self._match_df = self._build_match_frame(self.match_data)
+        return self._match_df
+
+    def _check_match_caches(self):
+        """Drop derived caches if match_data has changed since they were built."""
+        if self._match_df_version != self.match_data.version:
+            self._invalidate_match_caches()
+            self._match_df_version = self.match_data.version
+
+    def _invalidate_match_caches(self):
+        """Mark everything derived from match_data as stale."""
+        self._match_df = None
+        self._god_role_stats = None
+        self._prediction_cache.clear()
+
+    def _get_god_role_stats(self) -> Dict[Tuple[str, str], GodRoleBaseline]:
+        """Per god/role baselines, aggregated once per version of match_data."""
+        df = self._df
+        if self._god_role_stats is None:
+            kda = (df["kills"].to_numpy() + df["assists"].to_numpy()) / np.maximum(
+                df["deaths"].to_numpy(), 1
+            )
+            grouped = (
+                df.assign(kda=kda)
+                .groupby(["god_name", "role"], sort=False, observed=True)
+                .agg(
+                    win_rate=("win", "mean"),
+                    kda=("kda", "mean"),
+                    damage=("damage_dealt", "mean"),
+                    matches=("win", "size"),
+                )
+            )
+            self._god_role_stats = {
+                key: GodRoleBaseline(
+                    win_rate=float(row.win_rate),
+                    kda=float(row.kda),
+                    damage=float(row.damage),
+                    matches=int(row.matches),
+                )
+                for key, row in zip(grouped.index, grouped.itertuples(index=False))
+            }
+        return self._god_role_stats
+
+    @staticmethod
+    def _build_match_frame(matches: List[MatchData]) -> pd.DataFrame:
+        """Convert a list of MatchData records into a column store."""
+        columns: Dict[str, Any] = {}
+        for name, dtype in MATCH_COLUMNS:
+            if dtype is object:
+                columns[name] = [getattr(m, name) for m in matches]
+            elif dtype == "category":
+                columns[name] = pd.Categorical([getattr(m, name) for m in matches])
+            else:
+                columns[name] = np.fromiter(
+                    (getattr(m, name) for m in matches), dtype=dtype, count=len(matches)
+                )
+        return pd.DataFrame(columns)
+
     def _init_database(self):
         """Initialize SQLite database for match data storage."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._conn.cursor()
 
         # Create tables for statistical data
         cursor.execute(
@@ -166,8 +398,29 @@ class StatisticalAnalyzer:
         """
         )
 
-        conn.commit()
-        conn.close()
+        # Items per match, normalized so "matches containing item X" is an index lookup
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS match_items (
+                match_id TEXT,
+                item TEXT,
+                PRIMARY KEY (match_id, item)
+            )
+        """
+        )
+
+        # Secondary indexes for the analytical lookups; primary keys cover item1 and god_name
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_mp_god_role_patch "
+            "ON match_performance(god_name, role, patch_version)"
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_is_item2 ON item_synergies(item2, patch_version)"
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_gs_patch_tier ON god_stats(patch_version, meta_tier)"
+        )
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_mi_item ON match_items(item)")
 
     def analyze_patch_trends(self, patch_notes: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Analyze patch notes for meta trends."""
@@ -260,64 +513,91 @@ class StatisticalAnalyzer:
         self.meta_trends.extend(trends)
         return trends
 
-    def analyze_item_synergies(self, min_matches: int = 100) -> List[ItemSynergy]:
-        """Perform correlation analysis to identify item synergies."""
-        synergies = []
-
-        # Group matches by item combinations
-        item_combinations = defaultdict(list)
-
-        for match in self.match_data:
-            items = match.items
-            # Generate all pairs of items
-            for i in range(len(items)):
-                for j in range(i + 1, len(items)):
-                    pair = tuple(sorted([items[i], items[j]]))
-                    item_combinations[pair].append(match)
-
-        # Analyze each combination
-        for (item1, item2), matches in item_combinations.items():
-            if len(matches) < min_matches:
+    def ingest_match(self, match: MatchData):
+        """Append a match and fold it into the running synergy aggregates."""
+        self.match_data.append(match)
+        self._sync_pair_index()
+
+    def _sync_pair_index(self):
+        """Fold matches appended since the last sync into the pair and item indexes."""
+        if self._indexed_rewrite_version != self.match_data.rewrite_version:
+            # match_data was replaced or edited other than by appending; start over
+            self._pair_index = {}
+            self._item_index = {}
+            self._indexed_matches = 0
+            self._indexed_rewrite_version = self.match_data.rewrite_version
+
+        new_matches = self.match_data[self._indexed_matches :]
+        if not new_matches:
+            return
+
+        scores = self._synergy_scores(self._build_match_frame(new_matches))
+        for match, score in zip(new_matches, scores.tolist()):
+            items = sorted(set(match.items))
+            win = int(match.win)
+
+            for item in items:
+                item_stats = self._item_index.setdefault(item, {"wins": 0, "n": 0})
+                item_stats["wins"] += win
+                item_stats["n"] += 1
+
+            if len(items) < 2:
                 continue
 
-            # Calculate synergy metrics
-            win_rate = sum(1 for m in matches if m.win) / len(matches)
+            for pair in combinations(items, 2):
+                pair_stats = self._pair_index.get(pair)
+                if pair_stats is None:
+                    pair_stats = self._pair_index[pair] = {
+                        "wins": 0,
+                        "n": 0,
+                        "score_sum": 0.0,
+                        "patches": Counter(),
+                    }
+                pair_stats["wins"] += win
+                pair_stats["n"] += 1
+                pair_stats["score_sum"] += score
+                pair_stats["patches"][match.patch_version] += 1
+
+        self._indexed_matches = len(self.match_data)
 
-            # Compare to individual item win rates
-            item1_matches = [m for m in self.match_data if item1 in m.items]
-            item2_matches = [m for m in self.match_data if item2 in m.items]
+    def analyze_item_synergies(self, min_matches: int = 100) -> List[ItemSynergy]:
+        """Perform correlation analysis to identify item synergies.
 
-            item1_wr = (
-                sum(1 for m in item1_matches if m.win) / len(item1_matches)
-                if item1_matches
-                else 0.5
-            )
-            item2_wr = (
-                sum(1 for m in item2_matches if m.win) / len(item2_matches)
-                if item2_matches
-                else 0.5
-            )
+        Works from running pair aggregates, so only matches added since the last call are scanned.
+        """
+        synergies: List[ItemSynergy] = []
+        self._sync_pair_index()
 
-            expected_wr = (item1_wr + item2_wr) / 2
-            win_rate_boost = win_rate - expected_wr
+        for (item1, item2), pair_stats in sorted(self._pair_index.items()):
+            match_count = pair_stats["n"]
+            if match_count < min_matches:
+                continue
+
+            # Compare to individual item win rates
+            item1_stats = self._item_index[item1]
+            item2_stats = self._item_index[item2]
+            expected_wr = (
+                item1_stats["wins"] / item1_stats["n"] + item2_stats["wins"] / item2_stats["n"]
+            ) / 2
+            boost = pair_stats["wins"] / match_count - expected_wr
+            if boost <= 0.05:
+                continue
 
             # Calculate synergy score
-            synergy_score = self._calculate_synergy_score(matches, item1, item2)
+            synergy_score = pair_stats["score_sum"] / match_count
 
             # Calculate confidence level
-            confidence = min(100, (len(matches) / min_matches) * 100)
+            confidence = min(100, (match_count / min_matches) * 100)
 
-            if win_rate_boost > 0.05 and synergy_score > 60:  # Significant synergy
+            if synergy_score > 60:  # Significant synergy
                 synergy = ItemSynergy(
                     item1=item1,
                     item2=item2,
                     synergy_score=synergy_score,
-                    win_rate_boost=win_rate_boost * 100,
-                    matches_analyzed=len(matches),
-                    confidence_level=confidence,
-                    patch_relevant=self._get_most_relevant_patch(
-                        [m.patch_version for m in matches]
-                    ),
+                    win_rate_boost=boost * 100,
+                    matches_analyzed=match_count,
+                    confidence_level=float(confidence),
+                    patch_relevant=self._get_most_relevant_patch(pair_stats["patches"]),
                 )
                 synergies.append(synergy)
 
@@ -328,12 +608,28 @@ class StatisticalAnalyzer:
     def predict_build_success(
         self, god: str, role: str, items: List[str], enemy_comp: List[str], patch: str = "OB12"
     ) -> Dict[str, float]:
-        """Use regression models to predict build success probability."""
+        """Use regression models to predict build success probability.
 
-        # Gather historical data for this god/role combination
-        relevant_matches = [m for m in self.match_data if m.god_name == god and m.role == role]
+        Results are memoized per (god, role, items, enemy_comp, patch) until match_data changes.
+        """
+        self._check_match_caches()
+        key = (god, role, tuple(items), tuple(enemy_comp), patch)
+        prediction = self._prediction_cache.get(key)
+        if prediction is None:
+            prediction = self._predict_build_success(god, role, items, enemy_comp, patch)
+            if len(self._prediction_cache) >= PREDICTION_CACHE_SIZE:
+                self._prediction_cache.clear()
+            self._prediction_cache[key] = prediction
+        return dict(prediction)
+
+    def _predict_build_success(
+        self, god: str, role: str, items: List[str], enemy_comp: List[str], patch: str
+    ) -> Dict[str, float]:
+        """Uncached prediction behind predict_build_success."""
+        # Historical baseline for this god/role combination
+        baseline = self._get_god_role_stats().get((god, role))
 
-        if len(relevant_matches) < 50:
+        if baseline is None or baseline.matches < 50:
             # Insufficient data - use heuristic approach
             return self._heuristic_prediction(god, role, items, enemy_comp, patch)
 
@@ -341,18 +637,18 @@ class StatisticalAnalyzer:
         features = self._extract_build_features(items, enemy_comp, patch)
 
         # Simple logistic regression prediction
-        win_probability = self._logistic_prediction(features, relevant_matches)
+        win_probability = self._logistic_prediction(features, baseline)
 
         # Performance predictions
-        kda_prediction = self._predict_kda(features, relevant_matches)
-        damage_prediction = self._predict_damage(features, relevant_matches)
+        kda_prediction = self._predict_kda(features, baseline)
+        damage_prediction = self._predict_damage(features, baseline)
 
         return {
             "win_probability": win_probability,
             "predicted_kda": kda_prediction,
             "predicted_damage": damage_prediction,
-            "confidence": min(100, len(relevant_matches) / 100 * 100),
-            "sample_size": len(relevant_matches),
+            "confidence": min(100, baseline.matches / 100 * 100),
+            "sample_size": baseline.matches,
         }
 
     def generate_meta_recommendations(self, patch: str = "OB12") -> Dict[str, List[str]]:
@@ -406,29 +702,25 @@ class StatisticalAnalyzer:
 
         for build_idx, build in enumerate(build_options):
             build_name = f"Build_{build_idx + 1}"
-            wins = 0
-            total_kda = 0
-            total_damage = 0
-
-            for _ in range(iterations):
-                # Randomly select enemy composition
-                enemy_comp = enemy_comps[np.random.randint(len(enemy_comps))]
-
-                # Predict outcome
-                prediction = self.predict_build_success(god, role, build, enemy_comp)
 
-                # Simulate match outcome
-                if np.random.random() < prediction["win_probability"]:
-                    wins += 1
+            # Predict each distinct enemy composition once
+            predictions = [
+                self.predict_build_success(god, role, build, enemy_comp)
+                for enemy_comp in enemy_comps
+            ]
+            win_probs = np.array([p["win_probability"] for p in predictions], dtype=float)
+            kdas = np.array([p["predicted_kda"] for p in predictions], dtype=float)
+            damages = np.array([p["predicted_damage"] for p in predictions], dtype=float)
 
-                total_kda += prediction["predicted_kda"]
-                total_damage += prediction["predicted_damage"]
+            # Randomly select an enemy composition and simulate the outcome for every iteration
+            comp_idx = self._rng.integers(len(enemy_comps), size=iterations)
+            wins = int(np.count_nonzero(self._rng.random(iterations) < win_probs[comp_idx]))
 
             results[build_name] = {
                 "build": build,
                 "win_rate": wins / iterations,
-                "avg_kda": total_kda / iterations,
-                "avg_damage": total_damage / iterations,
+                "avg_kda": float(kdas[comp_idx].sum()) / iterations,
+                "avg_damage": float(damages[comp_idx].sum()) / iterations,
                 "consistency_score": self._calculate_consistency(build, enemy_comps),
             }
 
@@ -444,6 +736,16 @@ class StatisticalAnalyzer:
 
         return results
 
+    def _get_god_performance_frame(self) -> pd.DataFrame:
+        """god_performance as a DataFrame indexed by god key, cached until it changes."""
+        if self._god_performance_df_version != self.god_performance.version:
+            self._god_performance_df = pd.DataFrame(
+                [asdict(gp) for gp in self.god_performance.values()],
+                index=list(self.god_performance.keys()),
+            )
+            self._god_performance_df_version = self.god_performance.version
+        return self._god_performance_df
+
     def cluster_gods_by_playstyle(self) -> Dict[str, List[str]]:
         """Use clustering to group gods by playstyle."""
         clusters: Dict[str, List[str]] = {
@@ -455,18 +757,26 @@ class StatisticalAnalyzer:
             "early_game_bullies": [],
         }
 
-        for god_name, performance in self.god_performance.items():
-            # Analyze god characteristics based on performance data
-            if performance.avg_damage > 40000 and performance.role == "Mid":
-                clusters["burst_mages"].append(god_name)
-            elif performance.avg_mitigated > 30000 and performance.role in ["Solo", "Support"]:
-                clusters["sustain_tanks"].append(god_name)
-            elif performance.avg_kda > 2.5 and performance.role == "Jungle":
-                clusters["assassin_junglers"].append(god_name)
-            elif performance.role == "Support" and performance.win_rate > 0.52:
-                clusters["utility_supports"].append(god_name)
-            elif performance.role == "Carry" and performance.avg_damage > 45000:
-                clusters["late_game_carries"].append(god_name)
+        gp_df = self._get_god_performance_frame()
+        if gp_df.empty:
+            return clusters
+
+        # Each god lands in the first matching category, as in an if/elif chain
+        conditions = [
+            ("burst_mages", (gp_df.avg_damage > 40000) & (gp_df.role == "Mid")),
+            (
+                "sustain_tanks",
+                (gp_df.avg_mitigated > 30000) & gp_df.role.isin(["Solo", "Support"]),
+            ),
+            ("assassin_junglers", (gp_df.avg_kda > 2.5) & (gp_df.role == "Jungle")),
+            ("utility_supports", (gp_df.role == "Support") & (gp_df.win_rate > 0.52)),
+            ("late_game_carries", (gp_df.role == "Carry") & (gp_df.avg_damage > 45000)),
+        ]
+        unassigned = pd.Series(True, index=gp_df.index)
+        for cluster, mask in conditions:
+            selected = mask & unassigned
+            clusters[cluster] = gp_df.index[selected].tolist()
+            unassigned &= ~selected
 
         return clusters
 
@@ -505,65 +815,73 @@ class StatisticalAnalyzer:
         else:
             return f"Evaluate {god} performance after changes"
 
-    def _calculate_synergy_score(self, matches: List[MatchData], item1: str, item2: str) -> float:
-        """Calculate synergy score between two items."""
-        total_score = 0.0
-
-        for match in matches:
-            # Base score from match outcome
-            score = 50 if match.win else 25
-
-            # Bonus for performance metrics
-            if match.damage_dealt > 40000:
-                score += 15
-            if match.damage_mitigated > 20000:
-                score += 10
-            if (match.kills + match.assists) > match.deaths * 2:
-                score += 10
-
-            total_score += score
-
-        return total_score / len(matches) if matches else 0
+    @staticmethod
+    def _synergy_scores(frame: pd.DataFrame) -> np.ndarray:
+        """Per-match synergy score contributions for rows of the match column store."""
+        kills = frame["kills"].to_numpy()
+        deaths = frame["deaths"].to_numpy()
+        assists = frame["assists"].to_numpy()
+
+        # Base score from match outcome plus bonuses for performance metrics
+        return (
+            np.where(frame["win"].to_numpy(), 50.0, 25.0)
+            + 15 * (frame["damage_dealt"].to_numpy() > 40000)
+            + 10 * (frame["damage_mitigated"].to_numpy() > 20000)
+            + 10 * ((kills + assists) > deaths * 2)
+        )
 
-    def _get_most_relevant_patch(self, patch_versions: List[str]) -> str:
-        """Get the most relevant patch from a list."""
-        patch_counts: Dict[str, int] = defaultdict(int)
-        for patch in patch_versions:
-            patch_counts[patch] += 1
+    def _get_most_relevant_patch(self, patch_versions: Iterable[str]) -> str:
+        """Get the most relevant patch from a list of versions or a Counter of them."""
+        patch_counts = Counter(patch_versions)
 
         # Weight by recency and frequency
-        weighted_scores = {}
-        for patch, count in patch_counts.items():
-            weight = self.patch_weights.get(patch, 0.1)
-            weighted_scores[patch] = count * weight
-
-        return max(weighted_scores.items(), key=lambda x: x[1])[0] if weighted_scores else "OB12"
+        return max(
+            patch_counts,
+            key=lambda patch: patch_counts[patch] * self.patch_weights.get(patch, 0.1),
+            default="OB12",
+        )
 
     def _extract_build_features(
         self, items: List[str], enemy_comp: List[str], patch: str
     ) -> np.ndarray:
         """Extract numerical features for ML prediction."""
-        features = []
+        # Item features (simplified): damage items, defense items
+        item_counts = self._sum_keyword_features(self._item_features, items, ITEM_FEATURE_KEYWORDS)
 
-        # Item features (simplified)
-        features.append(len(items))  # Build size
-        features.append(sum(1 for i in items if "power" in i.lower()))  # Damage items
-        features.append(sum(1 for i in items if "protection" in i.lower()))  # Defense items
-
-        # Enemy composition features
-        features.append(len(enemy_comp))  # Enemy team size
-        features.append(sum(1 for g in enemy_comp if "mage" in g.lower()))  # Enemy mages
-        features.append(sum(1 for g in enemy_comp if "assassin" in g.lower()))  # Enemy assassins
-
-        # Patch weight
-        features.append(self.patch_weights.get(patch, 0.5))
+        # Enemy composition features: enemy mages, enemy assassins
+        enemy_counts = self._sum_keyword_features(
+            self._god_features, enemy_comp, GOD_FEATURE_KEYWORDS
+        )
 
-        return np.array(features)
+        return np.concatenate(
+            (
+                [len(items)],  # Build size
+                item_counts,
+                [len(enemy_comp)],  # Enemy team size
+                enemy_counts,
+                [self.patch_weights.get(patch, 0.5)],  # Patch weight
+            )
+        )
 
-    def _logistic_prediction(self, features: np.ndarray, matches: List[MatchData]) -> float:
+    @staticmethod
+    def _sum_keyword_features(
+        table: Dict[str, np.ndarray], names: List[str], keywords: Tuple[str, ...]
+    ) -> np.ndarray:
+        """Sum per-name keyword indicator rows, lowercasing each distinct name only once."""
+        rows = []
+        for name in names:
+            row = table.get(name)
+            if row is None:
+                name_lower = name.lower()
+                row = np.array([keyword in name_lower for keyword in keywords], dtype=np.int64)
+                table[name] = row
+            rows.append(row)
+        return np.sum(rows, axis=0) if rows else np.zeros(len(keywords), dtype=np.int64)
+
+    def _logistic_prediction(self, features: np.ndarray, baseline: GodRoleBaseline) -> float:
         """Simple logistic regression prediction."""
         # Simplified implementation - in practice, use sklearn
-        base_win_rate = sum(1 for m in matches if m.win) / len(matches)
+        base_win_rate = baseline.win_rate
 
         # Adjust based on features (simplified heuristic)
         adjustment: float = 0.0
@@ -574,15 +892,13 @@ class StatisticalAnalyzer:
 
         return min(max(base_win_rate + adjustment, 0.1), 0.9)
 
-    def _predict_kda(self, features: np.ndarray, matches: List[MatchData]) -> float:
+    def _predict_kda(self, features: np.ndarray, baseline: GodRoleBaseline) -> float:
         """Predict KDA based on features."""
-        avg_kda = sum((m.kills + m.assists) / max(m.deaths, 1) for m in matches) / len(matches)
-        return avg_kda
+        return baseline.kda
 
-    def _predict_damage(self, features: np.ndarray, matches: List[MatchData]) -> float:
+    def _predict_damage(self, features: np.ndarray, baseline: GodRoleBaseline) -> float:
         """Predict damage output based on features."""
-        avg_damage = sum(m.damage_dealt for m in matches) / len(matches)
-        return avg_damage
+        return baseline.damage
 
     def _heuristic_prediction(
         self, god: str, role: str, items: List[str], enemy_comp: List[str], patch: str
@@ -613,30 +929,164 @@ class StatisticalAnalyzer:
 
     def _store_synergies(self, synergies: List[ItemSynergy]):
         """Store synergies in database."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        for synergy in synergies:
-            cursor.execute(
-                """
-                INSERT OR REPLACE INTO item_synergies 
-                (item1, item2, synergy_score, win_rate_boost, matches_analyzed, 
-                 confidence_level, patch_version)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    synergy.item1,
-                    synergy.item2,
-                    synergy.synergy_score,
-                    synergy.win_rate_boost,
-                    synergy.matches_analyzed,
-                    synergy.confidence_level,
-                    synergy.patch_relevant,
-                ),
+        rows = [
+            (
+                synergy.item1,
+                synergy.item2,
+                synergy.synergy_score,
+                synergy.win_rate_boost,
+                synergy.matches_analyzed,
+                synergy.confidence_level,
+                synergy.patch_relevant,
             )
+            for synergy in synergies
+        ]
+
+        # All rows go in one explicit transaction on the shared connection
+        with self._conn_lock:
+            cursor = self._conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                cursor.executemany(
+                    """
+                    INSERT OR REPLACE INTO item_synergies 
+                    (item1, item2, synergy_score, win_rate_boost, matches_analyzed, 
+                     confidence_level, patch_version)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                    rows,
+                )
+                cursor.execute("COMMIT")
+            except sqlite3.Error:
+                cursor.execute("ROLLBACK")
+                raise
+
+            # Refresh planner statistics after the bulk write when SQLite deems it useful
+            cursor.execute("PRAGMA optimize")
+
+    def store_matches(self, matches: List[MatchData]):
+        """Store match records, writing their items to the normalized match_items table."""
+        match_rows = [
+            (
+                m.match_id,
+                m.god_name,
+                m.role,
+                json.dumps(m.items),
+                int(m.win),
+                m.kills,
+                m.deaths,
+                m.assists,
+                m.damage_dealt,
+                m.damage_mitigated,
+                m.healing,
+                m.match_duration,
+                json.dumps(m.enemy_comp),
+                m.patch_version,
+                m.game_mode,
+                m.player_skill,
+            )
+            for m in matches
+        ]
+        item_rows = [(m.match_id, item) for m in matches for item in dict.fromkeys(m.items)]
+
+        with self._conn_lock:
+            cursor = self._conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                cursor.executemany(
+                    """
+                    INSERT OR REPLACE INTO match_performance
+                    (match_id, god_name, role, items, win, kills, deaths, assists,
+                     damage_dealt, damage_mitigated, healing, match_duration,
+                     enemy_comp, patch_version, game_mode, player_skill)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                    match_rows,
+                )
+                # Replaced matches must not keep items from their previous version
+                cursor.executemany(
+                    "DELETE FROM match_items WHERE match_id = ?",
+                    [(m.match_id,) for m in matches],
+                )
+                cursor.executemany(
+                    "INSERT INTO match_items (match_id, item) VALUES (?, ?)", item_rows
+                )
+                cursor.execute("COMMIT")
+            except sqlite3.Error:
+                cursor.execute("ROLLBACK")
+                raise
+
+    def close(self):
+        """Close the analyzer's database connection."""
+        with self._conn_lock:
+            self._conn.close()
+
+    def save_snapshot(self, path: str):
+        """Write match data and derived caches to disk for a fast restart.
+
+        The match frame is written as Parquet when pyarrow is available, otherwise pickled.
+        Derived caches are pickled to ``<path>.caches.pkl`` with a schema version tag.
+        """
+        df = self._df
+        self._sync_pair_index()
 
-        conn.commit()
-        conn.close()
+        if pyarrow is not None:
+            df.to_parquet(path, engine="pyarrow", compression="zstd")
+        else:
+            df.to_pickle(path)
+
+        caches = {
+            "schema_version": SNAPSHOT_SCHEMA_VERSION,
+            "rows": len(df),
+            "god_role_stats": {k: tuple(v) for k, v in self._get_god_role_stats().items()},
+            "item_index": self._item_index,
+            "pair_index": self._pair_index,
+        }
+        with open(f"{path}.caches.pkl", "wb") as f:
+            pickle.dump(caches, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def load_snapshot(self, path: str):
+        """Replace match_data with a snapshot written by save_snapshot.
+
+        Derived caches are restored only if their schema version and row count match;
+        otherwise they are rebuilt on demand. Only load snapshots this application wrote.
+        """
+        with open(path, "rb") as f:
+            is_parquet = f.read(4) == b"PAR1"
+        if is_parquet:
+            if pyarrow is None:
+                raise ImportError("pyarrow is required to load Parquet snapshots")
+            df = pd.read_parquet(path, engine="pyarrow")
+        else:
+            df = pd.read_pickle(path)
+
+        # Parquet returns list columns as arrays; keep them as plain lists
+        for name in ("items", "enemy_comp"):
+            df[name] = [list(values) for values in df[name]]
+
+        self.match_data = [MatchData(**row) for row in df.to_dict("records")]
+        self._invalidate_match_caches()
+        self._match_df = df
+        self._match_df_version = self.match_data.version
+        self._pair_index = {}
+        self._item_index = {}
+        self._indexed_matches = 0
+
+        caches_path = f"{path}.caches.pkl"
+        if not os.path.exists(caches_path):
+            return
+        with open(caches_path, "rb") as f:
+            caches = pickle.load(f)
+
+        if caches.get("schema_version") != SNAPSHOT_SCHEMA_VERSION or caches.get("rows") != len(df):
+            logger.info("Ignoring stale analyzer cache snapshot at %s", caches_path)
+            return
+
+        self._god_role_stats = {k: GodRoleBaseline(*v) for k, v in caches["god_role_stats"].items()}
+        self._item_index = caches["item_index"]
+        self._pair_index = caches["pair_index"]
+        self._indexed_matches = len(df)
+        self._indexed_rewrite_version = self.match_data.rewrite_version
 
     # Data loading methods (for testing and initialization)
     def load_sample_data(self):
@@ -690,6 +1140,7 @@ class StatisticalAnalyzer:
         ]
 
         self.match_data.extend(sample_matches)
+        self._invalidate_match_caches()
 
         # Sample god performance data
         self.god_performance["Hecate"] = GodPerformance(
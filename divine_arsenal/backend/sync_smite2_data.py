@@ -2,102 +2,185 @@
 """Sync real Smite 2 data from wiki to database."""
 
 import json
+import logging
+import os
+import queue
+import sys
+import threading
+from contextlib import closing
 from datetime import datetime
 
 from scrapers.wiki_smite2 import WikiSmite2Scraper
 
 from divine_arsenal.backend.database import Database
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import requests_cache
+except ImportError:
+    requests_cache = None
+
+logger = logging.getLogger(__name__)
+
+
+def _json_dumps(value):
+    """Encode a value as a JSON string, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(value)
+
 
 def serialize_for_db(record):
     """Convert dict/list fields to JSON strings for database storage."""
     for key, value in record.items():
         if isinstance(value, (dict, list)):
-            record[key] = json.dumps(value)
+            record[key] = _json_dumps(value)
     return record
 
 
+# Upper bound on records fetched but not yet validated
+SYNC_QUEUE_SIZE = 256
+# Seconds a blocked producer waits before checking whether the consumer has stopped
+SYNC_PUT_TIMEOUT = 0.5
+# Records between progress updates on stdout
+SYNC_PROGRESS_EVERY = 50
+# SQLite cache of wiki responses, so repeated syncs don't refetch every page.
+# Stored as <name>.sqlite next to the database rather than in the working directory.
+WIKI_CACHE_NAME = "wiki_smite2"
+WIKI_CACHE_EXPIRE_SECONDS = 86400
+
+_STREAM_DONE = object()
+
+
+def stream_in_background(records, maxsize=SYNC_QUEUE_SIZE):
+    """Iterate records produced on a background thread through a bounded queue.
+
+    The producer keeps fetching while the caller processes earlier records.
+    An exception raised by the producer is re-raised in the consumer. When the
+    consumer stops early, by raising or by closing the generator, the producer
+    stops after the record it is fetching and is joined.
+    """
+    buffer = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+
+    def put(record):
+        """Queue a record; returns False once the consumer has stopped."""
+        while not stop.is_set():
+            try:
+                buffer.put(record, timeout=SYNC_PUT_TIMEOUT)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for record in records:
+                if not put(record):
+                    return
+        except Exception as e:
+            put(e)
+        finally:
+            put(_STREAM_DONE)
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        while True:
+            record = buffer.get()
+            if record is _STREAM_DONE:
+                break
+            if isinstance(record, Exception):
+                raise record
+            yield record
+    finally:
+        stop.set()
+        producer.join()
+
+
+def collect_valid(records, validate, label):
+    """Validate and serialize records, skipping invalid ones.
+
+    Returns:
+        Tuple of (valid serialized records, records seen)
+    """
+    valid = []
+    seen = 0
+    for seen, record in enumerate(records, 1):
+        if seen % SYNC_PROGRESS_EVERY == 0:
+            sys.stdout.write(f"  ... {seen} {label}s\r")
+            sys.stdout.flush()
+        is_valid, message = validate(record)
+        if not is_valid:
+            logger.warning("Skipping %s %d: %s", label, seen, message)
+            continue
+        valid.append(serialize_for_db(record))
+    return valid, seen
+
+
+# Field defaults applied during validation, resolved once at import
+GOD_DICT_FIELDS = ("stats", "scaling_info")
+GOD_LIST_FIELDS = ("counter_gods", "counter_items", "synergy_items")
+GOD_STR_FIELDS = ("role", "damage_type", "image_url", "meta_role")
+ITEM_STR_FIELDS = ("category", "passive")
+
+
+def _as_int(value):
+    """Coerce a scraped numeric field to int, defaulting to 0."""
+    if type(value) is int:
+        return value
+    if not value:
+        return 0
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return 0
+
+
 def validate_smite2_god_data(god_data):
     """Validate and clean scraped Smite 2 god data."""
-    if "name" not in god_data or not god_data["name"]:
+    if not god_data.get("name"):
         return False, "Missing or empty name"
 
-    # Ensure required fields exist
-    required_fields = ["role", "stats", "scaling_info"]
-    for field in required_fields:
+    # Ensure stats and scaling_info are dicts
+    for field in GOD_DICT_FIELDS:
+        if not isinstance(god_data.get(field), dict):
+            god_data[field] = {}
+
+    # Ensure other fields exist
+    for field in GOD_LIST_FIELDS:
         if field not in god_data:
-            god_data[field] = {} if field == "stats" else ""
-
-    # Ensure stats is a dict
-    if not isinstance(god_data.get("stats"), dict):
-        god_data["stats"] = {}
-
-    # Ensure scaling_info is a dict
-    if not isinstance(god_data.get("scaling_info"), dict):
-        god_data["scaling_info"] = {}
-
-    # Ensure other optional fields exist
-    optional_fields = [
-        "damage_type",
-        "image_url",
-        "counter_gods",
-        "counter_items",
-        "synergy_items",
-        "meta_role",
-    ]
-    for field in optional_fields:
+            god_data[field] = []
+    for field in GOD_STR_FIELDS:
         if field not in god_data:
-            if field in ["counter_gods", "counter_items", "synergy_items"]:
-                god_data[field] = []
-            else:
-                god_data[field] = ""
+            god_data[field] = ""
 
     return True, "Valid"
 
 
 def validate_smite2_item_data(item_data):
     """Validate and clean scraped Smite 2 item data."""
-    if "name" not in item_data or not item_data["name"]:
+    if not item_data.get("name"):
         return False, "Missing or empty name"
 
-    # Ensure required fields exist
-    required_fields = ["cost", "tier", "category", "stats", "tags"]
-    for field in required_fields:
-        if field not in item_data:
-            if field == "stats":
-                item_data[field] = {}
-            elif field == "tags":
-                item_data[field] = []
-            elif field == "cost":
-                item_data[field] = 0
-            elif field == "tier":
-                item_data[field] = 0
-            else:
-                item_data[field] = ""
-
-    # Ensure stats is a dict
+    # Ensure stats is a dict and tags is a list
     if not isinstance(item_data.get("stats"), dict):
         item_data["stats"] = {}
-
-    # Ensure tags is a list
     if not isinstance(item_data.get("tags"), list):
         item_data["tags"] = []
 
-    # Ensure tier is int
-    try:
-        item_data["tier"] = int(item_data["tier"])
-    except (ValueError, TypeError):
-        item_data["tier"] = 0
+    # Ensure tier and cost are ints
+    item_data["tier"] = _as_int(item_data.get("tier", 0))
+    item_data["cost"] = _as_int(item_data.get("cost", 0))
 
-    # Ensure cost is int
-    try:
-        item_data["cost"] = int(item_data["cost"])
-    except (ValueError, TypeError):
-        item_data["cost"] = 0
-
-    # Ensure passive field exists
-    if "passive" not in item_data:
-        item_data["passive"] = ""
+    # Ensure other fields exist
+    for field in ITEM_STR_FIELDS:
+        if field not in item_data:
+            item_data[field] = ""
 
     return True, "Valid"
 
@@ -108,90 +191,79 @@ def main():
 
     # Initialize components
     db = Database()
-    scraper = WikiSmite2Scraper()
+    session = None
+    if requests_cache is not None:
+        cache_path = os.path.join(os.path.dirname(os.path.abspath(db.db_path)), WIKI_CACHE_NAME)
+        session = requests_cache.CachedSession(
+            cache_path, backend="sqlite", expire_after=WIKI_CACHE_EXPIRE_SECONDS
+        )
+    scraper = WikiSmite2Scraper(session=session)
+
+    # Fetch and validate everything before touching the database, so the write
+    # transaction below only holds the lock for the deletes and bulk inserts.
+    # Records are validated as the scraper streams them in.
+    try:
+        print("👥 Fetching gods from Smite 2 Wiki...")
+        with closing(stream_in_background(scraper.iter_gods())) as gods:
+            valid_gods, total_gods = collect_valid(gods, validate_smite2_god_data, "god")
+        print(f"✅ Found {total_gods} gods")
+
+        print("\n⚔️ Fetching items from Smite 2 Wiki...")
+        with closing(stream_in_background(scraper.iter_items())) as items:
+            valid_items, total_items = collect_valid(items, validate_smite2_item_data, "item")
+        print(f"✅ Found {total_items} items")
+
+        print("\n📝 Fetching patch notes from Smite 2 Wiki...")
+        patches = scraper.get_patch_notes()
+        print(f"✅ Found {len(patches)} patches")
+    except Exception as e:
+        print(f"❌ Sync failed, previous data kept: {e}")
+        return
+
+    today = datetime.now().strftime("%Y-%m-%d")
+    patch_records = [
+        {
+            "version": patch.get("version", "Unknown"),
+            "date": patch.get("date", today),
+            "notes": patch.get("content", ""),
+            "title": patch.get("title", ""),
+            "url": patch.get("url", ""),
+            "source": "wiki",
+        }
+        for patch in patches
+    ]
 
-    print("🧹 Clearing old data...")
-    # Clear existing data
+    # Replace old data in one transaction so a failed sync leaves the previous data intact
+    print("\n🧹 Replacing old data...")
     with db.get_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute("DELETE FROM god_abilities")
-        cursor.execute("DELETE FROM god_relationships")
-        cursor.execute("DELETE FROM god_playstyles")
-        cursor.execute("DELETE FROM gods")
-        cursor.execute("DELETE FROM item_tags")
-        cursor.execute("DELETE FROM item_stats")
-        cursor.execute("DELETE FROM items")
-        cursor.execute("DELETE FROM patches")
-        conn.commit()
-
-    # Sync gods
-    print("👥 Fetching gods from Smite 2 Wiki...")
-    gods = scraper.get_all_gods()
-    print(f"✅ Found {len(gods)} gods")
-
-    successful_gods = 0
-    for i, god in enumerate(gods, 1):
-        try:
-            # Validate and clean god data
-            is_valid, message = validate_smite2_god_data(god)
-            if not is_valid:
-                print(f"⚠️ Skipping god {i}: {message}")
-                continue
-
-            db.add_god(serialize_for_db(god))
-            print(f"  ✅ {god['name']}")
-            successful_gods += 1
-        except Exception as e:
-            print(f"  ❌ Failed to add {god.get('name', f'God {i}')}: {e}")
-
-    # Sync items
-    print("\n⚔️ Fetching items from Smite 2 Wiki...")
-    items = scraper.get_all_items()
-    print(f"✅ Found {len(items)} items")
-
-    successful_items = 0
-    for i, item in enumerate(items, 1):
-        try:
-            # Validate and clean item data
-            is_valid, message = validate_smite2_item_data(item)
-            if not is_valid:
-                print(f"⚠️ Skipping item {i}: {message}")
-                continue
-
-            db.add_item(serialize_for_db(item))
-            print(f"  ✅ {item['name']}")
-            successful_items += 1
-        except Exception as e:
-            print(f"  ❌ Failed to add {item.get('name', f'Item {i}')}: {e}")
-
-    # Sync patches
-    print("\n📝 Fetching patch notes from Smite 2 Wiki...")
-    patches = scraper.get_patch_notes()
-    print(f"✅ Found {len(patches)} patches")
-
-    successful_patches = 0
-    for patch in patches:
         try:
-            db.add_patch(
-                version=patch.get("version", "Unknown"),
-                date=patch.get("date", datetime.now().strftime("%Y-%m-%d")),
-                notes=patch.get("content", ""),
-                title=patch.get("title", ""),
-                url=patch.get("url", ""),
-                source="wiki",
-            )
-            print(f"  ✅ {patch.get('title', 'Unknown')}")
-            successful_patches += 1
+            cursor.execute("BEGIN")
+            cursor.execute("DELETE FROM god_abilities")
+            cursor.execute("DELETE FROM god_relationships")
+            cursor.execute("DELETE FROM god_playstyles")
+            cursor.execute("DELETE FROM gods")
+            cursor.execute("DELETE FROM item_tags")
+            cursor.execute("DELETE FROM item_stats")
+            cursor.execute("DELETE FROM items")
+            cursor.execute("DELETE FROM patches")
+
+            successful_gods = db.add_gods_bulk(valid_gods, cursor)
+            successful_items = db.add_items_bulk(valid_items, cursor)
+            successful_patches = db.add_patches_bulk(patch_records, cursor)
+            conn.commit()
         except Exception as e:
-            print(f"  ❌ Failed to add {patch.get('title', 'Unknown')}: {e}")
+            conn.rollback()
+            print(f"❌ Sync failed, previous data kept: {e}")
+            return
 
     # Final verification
     gods_count = len(db.get_all_gods())
     items_count = len(db.get_all_items())
 
     print(f"\n📊 Smite 2 Sync Summary:")
-    print(f"  Gods imported: {successful_gods}/{len(gods)}")
-    print(f"  Items imported: {successful_items}/{len(items)}")
+    print(f"  Gods imported: {successful_gods}/{total_gods}")
+    print(f"  Items imported: {successful_items}/{total_items}")
     print(f"  Patches imported: {successful_patches}/{len(patches)}")
     print(f"  Total gods in DB: {gods_count}")
     print(f"  Total items in DB: {items_count}")
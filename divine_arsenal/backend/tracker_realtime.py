@@ -4,17 +4,71 @@ Tracker.gg Real-Time Data Collection for SMITE 2 Divine Arsenal
 Implements Grok's recommendations for API-driven data collection
 """
 
+import asyncio
 import logging
 import time
-import requests
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from itertools import chain
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 
+import aiohttp
+from cachetools import LRUCache, TTLCache
+from tenacity import retry, retry_if_exception_type, wait_exponential
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Casefolded god name -> composition category; exact lookups so "ra" never matches "Raijin"
+_GOD_CATEGORY = {"aphrodite": "heal", "hel": "heal", "ra": "heal", "chang'e": "heal"}
+# Casefolded archetype names counted as physical damage
+_PHYSICAL_ARCHETYPES = frozenset({"hunter", "warrior", "assassin"})
+# Shared fallback for missing response objects; never mutated
+_EMPTY: Dict[str, Any] = {}
+# Seconds between polls for each match phase; item state changes faster later in a match
+_PHASE_POLLING_INTERVALS = {"early_game": 120, "mid_game": 30, "late_game": 15}
+
+# Seconds to wait before retrying after Tracker.gg answers 429 Too Many Requests
+RATE_LIMIT_BACKOFF = 60
+
+
+class TrackerRequestError(Exception):
+    """Transient Tracker.gg failure that is worth retrying."""
+
+
+class RateLimited(TrackerRequestError):
+    """Tracker.gg rejected the request with 429 Too Many Requests."""
+
+
+_RETRYABLE_ERRORS = (TrackerRequestError, aiohttp.ClientError, asyncio.TimeoutError)
+_backoff = wait_exponential(multiplier=1, min=1, max=30)
 
-@dataclass
+
+def _retry_wait(retry_state) -> float:
+    """Back off exponentially, or for a full rate limit window after a 429."""
+    if isinstance(retry_state.outcome.exception(), RateLimited):
+        return RATE_LIMIT_BACKOFF
+    return _backoff(retry_state)
+
+
+def _stop_after_max_retries(retry_state) -> bool:
+    """Stop once the collector's max_retries attempts have been made."""
+    collector = retry_state.args[0]
+    return retry_state.attempt_number >= collector.max_retries
+
+
+def _flatten_detected_items(detected_items: Dict[str, List[str]]) -> Tuple[Tuple[str, str], ...]:
+    """Flatten player -> items into (player, item) pairs, players sorted, items in build order."""
+    return tuple(
+        (player, item) for player in sorted(detected_items) for item in detected_items[player]
+    )
+
+
+@dataclass(slots=True)
 class MatchData:
     """Real-time match data from Tracker.gg."""
     match_id: str
@@ -29,7 +83,7 @@ class MatchData:
     timestamp: datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class EnemyItemData:
     """Enemy item data for real-time analysis."""
     player_name: str
@@ -50,83 +104,166 @@ class TrackerRealtimeCollector:
     - TOS-compliant data collection
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self, api_key: Optional[str] = None, god_archetypes: Optional[Dict[str, str]] = None
+    ):
         self.api_key = api_key
         self.base_url = "https://public-api.tracker.gg/v2/smite2"
-        self.session = requests.Session()
-        self.session.headers.update({
+        self._profile_url = f"{self.base_url}/profile"
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.headers = {
             "User-Agent": "SMITE2-Divine-Arsenal/1.0 (Educational Tool)",
             "Accept": "application/json"
-        })
+        }
+        if api_key:
+            # Sent once per session instead of being merged into every request's params
+            self.headers["TRN-Api-Key"] = api_key
+        self.max_connections_per_host = 8
         
-        # Rate limiting
+        # Rate limiting, shared by all concurrent requests; times are time.monotonic() seconds
         self.rate_limit = 60  # requests per minute
-        self.last_request_time = 0
+        self.rate_limit_window = 60.0
+        self.last_request_time = 0.0
         self.request_count = 0
-        self.rate_limit_reset = datetime.now() + timedelta(minutes=1)
+        self._window_deadline = time.monotonic() + self.rate_limit_window
+        self._rate_limit_lock = asyncio.Lock()
         
-        # Caching
-        self.match_cache = {}
-        self.player_cache = {}
+        # Caching; entries expire after cache_duration seconds and the oldest are evicted first
         self.cache_duration = 300  # 5 minutes
+        # A live match changes between polls, so it never outlives the shortest phase interval;
+        # otherwise late-game polls would keep answering from a minutes-old snapshot
+        self.match_cache_duration = min(_PHASE_POLLING_INTERVALS.values())
+        self.match_cache: TTLCache = TTLCache(maxsize=1024, ttl=self.match_cache_duration)
+        self.player_cache: TTLCache = TTLCache(maxsize=1024, ttl=self.cache_duration)
+        
+        # Casefolded god name -> casefolded archetype, normalized once from the god database
+        self._god_archetypes: Dict[str, str] = {
+            name.casefold(): archetype.casefold()
+            for name, archetype in (god_archetypes or {}).items()
+        }
+        # (url, params) -> (ETag, Last-Modified, parsed body) for conditional GETs
+        self._validators: LRUCache = LRUCache(maxsize=1024)
+        
+        # God name -> (is_healer, is_physical), filled by _classify_god
+        self._god_categories: Dict[str, Tuple[bool, bool]] = {}
         
         # Data collection settings
         self.polling_interval = 60  # seconds
         self.max_retries = 3
         
-    def _respect_rate_limit(self):
-        """Respect Tracker.gg rate limits."""
-        now = datetime.now()
-        
-        # Reset counter if minute has passed
-        if now > self.rate_limit_reset:
-            self.request_count = 0
-            self.rate_limit_reset = now + timedelta(minutes=1)
+    @property
+    def rate_limit_reset(self) -> datetime:
+        """Wall-clock time at which the current rate limit window ends."""
+        return datetime.now() + timedelta(seconds=self._window_deadline - time.monotonic())
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get or create the aiohttp session."""
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=10),
+                connector=aiohttp.TCPConnector(limit_per_host=self.max_connections_per_host),
+            )
+        return self.session
+    
+    async def close(self):
+        """Close the aiohttp session."""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+    
+    async def _respect_rate_limit(self):
+        """Respect Tracker.gg rate limits.
         
-        # Check if we're at the limit
-        if self.request_count >= self.rate_limit:
-            sleep_time = (self.rate_limit_reset - now).total_seconds()
-            if sleep_time > 0:
-                logger.info(f"Rate limit reached, sleeping for {sleep_time:.1f} seconds")
-                time.sleep(sleep_time)
+        Only the slot reservation is serialized; requests themselves run concurrently.
+        """
+        async with self._rate_limit_lock:
+            now = time.monotonic()
+            
+            # Reset counter if the window has passed
+            if now > self._window_deadline:
                 self.request_count = 0
-                self.rate_limit_reset = datetime.now() + timedelta(minutes=1)
-        
-        # Ensure minimum time between requests
-        time_since_last = time.time() - self.last_request_time
-        if time_since_last < 1.0:  # Minimum 1 second between requests
-            time.sleep(1.0 - time_since_last)
-        
-        self.last_request_time = time.time()
-        self.request_count += 1
-    
-    def _make_api_request(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
-        """Make a rate-limited API request to Tracker.gg."""
-        try:
-            self._respect_rate_limit()
+                self._window_deadline = now + self.rate_limit_window
             
-            url = f"{self.base_url}/{endpoint}"
-            if self.api_key:
-                params = params or {}
-                params["api_key"] = self.api_key
+            # Check if we're at the limit
+            if self.request_count >= self.rate_limit:
+                sleep_time = self._window_deadline - now
+                if sleep_time > 0:
+                    logger.info(f"Rate limit reached, sleeping for {sleep_time:.1f} seconds")
+                    await asyncio.sleep(sleep_time)
+                    self.request_count = 0
+                    self._window_deadline = time.monotonic() + self.rate_limit_window
             
-            response = self.session.get(url, params=params, timeout=10)
+            # Ensure minimum time between requests
+            time_since_last = time.monotonic() - self.last_request_time
+            if time_since_last < 1.0:  # Minimum 1 second between requests
+                await asyncio.sleep(1.0 - time_since_last)
             
-            if response.status_code == 200:
-                return response.json()
-            elif response.status_code == 429:
+            self.last_request_time = time.monotonic()
+            self.request_count += 1
+    
+    async def _make_api_request(self, url: str, params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Make a rate-limited API request to a Tracker.gg URL.
+        
+        Transient failures are retried by _fetch_json; None is returned once they are exhausted.
+        """
+        try:
+            return await self._fetch_json(url, params)
+        except _RETRYABLE_ERRORS as e:
+            logger.error(f"Request error after {self.max_retries} attempts: {e!r}")
+            return None
+    
+    @retry(
+        stop=_stop_after_max_retries,
+        wait=_retry_wait,
+        retry=retry_if_exception_type(_RETRYABLE_ERRORS),
+        reraise=True,
+    )
+    async def _fetch_json(self, url: str, params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Fetch and decode one Tracker.gg response.
+        
+        Responses carrying an ETag or Last-Modified header are remembered, and later
+        requests for the same URL are sent as conditional GETs; a 304 Not Modified
+        returns the previously parsed body without downloading or decoding it again.
+        
+        Raises:
+            RateLimited: On 429 Too Many Requests
+            TrackerRequestError: On a 5xx server error
+        """
+        key = (url, tuple(sorted(params.items())) if params else ())
+        etag, last_modified, cached_body = self._validators.get(key, (None, None, None))
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        
+        await self._respect_rate_limit()
+        
+        session = await self._get_session()
+        async with session.get(url, params=params, headers=headers) as response:
+            if response.status == 200:
+                if orjson is not None:
+                    body = orjson.loads(await response.read())
+                else:
+                    body = await response.json()
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+                if etag or last_modified:
+                    self._validators[key] = (etag, last_modified, body)
+                return body
+            elif response.status == 304:
+                return cached_body
+            elif response.status == 429:
                 logger.warning("Rate limit exceeded, backing off")
-                time.sleep(60)  # Back off for 1 minute
-                return None
+                raise RateLimited(url)
+            elif response.status >= 500:
+                raise TrackerRequestError(f"{response.status} from {url}")
             else:
-                logger.error(f"API request failed: {response.status_code} - {response.text}")
+                # Other client errors won't succeed on retry
+                logger.error(f"API request failed: {response.status} - {await response.text()}")
                 return None
-                
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Request error: {e}")
-            return None
     
-    def get_player_current_match(self, player_name: str) -> Optional[MatchData]:
+    async def get_player_current_match(self, player_name: str) -> Optional[MatchData]:
         """
         Get current match data for a player.
         
@@ -138,59 +275,53 @@ class TrackerRealtimeCollector:
         """
         try:
             # Check cache first
-            cache_key = f"match_{player_name}"
-            if cache_key in self.match_cache:
-                cached = self.match_cache[cache_key]
-                if datetime.now() - cached.timestamp < timedelta(seconds=self.cache_duration):
-                    return cached
+            cached = self.match_cache.get(player_name)
+            if cached is not None:
+                return cached
             
             # Get player profile
-            profile_data = self._make_api_request(f"profile/{player_name}")
+            profile_data = await self._make_api_request(f"{self._profile_url}/{player_name}")
             if not profile_data:
                 return None
             
             # Check if player is currently in a match
-            current_match = profile_data.get("data", {}).get("currentMatch")
+            current_match = (profile_data.get("data") or _EMPTY).get("currentMatch")
             if not current_match:
                 return None
             
-            # Extract match data
-            match_id = current_match.get("matchId")
-            god_name = current_match.get("godName")
-            role = current_match.get("role")
-            match_duration = current_match.get("matchDuration", 0)
-            game_mode = current_match.get("gameMode", "conquest")
-            
             # Get team and enemy players
-            team_players = current_match.get("teamPlayers", [])
-            enemy_players = current_match.get("enemyPlayers", [])
+            team_players = current_match.get("teamPlayers") or []
+            enemy_players = current_match.get("enemyPlayers") or []
             
             # Extract detected items (if available)
             detected_items = {}
-            for player in team_players + enemy_players:
-                player_name = player.get("playerName")
-                items = player.get("items", [])
-                if player_name and items:
-                    detected_items[player_name] = items
+            for player in chain(team_players, enemy_players):
+                detected_name = player.get("playerName")
+                items = player.get("items")
+                if detected_name and items:
+                    detected_items[detected_name] = items
             
-            # Create match data
+            # Create match data straight from the response fields
             match_data = MatchData(
-                match_id=match_id,
+                match_id=current_match.get("matchId"),
                 player_name=player_name,
-                god_name=god_name,
-                role=role,
+                god_name=current_match.get("godName"),
+                role=current_match.get("role"),
                 team_players=team_players,
                 enemy_players=enemy_players,
                 detected_items=detected_items,
-                match_duration=match_duration,
-                game_mode=game_mode,
+                match_duration=current_match.get("matchDuration") or 0,
+                game_mode=current_match.get("gameMode") or "conquest",
                 timestamp=datetime.now()
             )
             
             # Cache the result
-            self.match_cache[cache_key] = match_data
+            self.match_cache[player_name] = match_data
             
-            logger.info(f"Retrieved current match for {player_name}: {god_name} ({role})")
+            logger.info(
+                f"Retrieved current match for {player_name}: "
+                f"{match_data.god_name} ({match_data.role})"
+            )
             return match_data
             
         except Exception as e:
@@ -210,23 +341,19 @@ class TrackerRealtimeCollector:
         enemy_items = {}
         
         try:
+            # The match snapshot is the same age for every player
+            age = (datetime.now() - match_data.timestamp).total_seconds()
+            # Base confidence, higher if the data is less than 1 minute old
+            base_confidence = 0.7 if age < 60 else 0.5
+            
             for enemy_player in match_data.enemy_players:
                 player_name = enemy_player.get("playerName")
                 god_name = enemy_player.get("godName")
                 items = enemy_player.get("items", [])
                 
                 if player_name and god_name:
-                    # Calculate confidence based on data quality
-                    confidence = 0.5  # Base confidence
-                    
                     # Higher confidence if we have items
-                    if items:
-                        confidence += 0.3
-                    
-                    # Higher confidence if we have recent data
-                    time_diff = datetime.now() - match_data.timestamp
-                    if time_diff.total_seconds() < 60:  # Less than 1 minute old
-                        confidence += 0.2
+                    confidence = base_confidence + 0.3 if items else base_confidence
                     
                     enemy_items[player_name] = EnemyItemData(
                         player_name=player_name,
@@ -243,7 +370,7 @@ class TrackerRealtimeCollector:
             logger.error(f"Error extracting enemy items: {e}")
             return {}
     
-    def get_player_recent_matches(self, player_name: str, limit: int = 10) -> List[Dict[str, Any]]:
+    async def get_player_recent_matches(self, player_name: str, limit: int = 10) -> List[Dict[str, Any]]:
         """
         Get recent matches for a player.
         
@@ -256,14 +383,13 @@ class TrackerRealtimeCollector:
         """
         try:
             # Check cache first
-            cache_key = f"recent_{player_name}_{limit}"
-            if cache_key in self.player_cache:
-                cached = self.player_cache[cache_key]
-                if datetime.now() - cached["timestamp"] < timedelta(seconds=self.cache_duration):
-                    return cached["matches"]
+            cache_key = (player_name, limit)
+            cached = self.player_cache.get(cache_key)
+            if cached is not None:
+                return cached
             
             # Get recent matches
-            matches_data = self._make_api_request(f"profile/{player_name}/matches", {
+            matches_data = await self._make_api_request(f"{self._profile_url}/{player_name}/matches", {
                 "limit": limit
             })
             
@@ -273,10 +399,7 @@ class TrackerRealtimeCollector:
             matches = matches_data.get("data", {}).get("matches", [])
             
             # Cache the result
-            self.player_cache[cache_key] = {
-                "matches": matches,
-                "timestamp": datetime.now()
-            }
+            self.player_cache[cache_key] = matches
             
             logger.info(f"Retrieved {len(matches)} recent matches for {player_name}")
             return matches
@@ -296,14 +419,18 @@ class TrackerRealtimeCollector:
             Meta analysis results
         """
         try:
+            team_gods, team_roles = self._split_gods_and_roles(match_data.team_players)
+            enemy_gods, enemy_roles = self._split_gods_and_roles(match_data.enemy_players)
+            
             analysis = {
                 "team_composition": {
-                    "gods": [p.get("godName") for p in match_data.team_players if p.get("godName")],
-                    "roles": [p.get("role") for p in match_data.team_players if p.get("role")]
+                    "gods": team_gods,
+                    "roles": team_roles
                 },
                 "enemy_composition": {
-                    "gods": [p.get("godName") for p in match_data.enemy_players if p.get("godName")],
-                    "roles": [p.get("role") for p in match_data.enemy_players if p.get("role")]
+                    "gods": enemy_gods,
+                    "roles": enemy_roles,
+                    "type": self._analyze_composition_type(enemy_gods)
                 },
                 "detected_items": match_data.detected_items,
                 "match_phase": self._determine_match_phase(match_data.match_duration),
@@ -311,11 +438,6 @@ class TrackerRealtimeCollector:
                 "analysis_timestamp": datetime.now().isoformat()
             }
             
-            # Add composition analysis
-            analysis["enemy_composition"]["type"] = self._analyze_composition_type(
-                analysis["enemy_composition"]["gods"]
-            )
-            
             logger.info(f"Analyzed match meta: {analysis['enemy_composition']['type']}")
             return analysis
             
@@ -323,6 +445,20 @@ class TrackerRealtimeCollector:
             logger.error(f"Error analyzing match meta: {e}")
             return {}
     
+    @staticmethod
+    def _split_gods_and_roles(players: List[Dict[str, Any]]) -> Tuple[List[str], List[str]]:
+        """Collect the god names and roles present on a team in a single pass."""
+        gods = []
+        roles = []
+        for player in players:
+            god = player.get("godName")
+            role = player.get("role")
+            if god:
+                gods.append(god)
+            if role:
+                roles.append(role)
+        return gods, roles
+    
     def _determine_match_phase(self, duration_seconds: int) -> str:
         """Determine match phase based on duration."""
         if duration_seconds < 300:  # Less than 5 minutes
@@ -332,29 +468,28 @@ class TrackerRealtimeCollector:
         else:
             return "late_game"
     
+    def _classify_god(self, god: str) -> Tuple[bool, bool]:
+        """Return (is_healer, is_physical) for a god name, memoized per collector."""
+        category = self._god_categories.get(god)
+        if category is None:
+            key = god.casefold()
+            category = (
+                _GOD_CATEGORY.get(key) == "heal",
+                self._god_archetypes.get(key) in _PHYSICAL_ARCHETYPES,
+            )
+            self._god_categories[god] = category
+        return category
+    
     def _analyze_composition_type(self, gods: List[str]) -> str:
         """Analyze enemy composition type."""
         if not gods:
             return "unknown"
         
         # Count damage types
-        physical_count = 0
-        magical_count = 0
-        healing_count = 0
-        
-        for god in gods:
-            god_lower = god.lower()
-            
-            # Check for healing gods
-            if any(healer in god_lower for healer in ["aphrodite", "hel", "ra", "chang'e"]):
-                healing_count += 1
-            
-            # This is simplified - in a real implementation, you'd have a god database
-            # For now, we'll use a basic heuristic
-            if any(physical in god_lower for physical in ["hunter", "warrior", "assassin"]):
-                physical_count += 1
-            else:
-                magical_count += 1
+        categories = [self._classify_god(god) for god in gods]
+        healing_count = sum(is_healer for is_healer, _ in categories)
+        physical_count = sum(is_physical for _, is_physical in categories)
+        magical_count = len(categories) - physical_count
         
         # Determine composition type
         if healing_count >= 2:
@@ -366,7 +501,7 @@ class TrackerRealtimeCollector:
         else:
             return "balanced"
     
-    def start_realtime_monitoring(self, player_name: str, callback=None):
+    async def start_realtime_monitoring(self, player_name: str, callback=None):
         """
         Start real-time monitoring for a player.
         
@@ -376,32 +511,67 @@ class TrackerRealtimeCollector:
         """
         logger.info(f"Starting real-time monitoring for {player_name}")
         
+        # Per-player state, so concurrent monitors started by monitor_players don't interfere
+        last_match_id = None
+        last_item_pairs: Tuple[Tuple[str, str], ...] = ()
+        
         try:
             while True:
                 # Get current match data
-                match_data = self.get_player_current_match(player_name)
+                match_data = await self.get_player_current_match(player_name)
+                interval = self.polling_interval
                 
-                if match_data and callback:
-                    # Analyze the match
-                    meta_analysis = self.analyze_match_meta(match_data)
-                    enemy_items = self.get_enemy_items_real_time(match_data)
+                if match_data:
+                    phase = self._determine_match_phase(match_data.match_duration)
+                    interval = _PHASE_POLLING_INTERVALS[phase]
+                    item_pairs = _flatten_detected_items(match_data.detected_items)
+                    changed = (
+                        match_data.match_id != last_match_id or item_pairs != last_item_pairs
+                    )
+                    last_match_id, last_item_pairs = match_data.match_id, item_pairs
                     
-                    # Call the callback with updates
-                    callback({
-                        "match_data": match_data,
-                        "meta_analysis": meta_analysis,
-                        "enemy_items": enemy_items,
-                        "timestamp": datetime.now()
-                    })
+                    # Nothing new since the last poll: skip the analysis and the callback
+                    if changed and callback:
+                        # Analyze the match
+                        meta_analysis = self.analyze_match_meta(match_data)
+                        enemy_items = self.get_enemy_items_real_time(match_data)
+                        
+                        # Call the callback with updates
+                        callback({
+                            "match_data": match_data,
+                            "meta_analysis": meta_analysis,
+                            "enemy_items": enemy_items,
+                            "timestamp": datetime.now()
+                        })
                 
-                # Wait before next poll
-                time.sleep(self.polling_interval)
+                # Wait before next poll, longer early in a match
+                await asyncio.sleep(interval)
                 
-        except KeyboardInterrupt:
+        except asyncio.CancelledError:
             logger.info(f"Stopped monitoring for {player_name}")
+            raise
         except Exception as e:
             logger.error(f"Error in real-time monitoring: {e}")
     
+    async def monitor_players(self, player_names: List[str], callback=None):
+        """
+        Monitor several players concurrently, one polling task per player.
+        
+        Args:
+            player_names: Players to monitor
+            callback: Function to call with match updates
+        """
+        tasks = [
+            asyncio.create_task(self.start_realtime_monitoring(player_name, callback))
+            for player_name in player_names
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await self.close()
+    
     def get_api_status(self) -> Dict[str, Any]:
         """Get API status and rate limit information."""
         return {
@@ -411,5 +581,6 @@ class TrackerRealtimeCollector:
             "rate_limit_reset": self.rate_limit_reset.isoformat(),
             "polling_interval": self.polling_interval,
             "cache_duration": self.cache_duration,
+            "match_cache_duration": self.match_cache_duration,
             "status": "operational"
         } 
\ No newline at end of file
@@ -5,24 +5,145 @@ Integrates with Tracker.gg for SMITE 2 profile authentication
 """
 
 import hashlib
+import hmac
+import json
+import logging
 import os
+import queue
 import secrets
 import sqlite3
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Any
 from dataclasses import dataclass, field
 
+from cachetools import TTLCache
+
 try:
     import jwt
 except ImportError:
     print("⚠️ JWT not installed. Run: pip install PyJWT")
     jwt = None
 
+try:
+    import bcrypt
+except ImportError:
+    print("⚠️ bcrypt not installed. Run: pip install bcrypt")
+    bcrypt = None
+
 try:
     from scrapers.tracker import TrackerScraper
 except ImportError:
     TrackerScraper = None
 
+logger = logging.getLogger(__name__)
+
+# Applied to every connection; journal_mode=WAL is set once on the writer and persists in the file
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+)
+# Prepared statements kept per connection; the module's SQL constants all stay resident
+CACHED_STATEMENTS = 256
+# Read-only connections shared by lookups; WAL lets them read while a write is in progress.
+# Match this to the number of worker threads so lookups never wait for a connection.
+READ_POOL_SIZE = int(os.getenv('USER_AUTH_READ_POOL_SIZE', '4'))
+# Columns written when creating users; fields missing from a user dict are stored as NULL
+USER_INSERT_COLUMNS = (
+    "user_id", "username", "tracker_gg_profile", "email", "password_hash", "avatar_url",
+    "rank", "level", "favorite_role", "favorite_gods", "join_date", "last_login",
+    "is_online", "status", "bio",
+)
+USER_INSERT_SQL = (
+    f"INSERT INTO users ({', '.join(USER_INSERT_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(USER_INSERT_COLUMNS))})"
+)
+# Profile columns read for a user; presence (is_online/status) is read from online_status
+# instead of the legacy users columns of the same name, which are only kept for older readers
+USER_PROFILE_COLUMNS = (
+    "user_id", "username", "tracker_gg_profile", "email", "avatar_url", "rank", "level",
+    "favorite_role", "favorite_gods", "join_date", "last_login", "bio", "discord_id",
+    "steam_id", "created_at",
+)
+# Subset returned when validating a token; the token already identifies the user
+USER_SUMMARY_COLUMNS = ("user_id", "username", "rank", "level", "favorite_role", "favorite_gods")
+
+
+def _user_select_sql(columns) -> str:
+    """Build a user SELECT over the given users columns plus presence."""
+    return (
+        f"SELECT {', '.join('u.' + column for column in columns)}, "
+        "COALESCE(os.is_online, FALSE) AS is_online, COALESCE(os.status, 'offline') AS status "
+        "FROM users u LEFT JOIN online_status os ON os.user_id = u.user_id"
+    )
+
+
+# Hot statements, built once so every call passes the identical SQL text and hits the
+# connection's prepared-statement cache instead of re-parsing
+USER_BY_ID_SQL = f"{_user_select_sql(USER_PROFILE_COLUMNS)} WHERE u.user_id = ?"
+USER_SUMMARY_BY_ID_SQL = f"{_user_select_sql(USER_SUMMARY_COLUMNS)} WHERE u.user_id = ?"
+USER_BY_TRACKER_PROFILE_SQL = (
+    f"{_user_select_sql(USER_PROFILE_COLUMNS)} WHERE u.tracker_gg_profile = ?"
+)
+# Login is the only read that needs the password hash
+USER_LOGIN_SQL = (
+    f"{_user_select_sql(USER_PROFILE_COLUMNS + ('password_hash',))} WHERE u.username = ?"
+)
+VALID_SESSION_SQL = (
+    "SELECT 1 FROM user_sessions WHERE session_id = ? AND user_id = ? AND expires_at > ?"
+)
+SESSION_INSERT_SQL = (
+    "INSERT INTO user_sessions (session_id, user_id, token, expires_at) VALUES (?, ?, ?, ?)"
+)
+ONLINE_STATUS_UPSERT_SQL = """
+    INSERT INTO online_status (user_id, is_online, status, last_seen)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(user_id) DO UPDATE SET
+        is_online = excluded.is_online,
+        status = excluded.status,
+        last_seen = excluded.last_seen
+"""
+# bcrypt work factor for new password hashes
+BCRYPT_ROUNDS = 12
+# Decoded token claims are reused for this long before the signature is checked again.
+# The user_sessions row is still checked on every validation.
+TOKEN_CACHE_TTL = 300
+# User rows are re-read after this long even if no write invalidated them
+USER_CACHE_TTL = 30
+# Friends lists are re-read after this long; add_friend evicts both users immediately
+FRIENDS_CACHE_TTL = 60
+# Each half of the friends query is driven by one user_friends index
+FRIENDS_SELECT_SQL = """
+    SELECT u.user_id, u.username, u.avatar_url, u.rank, u.level, u.favorite_role,
+           uf.status AS friendship_status
+    FROM user_friends uf
+    JOIN users u ON u.user_id = uf.friend_id
+    WHERE uf.user_id = ? AND uf.status = 'accepted'
+    UNION ALL
+    SELECT u.user_id, u.username, u.avatar_url, u.rank, u.level, u.favorite_role,
+           uf.status AS friendship_status
+    FROM user_friends uf
+    JOIN users u ON u.user_id = uf.user_id
+    WHERE uf.friend_id = ? AND uf.status = 'accepted'
+"""
+# Friend requests look up the friend and insert in one statement; self-requests insert nothing
+FRIEND_REQUEST_INSERT_SQL = """
+    INSERT INTO user_friends (friendship_id, user_id, friend_id, status)
+    SELECT ?, ?, user_id, 'pending' FROM users
+    WHERE tracker_gg_profile = ? AND user_id != ?
+    RETURNING friend_id
+"""
+# Expired sessions are swept at most this often, when a new session is created
+SESSION_GC_INTERVAL = 300
+# Random bytes fetched per os.urandom call when generating IDs
+RANDOM_BUFFER_SIZE = 1024
+
 
 @dataclass
 class UserProfile:
@@ -48,7 +169,7 @@ class UserProfile:
 class UserAuth:
     """User authentication and profile management system."""
 
-    def __init__(self, db_path: Optional[str] = None):
+    def __init__(self, db_path: Optional[str] = None, read_pool_size: int = READ_POOL_SIZE):
         # Use a proper database path relative to the backend directory
         if db_path is None:
             # Get the directory where this script is located
@@ -59,13 +180,40 @@ class UserAuth:
 
         # Ensure the database directory exists
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-        print(f"[DEBUG] Trying to open database at: {self.db_path}")
+        logger.debug("Trying to open database at: %s", self.db_path)
         self.secret_key = os.getenv('JWT_SECRET_KEY', secrets.token_hex(32))
+        # Reused for every token instead of going through the module-level jwt helpers
+        self._jwt = jwt.PyJWT() if jwt else None
+        self._secret_bytes = self.secret_key.encode()
 
         # 🔧 LAZY INITIALIZATION - Don't create TrackerScraper during startup
         self._tracker_scraper = None
 
+        # One long-lived writer, serialized by a lock, plus a small pool of readers
+        self._conn = self._connect()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._write_lock = threading.Lock()
         self._init_database()
+        self._readers: queue.Queue = queue.Queue()
+        for _ in range(max(1, read_pool_size)):
+            self._readers.put(self._connect(read_only=True))
+
+        # Token digest -> (user_id, session_id, exp) decoded from verified tokens, and
+        # (user_id, full) -> user row. Writes to a user evict it, so validate_token never
+        # serves a stale profile.
+        self._cache_lock = threading.Lock()
+        self._token_cache: TTLCache = TTLCache(maxsize=10_000, ttl=TOKEN_CACHE_TTL)
+        self._user_cache: TTLCache = TTLCache(maxsize=10_000, ttl=USER_CACHE_TTL)
+        # user_id -> friend rows without presence, which changes too often to cache
+        self._friends_cache: TTLCache = TTLCache(maxsize=10_000, ttl=FRIENDS_CACHE_TTL)
+        # time.monotonic() after which the next session creation sweeps expired sessions
+        self._next_session_gc = 0.0
+
+        # Buffered os.urandom output for IDs; each byte is handed out once
+        self._rand_lock = threading.Lock()
+        self._rand_buffer = b""
+        self._rand_offset = 0
+        self._rand_pid = os.getpid()
 
     @property
     def tracker_scraper(self):
@@ -76,14 +224,125 @@ class UserAuth:
             self._tracker_scraper = TrackerScraper(use_selenium=False)
         return self._tracker_scraper
 
+    def _connect(self, read_only: bool = False) -> sqlite3.Connection:
+        """Open a connection to the auth database with the shared pragmas applied."""
+        if read_only:
+            conn = sqlite3.connect(
+                f"{Path(self.db_path).as_uri()}?mode=ro",
+                uri=True,
+                isolation_level=None,
+                check_same_thread=False,
+                cached_statements=CACHED_STATEMENTS,
+            )
+        else:
+            conn = sqlite3.connect(
+                self.db_path,
+                isolation_level=None,
+                check_same_thread=False,
+                cached_statements=CACHED_STATEMENTS,
+            )
+        conn.row_factory = sqlite3.Row
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    @contextmanager
+    def _read(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a read-only connection from the pool."""
+        conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        """Run the block in a single write transaction on the shared connection."""
+        with self._write_lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    @staticmethod
+    def _hash_password(password: str) -> str:
+        """Hash a password with bcrypt for storage."""
+        if not bcrypt:
+            raise ImportError("bcrypt library not available. Install with: pip install bcrypt")
+        return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode()
+
+    @staticmethod
+    def _is_legacy_hash(stored_hash: str) -> bool:
+        """Whether a stored hash is an unsalted SHA-256 hex digest from older accounts."""
+        return len(stored_hash) == 64 and all(c in "0123456789abcdef" for c in stored_hash)
+
+    def _check_password(self, password: str, stored_hash: str) -> bool:
+        """Check a password against a stored bcrypt or legacy SHA-256 hash."""
+        if self._is_legacy_hash(stored_hash):
+            legacy_hash = hashlib.sha256(password.encode()).hexdigest()
+            return hmac.compare_digest(legacy_hash, stored_hash)
+        if not bcrypt:
+            raise ImportError("bcrypt library not available. Install with: pip install bcrypt")
+        return bcrypt.checkpw(password.encode(), stored_hash.encode())
+
+    def _rand_hex(self, nbytes: int) -> str:
+        """Return nbytes of cryptographically secure randomness as hex.
+
+        Equivalent to secrets.token_hex, but served from a buffer refilled with one
+        os.urandom call per RANDOM_BUFFER_SIZE bytes. The buffer is discarded after a
+        fork so worker processes never hand out the same bytes.
+        """
+        with self._rand_lock:
+            pid = os.getpid()
+            if pid != self._rand_pid or self._rand_offset + nbytes > len(self._rand_buffer):
+                self._rand_buffer = os.urandom(max(RANDOM_BUFFER_SIZE, nbytes))
+                self._rand_offset = 0
+                self._rand_pid = pid
+            start = self._rand_offset
+            self._rand_offset += nbytes
+            return self._rand_buffer[start:self._rand_offset].hex()
+
+    @staticmethod
+    def _token_key(token: str) -> bytes:
+        """Digest a token for use as a cache key."""
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+    def _invalidate_user(self, user_id: str):
+        """Drop a cached user row after it has been written."""
+        with self._cache_lock:
+            self._user_cache.pop((user_id, True), None)
+            self._user_cache.pop((user_id, False), None)
+
+    @staticmethod
+    def _user_from_row(row: sqlite3.Row) -> Dict[str, Any]:
+        """Convert a users row to a dict with favorite_gods parsed into a list.
+
+        favorite_gods is stored as a JSON array; rows written before that hold a
+        comma-joined string, which is still split.
+        """
+        user_data = dict(row)
+        favorite_gods = user_data.get('favorite_gods')
+        if not favorite_gods:
+            user_data['favorite_gods'] = []
+        elif favorite_gods.startswith('['):
+            user_data['favorite_gods'] = json.loads(favorite_gods)
+        else:
+            user_data['favorite_gods'] = favorite_gods.split(',')
+        return user_data
+
     def _init_database(self):
         """Initialize user authentication database tables."""
-        print(f"[DEBUG] _init_database using path: {self.db_path}")
-        print(f"[DEBUG] db_path repr: {repr(self.db_path)}")
-        print(f"[DEBUG] DB file exists: {os.path.exists(self.db_path)}")
-        print(f"[DEBUG] DB dir exists: {os.path.exists(os.path.dirname(self.db_path))}")
-        print(f"[DEBUG] DB dir permissions: {oct(os.stat(os.path.dirname(self.db_path)).st_mode)}")
-        with sqlite3.connect(self.db_path) as conn:
+        if logger.isEnabledFor(logging.DEBUG):
+            # Only stat the database files when someone will see the result
+            db_dir = os.path.dirname(self.db_path)
+            logger.debug("_init_database using path: %r", self.db_path)
+            logger.debug("DB file exists: %s", os.path.exists(self.db_path))
+            logger.debug("DB dir exists: %s", os.path.exists(db_dir))
+            logger.debug("DB dir permissions: %s", oct(os.stat(db_dir).st_mode))
+        with self._write() as conn:
             cursor = conn.cursor()
 
             # Users table
@@ -93,6 +352,7 @@ class UserAuth:
                     username TEXT UNIQUE NOT NULL,
                     tracker_gg_profile TEXT UNIQUE NOT NULL,
                     email TEXT,
+                    password_hash TEXT,
                     avatar_url TEXT,
                     rank TEXT,
                     level INTEGER,
@@ -109,6 +369,11 @@ class UserAuth:
                 )
             """)
 
+            # Databases created before site credentials existed lack the password column
+            columns = {row[1] for row in cursor.execute("PRAGMA table_info(users)")}
+            if "password_hash" not in columns:
+                cursor.execute("ALTER TABLE users ADD COLUMN password_hash TEXT")
+
             # User sessions table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS user_sessions (
@@ -165,11 +430,27 @@ class UserAuth:
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_users_username ON users(username)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_users_tracker_profile ON users(tracker_gg_profile)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_sessions_user_id ON user_sessions(user_id)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_friends_user_id ON user_friends(user_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_sessions_expires ON user_sessions(expires_at)")
+            # Friendships are looked up from either side, always filtered by status
+            cursor.execute("DROP INDEX IF EXISTS idx_friends_user_id")
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_friends_pair ON user_friends(user_id, status)"
+            )
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_friends_rev ON user_friends(friend_id, status)"
+            )
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_chat_room_id ON chat_messages(room_id)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_online_status ON online_status(is_online)")
-
-            conn.commit()
+            # Online users are listed newest first, so the index carries the sort order too
+            cursor.execute("DROP INDEX IF EXISTS idx_online_status")
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_online_last_seen "
+                "ON online_status(is_online, last_seen DESC)"
+            )
+            # Case-insensitive prefix searches (LIKE 'q%') can range-scan a NOCASE index
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_users_username_nocase "
+                "ON users(username COLLATE NOCASE)"
+            )
 
     def authenticate_with_tracker(self, tracker_username: str) -> Optional[Dict[str, Any]]:
         """Authenticate user with Tracker.gg SMITE 2 profile."""
@@ -186,12 +467,8 @@ class UserAuth:
             user = self.get_user_by_tracker_profile(tracker_username)
 
             if user:
-                # Update last login and online status
-                self.update_user_login(user['user_id'])
-                self.set_user_online(user['user_id'])
-
-                # Generate new session token
-                token = self.create_session(user['user_id'])
+                # Update last login and online status and open a new session
+                token = self._record_login(user['user_id'])
 
                 return {
                     "success": True,
@@ -222,24 +499,19 @@ class UserAuth:
     def _create_user_from_tracker(self, tracker_username: str, profile: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Create new user from Tracker.gg profile."""
         try:
-            user_id = f"user_{secrets.token_hex(8)}"
+            user_id = f"user_{self._rand_hex(8)}"
 
             # Extract data from Tracker.gg profile
             stats = profile.get('stats', {})
             recent_matches = profile.get('recent_matches', [])
 
-            # Determine favorite role and gods from recent matches
-            role_counts = {}
-            god_counts = {}
-
-            for _match in recent_matches[:10]:  # Last 10 matches
-                role = match.get('role', 'Unknown')
-                god = match.get('god_name', 'Unknown')
-                role_counts[role] = role_counts.get(role, 0) + 1
-                god_counts[god] = god_counts.get(god, 0) + 1
+            # Determine favorite role and gods from the last 10 matches
+            last_matches = recent_matches[:10]
+            role_counts = Counter(match.get('role', 'Unknown') for match in last_matches)
+            god_counts = Counter(match.get('god_name', 'Unknown') for match in last_matches)
 
-            favorite_role = max(role_counts.items(), key=lambda x: x[1])[0] if role_counts else None
-            favorite_gods = [god for god, count in sorted(god_counts.items(), key=lambda x: x[1], reverse=True)[:5]]
+            favorite_role = role_counts.most_common(1)[0][0] if role_counts else None
+            favorite_gods = [god for god, _ in god_counts.most_common(5)]
 
             user_data = {
                 'user_id': user_id,
@@ -258,28 +530,7 @@ class UserAuth:
             }
 
             # Insert into database
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT INTO users (
-                        user_id, username, tracker_gg_profile, avatar_url, rank, level,
-                        favorite_role, favorite_gods, join_date, last_login, is_online, status, bio
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    user_data['user_id'], user_data['username'], user_data['tracker_gg_profile'],
-                    user_data['avatar_url'], user_data['rank'], user_data['level'],
-                    user_data['favorite_role'], ','.join(user_data['favorite_gods']),
-                    user_data['join_date'], user_data['last_login'], user_data['is_online'],
-                    user_data['status'], user_data['bio']
-                ))
-
-                # Add to online status table
-                cursor.execute("""
-                    INSERT INTO online_status (user_id, is_online, status, last_seen)
-                    VALUES (?, ?, ?, ?)
-                """, (user_data['user_id'], True, 'online', datetime.now()))
-
-                conn.commit()
+            self.bulk_register_users([user_data])
 
             return user_data
 
@@ -287,11 +538,42 @@ class UserAuth:
             print(f"Error creating user: {e}")
             return None
 
+    def bulk_register_users(self, users: List[Dict[str, Any]]) -> int:
+        """Insert several new users and their online status rows in one transaction.
+
+        Args:
+            users: User dicts keyed by users column name; favorite_gods may be a list
+
+        Returns:
+            Number of users inserted
+        """
+        now = datetime.now()
+        gods_index = USER_INSERT_COLUMNS.index('favorite_gods')
+        user_rows = []
+        status_rows = []
+        for user in users:
+            row = [user.get(column) for column in USER_INSERT_COLUMNS]
+            favorite_gods = user.get('favorite_gods')
+            if isinstance(favorite_gods, list):
+                row[gods_index] = json.dumps(favorite_gods)
+            user_rows.append(row)
+            status_rows.append(
+                (user['user_id'], user.get('is_online', False), user.get('status', 'offline'), now)
+            )
+
+        with self._write() as conn:
+            conn.executemany(USER_INSERT_SQL, user_rows)
+            conn.executemany("""
+                INSERT INTO online_status (user_id, is_online, status, last_seen)
+                VALUES (?, ?, ?, ?)
+            """, status_rows)
+        return len(user_rows)
+
     def register_user(self, username: str, email: str, password: str, tracker_gg_profile: Optional[str] = None) -> Dict[str, Any]:
         """Register a new user with site credentials."""
         try:
             # Check if username already exists
-            with sqlite3.connect(self.db_path) as conn:
+            with self._read() as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT user_id FROM users WHERE username = ?", (username,))
                 if cursor.fetchone():
@@ -304,10 +586,10 @@ class UserAuth:
                         return {"error": "Email already registered"}
 
             # Hash the password
-            password_hash = hashlib.sha256(password.encode()).hexdigest()
+            password_hash = self._hash_password(password)
 
             # Generate user ID
-            user_id = f"user_{secrets.token_hex(8)}"
+            user_id = f"user_{self._rand_hex(8)}"
 
             # Create user data
             user_data = {
@@ -323,27 +605,7 @@ class UserAuth:
             }
 
             # Insert into database
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT INTO users (
-                        user_id, username, email, password_hash, tracker_gg_profile, join_date,
-                        last_login, is_online, status, bio
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    user_data['user_id'], user_data['username'], user_data['email'],
-                    password_hash, user_data['tracker_gg_profile'], user_data['join_date'],
-                    user_data['last_login'], user_data['is_online'], user_data['status'],
-                    user_data['bio']
-                ))
-
-                # Add to online status table
-                cursor.execute("""
-                    INSERT INTO online_status (user_id, is_online, status, last_seen)
-                    VALUES (?, ?, ?, ?)
-                """, (user_data['user_id'], True, 'online', datetime.now()))
-
-                conn.commit()
+            self.bulk_register_users([{**user_data, 'password_hash': password_hash}])
 
             # Create session token
             token = self.create_session(user_id)
@@ -362,47 +624,34 @@ class UserAuth:
     def authenticate_with_credentials(self, username: str, password: str) -> Optional[Dict[str, Any]]:
         """Authenticate user with username and password."""
         try:
-            # Hash the password for comparison
-            password_hash = hashlib.sha256(password.encode()).hexdigest()
+            with self._read() as conn:
+                row = conn.execute(USER_LOGIN_SQL, (username,)).fetchone()
 
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT * FROM users WHERE username = ?
-                """, (username,))
-
-                row = cursor.fetchone()
-                if row:
-                    columns = [desc[0] for _desc in cursor.description]
-                    user_data = dict(zip(columns, row))
-
-                    # Check if password hash matches
-                    stored_password_hash = user_data.get('password_hash')
-                    if not stored_password_hash:
-                        return {"error": "Account not properly configured"}
-
-                    if stored_password_hash != password_hash:
-                        return {"error": "Invalid username or password"}
-
-                    # Parse favorite gods
-                    if user_data.get('favorite_gods'):
-                        user_data['favorite_gods'] = user_data['favorite_gods'].split(',')
-                    else:
-                        user_data['favorite_gods'] = []
-
-                    # Update last login and online status
-                    self.update_user_login(user_data['user_id'])
-                    self.set_user_online(user_data['user_id'])
-
-                    # Generate new session token
-                    token = self.create_session(user_data['user_id'])
+            if row:
+                user_data = self._user_from_row(row)
 
-                    return {
-                        "success": True,
-                        "user": user_data,
-                        "token": token,
-                        "is_new_user": False
-                    }
+                # Check if password hash matches; the hash is never returned to the caller
+                stored_password_hash = user_data.pop('password_hash')
+                if not stored_password_hash:
+                    return {"error": "Account not properly configured"}
+
+                if not self._check_password(password, stored_password_hash):
+                    return {"error": "Invalid username or password"}
+
+                # Upgrade accounts still on unsalted SHA-256 now that we have the password
+                new_password_hash = None
+                if self._is_legacy_hash(stored_password_hash):
+                    new_password_hash = self._hash_password(password)
+
+                # Update last login and online status and open a new session
+                token = self._record_login(user_data['user_id'], new_password_hash)
+
+                return {
+                    "success": True,
+                    "user": user_data,
+                    "token": token,
+                    "is_new_user": False
+                }
 
             return {"error": "Invalid username or password"}
 
@@ -412,262 +661,267 @@ class UserAuth:
 
     def get_user_by_tracker_profile(self, tracker_username: str) -> Optional[Dict[str, Any]]:
         """Get user by Tracker.gg profile name."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT * FROM users WHERE tracker_gg_profile = ?
-            """, (tracker_username,))
-
-            row = cursor.fetchone()
-            if row:
-                columns = [desc[0] for _desc in cursor.description]
-                user_data = dict(zip(columns, row))
-
-                # Parse favorite gods
-                if user_data.get('favorite_gods'):
-                    user_data['favorite_gods'] = user_data['favorite_gods'].split(',')
-                else:
-                    user_data['favorite_gods'] = []
-
-                return user_data
+        with self._read() as conn:
+            row = conn.execute(USER_BY_TRACKER_PROFILE_SQL, (tracker_username,)).fetchone()
+
+        return self._user_from_row(row) if row else None
+
+    def get_user_by_id(self, user_id: str, full: bool = True) -> Optional[Dict[str, Any]]:
+        """Get user by user ID.
+
+        Args:
+            user_id: User to look up
+            full: Return the whole profile; otherwise only USER_SUMMARY_COLUMNS and presence
+        """
+        key = (user_id, full)
+        with self._cache_lock:
+            user_data = self._user_cache.get(key)
+        if user_data is not None:
+            return dict(user_data)
+
+        select_sql = USER_BY_ID_SQL if full else USER_SUMMARY_BY_ID_SQL
+        with self._read() as conn:
+            row = conn.execute(select_sql, (user_id,)).fetchone()
+        if not row:
             return None
 
-    def get_user_by_id(self, user_id: str) -> Optional[Dict[str, Any]]:
-        """Get user by user ID."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM users WHERE user_id = ?", (user_id,))
-
-            row = cursor.fetchone()
-            if row:
-                columns = [desc[0] for _desc in cursor.description]
-                user_data = dict(zip(columns, row))
-
-                # Parse favorite gods
-                if user_data.get('favorite_gods'):
-                    user_data['favorite_gods'] = user_data['favorite_gods'].split(',')
-                else:
-                    user_data['favorite_gods'] = []
-
-                return user_data
-            return None
+        user_data = self._user_from_row(row)
+        with self._cache_lock:
+            self._user_cache[key] = user_data
+        return dict(user_data)
 
     def create_session(self, user_id: str, expires_in_hours: int = 24) -> str:
         """Create a new session for user."""
+        with self._write() as conn:
+            return self._insert_session(conn, user_id, expires_in_hours)
+
+    def _insert_session(
+        self, conn: sqlite3.Connection, user_id: str, expires_in_hours: int = 24
+    ) -> str:
+        """Insert a session row within an open write transaction and return its token."""
         if not jwt:
             raise ImportError("JWT library not available. Install with: pip install PyJWT")
 
-        session_id = f"session_{secrets.token_hex(16)}"
-        token = jwt.encode(
+        session_id = f"session_{self._rand_hex(16)}"
+        token = self._jwt.encode(
             {
                 'user_id': user_id,
                 'session_id': session_id,
-                'exp': datetime.utcnow() + timedelta(hours=expires_in_hours)
+                'exp': int(time.time()) + expires_in_hours * 3600
             },
-            self.secret_key,
+            self._secret_bytes,
             algorithm='HS256'
         )
 
         expires_at = datetime.now() + timedelta(hours=expires_in_hours)
 
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO user_sessions (session_id, user_id, token, expires_at)
-                VALUES (?, ?, ?, ?)
-            """, (session_id, user_id, token, expires_at))
-            conn.commit()
+        conn.execute(SESSION_INSERT_SQL, (session_id, user_id, token, expires_at))
+        self._gc_sessions(conn)
 
         return token
 
+    def _gc_sessions(self, conn: sqlite3.Connection) -> int:
+        """Delete expired sessions within an open write transaction.
+
+        Runs at most once per SESSION_GC_INTERVAL; other calls return immediately.
+
+        Returns:
+            Number of sessions deleted
+        """
+        now = time.monotonic()
+        if now < self._next_session_gc:
+            return 0
+        self._next_session_gc = now + SESSION_GC_INTERVAL
+        cursor = conn.execute(
+            "DELETE FROM user_sessions WHERE expires_at < ?", (datetime.now(),)
+        )
+        return cursor.rowcount
+
+    def _record_login(self, user_id: str, password_hash: Optional[str] = None) -> str:
+        """Mark a user logged in and online and open a session, in one transaction.
+
+        Args:
+            user_id: User who logged in
+            password_hash: Replacement password hash, if the stored one is being upgraded
+
+        Returns:
+            Session token for the new session
+        """
+        now = datetime.now()
+        with self._write() as conn:
+            conn.execute("""
+                UPDATE users
+                SET last_login = ?, password_hash = COALESCE(?, password_hash)
+                WHERE user_id = ?
+            """, (now, password_hash, user_id))
+            conn.execute(ONLINE_STATUS_UPSERT_SQL, (user_id, True, "online", now))
+            token = self._insert_session(conn, user_id)
+        self._invalidate_user(user_id)
+        return token
+
     def validate_token(self, token: str) -> Optional[Dict[str, Any]]:
         """Validate JWT token and return user data."""
         if not jwt:
             return None
 
-        try:
-            payload = jwt.decode(token, self.secret_key, algorithms=['HS256'])
+        # Recently decoded tokens skip the signature check. The session row is still read
+        # every time, so a logout through any UserAuth instance or worker takes effect at once.
+        key = self._token_key(token)
+        with self._cache_lock:
+            cached = self._token_cache.get(key)
+        if cached is None:
+            try:
+                payload = self._jwt.decode(token, self._secret_bytes, algorithms=['HS256'])
+            except jwt.InvalidTokenError:
+                return None
             user_id = payload.get('user_id')
             session_id = payload.get('session_id')
-
             if not user_id or not session_id:
                 return None
-
-            # Check if session exists and is valid
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT * FROM user_sessions
-                    WHERE session_id = ? AND user_id = ? AND expires_at > ?
-                """, (session_id, user_id, datetime.now()))
-
-                if cursor.fetchone():
-                    return self.get_user_by_id(user_id)
-
-            return None
-
-        except jwt.ExpiredSignatureError:
-            return None
-        except jwt.InvalidTokenError:
-            return None
+            cached = (user_id, session_id, payload['exp'])
+            with self._cache_lock:
+                self._token_cache[key] = cached
+
+        user_id, session_id, exp = cached
+        if exp > time.time():
+            # Check if session exists and is valid; one primary-key lookup
+            with self._read() as conn:
+                session = conn.execute(
+                    VALID_SESSION_SQL, (session_id, user_id, datetime.now())
+                ).fetchone()
+            if session:
+                return self.get_user_by_id(user_id, full=False)
+
+        with self._cache_lock:
+            self._token_cache.pop(key, None)
+        return None
 
     def update_user_login(self, user_id: str):
         """Update user's last login time."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
+        with self._write() as conn:
+            conn.execute("""
                 UPDATE users SET last_login = ? WHERE user_id = ?
             """, (datetime.now(), user_id))
-            conn.commit()
+        self._invalidate_user(user_id)
 
     def set_user_online(self, user_id: str, status: str = "online"):
         """Set user as online."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-
-            # Update users table
-            cursor.execute("""
-                UPDATE users SET is_online = ?, status = ? WHERE user_id = ?
-            """, (True, status, user_id))
-
-            # Update online_status table
-            cursor.execute("""
-                INSERT OR REPLACE INTO online_status (user_id, is_online, status, last_seen)
-                VALUES (?, ?, ?, ?)
-            """, (user_id, True, status, datetime.now()))
-
-            conn.commit()
+        with self._write() as conn:
+            conn.execute(ONLINE_STATUS_UPSERT_SQL, (user_id, True, status, datetime.now()))
+        self._invalidate_user(user_id)
 
     def set_user_offline(self, user_id: str):
         """Set user as offline."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-
-            # Update users table
-            cursor.execute("""
-                UPDATE users SET is_online = ?, status = ? WHERE user_id = ?
-            """, (False, "offline", user_id))
-
-            # Update online_status table
-            cursor.execute("""
+        with self._write() as conn:
+            conn.execute("""
                 UPDATE online_status SET is_online = ?, status = ?, last_seen = ?
                 WHERE user_id = ?
             """, (False, "offline", datetime.now(), user_id))
-
-            conn.commit()
+        self._invalidate_user(user_id)
 
     def get_online_users(self) -> List[Dict[str, Any]]:
         """Get list of online users."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._read() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT u.user_id, u.username, u.avatar_url, u.rank, u.level,
-                       u.favorite_role, u.status, os.last_seen, os.current_game, os.party_id
+                       u.favorite_role, os.status, os.last_seen, os.current_game, os.party_id
                 FROM users u
                 JOIN online_status os ON u.user_id = os.user_id
                 WHERE os.is_online = TRUE
                 ORDER BY os.last_seen DESC
             """)
 
-            users = []
-            for _row in cursor.fetchall():
-                users.append({
-                    'user_id': row[0],
-                    'username': row[1],
-                    'avatar_url': row[2],
-                    'rank': row[3],
-                    'level': row[4],
-                    'favorite_role': row[5],
-                    'status': row[6],
-                    'last_seen': row[7],
-                    'current_game': row[8],
-                    'party_id': row[9]
-                })
-
-            return users
-
-    def search_users(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
-        """Search users by username."""
-        with sqlite3.connect(self.db_path) as conn:
+            return [dict(row) for row in cursor.fetchall()]
+
+    def search_users(self, query: str, limit: int = 10, substring: bool = False) -> List[Dict[str, Any]]:
+        """Search users by username.
+
+        Args:
+            query: Text the username starts with, matched case-insensitively
+            limit: Maximum number of users to return
+            substring: Match the text anywhere in the username; this scans every user
+        """
+        pattern = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        if substring:
+            pattern = "%" + pattern
+
+        with self._read() as conn:
             cursor = conn.cursor()
             cursor.execute("""
-                SELECT user_id, username, avatar_url, rank, level, favorite_role, is_online, status
-                FROM users
-                WHERE username LIKE ?
-                ORDER BY is_online DESC, username ASC
+                SELECT u.user_id, u.username, u.avatar_url, u.rank, u.level, u.favorite_role,
+                       COALESCE(os.is_online, FALSE) AS is_online,
+                       COALESCE(os.status, 'offline') AS status
+                FROM users u
+                LEFT JOIN online_status os ON os.user_id = u.user_id
+                WHERE u.username LIKE ? ESCAPE '\\'
+                ORDER BY is_online DESC, u.username ASC
                 LIMIT ?
-            """, (f"%{query}%", limit))
-
-            users = []
-            for _row in cursor.fetchall():
-                users.append({
-                    'user_id': row[0],
-                    'username': row[1],
-                    'avatar_url': row[2],
-                    'rank': row[3],
-                    'level': row[4],
-                    'favorite_role': row[5],
-                    'is_online': bool(row[6]),
-                    'status': row[7]
-                })
-
-            return users
+            """, (pattern, limit))
+
+            return [dict(row, is_online=bool(row['is_online'])) for row in cursor.fetchall()]
 
     def add_friend(self, user_id: str, friend_username: str) -> Dict[str, Any]:
         """Add a friend request."""
-        # Get friend's user_id
-        friend = self.get_user_by_tracker_profile(friend_username)
-        if not friend:
-            return {"error": "User not found"}
-
-        if user_id == friend['user_id']:
-            return {"error": "Cannot add yourself as friend"}
-
-        friendship_id = f"friendship_{secrets.token_hex(8)}"
+        friendship_id = f"friendship_{self._rand_hex(8)}"
 
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT INTO user_friends (friendship_id, user_id, friend_id, status)
-                    VALUES (?, ?, ?, ?)
-                """, (friendship_id, user_id, friend['user_id'], 'pending'))
-                conn.commit()
-
-            return {"success": True, "message": "Friend request sent"}
-
+            with self._write() as conn:
+                # Resolve the friend and insert the request in one statement
+                row = conn.execute(FRIEND_REQUEST_INSERT_SQL, (
+                    friendship_id, user_id, friend_username, user_id
+                )).fetchone()
+                if row is None:
+                    # Nothing inserted: either no such user or the user is adding themselves
+                    exists = conn.execute(
+                        "SELECT 1 FROM users WHERE tracker_gg_profile = ?", (friend_username,)
+                    ).fetchone()
         except sqlite3.IntegrityError:
             return {"error": "Friend request already exists"}
 
+        if row is None:
+            if exists:
+                return {"error": "Cannot add yourself as friend"}
+            return {"error": "User not found"}
+
+        with self._cache_lock:
+            self._friends_cache.pop(user_id, None)
+            self._friends_cache.pop(row['friend_id'], None)
+
+        return {"success": True, "message": "Friend request sent"}
+
     def get_friends(self, user_id: str) -> List[Dict[str, Any]]:
-        """Get user's friends list."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT u.user_id, u.username, u.avatar_url, u.rank, u.level,
-                       u.favorite_role, u.is_online, u.status, uf.status as friendship_status
-                FROM user_friends uf
-                JOIN users u ON (uf.friend_id = u.user_id OR uf.user_id = u.user_id)
-                WHERE (uf.user_id = ? OR uf.friend_id = ?)
-                AND u.user_id != ?
-                AND uf.status = 'accepted'
-            """, (user_id, user_id, user_id))
-
-            friends = []
-            for _row in cursor.fetchall():
-                friends.append({
-                    'user_id': row[0],
-                    'username': row[1],
-                    'avatar_url': row[2],
-                    'rank': row[3],
-                    'level': row[4],
-                    'favorite_role': row[5],
-                    'is_online': bool(row[6]),
-                    'status': row[7],
-                    'friendship_status': row[8]
-                })
-
-            return friends
+        """Get user's friends list.
+
+        The friend rows are cached per user; presence is looked up on every call.
+        """
+        with self._cache_lock:
+            friends = self._friends_cache.get(user_id)
+
+        with self._read() as conn:
+            if friends is None:
+                friends = [dict(row) for row in conn.execute(FRIENDS_SELECT_SQL, (user_id, user_id))]
+                with self._cache_lock:
+                    self._friends_cache[user_id] = friends
+            if not friends:
+                return []
+
+            friend_ids = [friend['user_id'] for friend in friends]
+            placeholders = ",".join("?" * len(friend_ids))
+            presence = {
+                row['user_id']: (bool(row['is_online']), row['status'])
+                for row in conn.execute(
+                    f"SELECT user_id, is_online, status FROM online_status "
+                    f"WHERE user_id IN ({placeholders})",
+                    friend_ids,
+                )
+            }
+
+        result = []
+        for friend in friends:
+            is_online, status = presence.get(friend['user_id'], (False, 'offline'))
+            result.append({**friend, 'is_online': is_online, 'status': status})
+        return result
 
     def logout(self, token: str) -> bool:
         """Logout user by invalidating session."""
@@ -675,14 +929,14 @@ class UserAuth:
             return False
 
         try:
-            payload = jwt.decode(token, self.secret_key, algorithms=['HS256'])
+            payload = self._jwt.decode(token, self._secret_bytes, algorithms=['HS256'])
             session_id = payload.get('session_id')
 
             if session_id:
-                with sqlite3.connect(self.db_path) as conn:
-                    cursor = conn.cursor()
-                    cursor.execute("DELETE FROM user_sessions WHERE session_id = ?", (session_id,))
-                    conn.commit()
+                with self._cache_lock:
+                    self._token_cache.pop(self._token_key(token), None)
+                with self._write() as conn:
+                    conn.execute("DELETE FROM user_sessions WHERE session_id = ?", (session_id,))
 
                 return True
         except Exception:
@@ -701,3 +955,27 @@ class UserAuth:
                 print(f"⚠️ Error cleaning up WebDriver: {e}")
             finally:
                 self._tracker_scraper = None
+
+        # Close the writer and every pooled reader
+        with self._write_lock:
+            self._conn.close()
+        while not self._readers.empty():
+            self._readers.get_nowait().close()
+
+
+# UserAuth on the default database shared by the app and its blueprints, created on first use
+_shared_user_auth: Optional[UserAuth] = None
+_shared_user_auth_lock = threading.Lock()
+
+
+def get_user_auth() -> UserAuth:
+    """Get the process-wide UserAuth.
+
+    Sharing one instance gives every endpoint the same JWT secret and token cache,
+    so a token issued or logged out through one is seen the same way by the others.
+    """
+    global _shared_user_auth
+    with _shared_user_auth_lock:
+        if _shared_user_auth is None:
+            _shared_user_auth = UserAuth()
+        return _shared_user_auth
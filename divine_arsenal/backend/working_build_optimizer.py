@@ -1,13 +1,128 @@
 #!/usr/bin/env python3
 """🔥 PROFESSIONAL BUILD OPTIMIZER - ENHANCED WITH GOD ANALYSIS 🔥"""
 
+import heapq
+import operator
+import os
+import threading
 from dataclasses import dataclass
+from enum import IntFlag
+from itertools import chain
 from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
+from cachetools import TTLCache, cachedmethod
+
 from advanced_god_analyzer import AdvancedGodAnalyzer
 from database import Database
 
 
+# Scoring diagnostics are only collected when this environment variable is set
+DEBUG_ENV_VAR = "BUILD_OPT_DEBUG"
+DEBUG_LOG_PATH = "scaling_debug.log"
+
+# God rows and item synergies are recomputed after this many seconds
+GOD_CACHE_TTL = 300
+SYNERGY_CACHE_SIZE = 50_000
+
+# Only this many top-scored items are considered when picking a build and its alternatives
+CANDIDATE_POOL_SIZE = 20
+
+
+class ItemTag(IntFlag):
+    """Bits of ItemMatrix.tags, one per item tag the scoring looks at."""
+
+    PHYSICAL = 1
+    MAGICAL = 2
+    AURA = 4
+
+
+_TAG_BITS = {"Physical": ItemTag.PHYSICAL, "Magical": ItemTag.MAGICAL, "aura": ItemTag.AURA}
+_DAMAGE_TAGS = ItemTag.PHYSICAL | ItemTag.MAGICAL
+# Damage tag that, on its own, makes an item useless to a god of the given damage type
+_OFF_TYPE_TAG = {"Magical": ItemTag.PHYSICAL, "Physical": ItemTag.MAGICAL}
+
+# Item categories that never go in a main build
+_SKIP_CATEGORIES = frozenset({"Relic", "Consumable"})
+
+# Stats summed by the build analysis, grouped into damage, defense and utility columns
+_ANALYSIS_STATS = (
+    "physical_power",
+    "magical_power",
+    "attack_speed",
+    "critical_chance",
+    "penetration",
+    "physical_protection",
+    "magical_protection",
+    "health",
+    "cooldown_reduction",
+    "movement_speed",
+    "mana",
+)
+_DAMAGE_COLS = slice(0, 5)
+_DEFENSE_COLS = slice(5, 8)
+_UTILITY_COLS = slice(8, 11)
+
+# Name fragments of the anti-heal items a build can already counter healing with
+_ANTI_HEAL_MARKERS = ("divine", "pestilence")
+
+# Enemy gods whose healing calls for anti-heal
+_HEALING_GODS = frozenset({"Chang'e", "Hel", "Aphrodite", "Ra"})
+# Enemy gods counted towards a heavy physical or magical composition
+_PHYSICAL_THREAT_GODS = frozenset({"Apollo", "Artemis", "Achilles"})
+_MAGICAL_THREAT_GODS = frozenset({"Agni", "Scylla", "Zeus"})
+
+# Item categories that earn each role its role bonus
+_ROLE_BONUS_CATEGORIES = {
+    "Mid": ("Magical", "Offensive"),
+    "Carry": ("Physical", "Offensive"),
+    "Solo": ("Defense", "Hybrid"),
+    "Support": ("Defense", "Starter"),
+    "Jungle": ("Physical", "Magical", "Offensive"),
+}
+
+
+@dataclass
+class ItemMatrix:
+    """Items laid out column-wise (one array per field) for vectorized scoring."""
+
+    items: List[Dict[str, Any]]
+    names: np.ndarray  # object
+    categories: List[Any]  # category code -> category name
+    category: np.ndarray  # int16 category codes
+    tags: np.ndarray  # uint32 ItemTag bitmask
+    cost: np.ndarray  # float64
+    efficiency: np.ndarray  # float64, same as _calculate_item_efficiency for each item
+
+
+@dataclass(frozen=True, slots=True)
+class StatsRow:
+    """The _ANALYSIS_STATS of one item, read once from its stats dict.
+
+    Fields are declared in _ANALYSIS_STATS order, which from_item relies on.
+    """
+
+    physical_power: float = 0
+    magical_power: float = 0
+    attack_speed: float = 0
+    critical_chance: float = 0
+    penetration: float = 0
+    physical_protection: float = 0
+    magical_protection: float = 0
+    health: float = 0
+    cooldown_reduction: float = 0
+    movement_speed: float = 0
+    mana: float = 0
+
+    @classmethod
+    def from_item(cls, item: Dict[str, Any]) -> "StatsRow":
+        stats = item.get("stats", {})
+        return cls(*(stats.get(stat, 0) for stat in _ANALYSIS_STATS))
+
+
+_stats_values = operator.attrgetter(*_ANALYSIS_STATS)
+
+
 @dataclass
 class ItemSynergy:
     """Represents synergy between two items."""
@@ -42,6 +157,16 @@ class ProfessionalBuildOptimizer:
     def __init__(self, db: Database):
         self.db = db
         self.god_analyzer = AdvancedGodAnalyzer(db)
+        self._debug = bool(os.environ.get(DEBUG_ENV_VAR))
+        # Each build reads the same god several times; keep rows briefly instead of re-querying
+        self._god_cache: TTLCache = TTLCache(maxsize=512, ttl=GOD_CACHE_TTL)
+        self._god_cache_lock = threading.Lock()
+        # (god, item name, role) -> amplified synergy score
+        self._synergy_cache: TTLCache = TTLCache(maxsize=SYNERGY_CACHE_SIZE, ttl=GOD_CACHE_TTL)
+        self._synergy_cache_lock = threading.Lock()
+        # (item names, enemy gods) -> _analyze_counters result
+        self._counters_cache: TTLCache = TTLCache(maxsize=4096, ttl=GOD_CACHE_TTL)
+        self._counters_cache_lock = threading.Lock()
         self._init_role_priorities()
         self._init_counter_build_rules()
         self._init_team_synergy_rules()
@@ -112,6 +237,12 @@ class ProfessionalBuildOptimizer:
             },
         }
 
+        # Resolve each role's category score once; avoided categories win over preferred ones
+        for priorities in self.role_priorities.values():
+            category_scores = dict.fromkeys(priorities["categories"], 1.5)
+            category_scores.update(dict.fromkeys(priorities["avoid_categories"], -2.0))
+            priorities["category_scores"] = category_scores
+
     def _init_counter_build_rules(self):
         """🔥 BADASS Counter-Build Intelligence 🔥"""
         self.counter_rules = {
@@ -143,6 +274,11 @@ class ProfessionalBuildOptimizer:
             "burst_comp": ["Power", "Penetration", "Cooldown Reduction"],
         }
 
+    @cachedmethod(operator.attrgetter("_god_cache"), lock=operator.attrgetter("_god_cache_lock"))
+    def _get_god(self, god_name: str) -> Optional[Dict[str, Any]]:
+        """Fetch god data from the database, cached for GOD_CACHE_TTL seconds."""
+        return self.db.get_god(god_name)
+
     def _ensure_item_dict(self, item):
         """Ensure item is a dict with at least a 'name' key."""
         if isinstance(item, dict):
@@ -179,7 +315,7 @@ class ProfessionalBuildOptimizer:
             print(f"   Budget: {budget}")
 
             # Get god information
-            god = self.db.get_god(god_name)
+            god = self._get_god(god_name)
             if not god:
                 print(f"❌ God '{god_name}' not found in database")
                 return {"error": f"God '{god_name}' not found"}
@@ -204,27 +340,28 @@ class ProfessionalBuildOptimizer:
             print(f"📊 Meta template: {meta_template.god_name if meta_template else 'None'}")
 
             # 2. Score items using advanced synergy calculation
-            scored_items = self._score_items_with_god_analysis(
+            items, scores = self._score_items_with_god_analysis(
                 all_items, god_name, role, enemy_comp, team_comp
             )
 
-            print(f"🧮 Scored {len(scored_items)} items, top 5 scores:")
-            for item, score in sorted(scored_items, key=lambda x: x[1], reverse=True)[:5]:
+            print(f"🧮 Scored {len(items)} items, top 5 scores:")
+            for item, score in self._top_scored(items, scores, 5):
                 print(f"   {item.get('name', 'Unknown')}: {score:.2f}")
 
             # 3. Apply counter-build adjustments
             if enemy_comp:
-                scored_items = self._apply_counter_build_logic(scored_items, enemy_comp)
+                scores = self._apply_counter_build_logic(items, scores, enemy_comp)
                 print(f"🛡️ Applied counter-build logic for: {enemy_comp}")
 
             # 4. Apply team synergy bonuses
             if team_comp:
-                scored_items = self._apply_team_synergy_bonuses(scored_items, team_comp)
+                scores = self._apply_team_synergy_bonuses(items, scores, team_comp)
                 print(f"🤝 Applied team synergy for: {team_comp}")
 
             # 5. Select optimal items with variety
-            sorted_items = sorted(scored_items, key=lambda x: x[1], reverse=True)
-            selected_items = self._select_diverse_items(sorted_items, 6)
+            # Nothing past the candidate pool is used, so skip sorting the long tail
+            top_items = self._top_scored(items, scores, CANDIDATE_POOL_SIZE)
+            selected_items = self._select_diverse_items(top_items, 6)
 
             print(f"🎯 Selected items: {[item.get('name') for item in selected_items]}")
 
@@ -237,9 +374,10 @@ class ProfessionalBuildOptimizer:
             total_cost = sum(item.get("cost", 0) for item in selected_items)
 
             result = {
+                # Every scored item has a name; the other fields may be missing from item data
                 "items": [
                     {
-                        "item_name": item.get("name"),
+                        "item_name": item["name"],
                         "category": item.get("category"),
                         "tags": item.get("tags"),
                         "cost": item.get("cost"),
@@ -253,7 +391,7 @@ class ProfessionalBuildOptimizer:
                 "synergy_score": analysis.synergy_score,
                 "damage_simulation": analysis.damage_simulation,
                 "power_spikes": analysis.power_spikes,
-                "alternatives": self._generate_alternatives(sorted_items[6:12]),
+                "alternatives": self._generate_alternatives(top_items[6:12]),
                 "counters": self._analyze_counters(selected_items, enemy_comp),
                 "build_explanation": analysis.recommendation,
                 "optimization_details": {
@@ -280,6 +418,35 @@ class ProfessionalBuildOptimizer:
             traceback.print_exc()
             return {"error": f"Professional optimization failed: {str(e)}"}
 
+    def _build_item_matrix(self, items: List[Dict[str, Any]]) -> ItemMatrix:
+        """Lay out the item-only inputs to scoring as parallel arrays."""
+        items = [item for item in items if item and "name" in item]
+        category_codes: Dict[Any, int] = {}
+        category = [
+            category_codes.setdefault(item.get("category", ""), len(category_codes))
+            for item in items
+        ]
+        # Summing the distinct bits of an item's tags ORs them together
+        tags = [sum({_TAG_BITS.get(tag, 0) for tag in item.get("tags", [])}) for item in items]
+        stat_total = np.array(
+            [
+                sum(v for v in item.get("stats", {}).values() if isinstance(v, (int, float)))
+                for item in items
+            ],
+            dtype=np.float64,
+        )
+        cost = np.array([item.get("cost", 1) for item in items], dtype=np.float64)
+
+        return ItemMatrix(
+            items=items,
+            names=np.array([item["name"] for item in items], dtype=object),
+            categories=list(category_codes),
+            category=np.array(category, dtype=np.int16),
+            tags=np.array(tags, dtype=np.uint32),
+            cost=cost,
+            efficiency=np.divide(stat_total, cost, out=np.zeros(len(items)), where=cost > 0),
+        )
+
     def _score_items_with_god_analysis(
         self,
         items: List[Dict[str, Any]],
@@ -287,163 +454,188 @@ class ProfessionalBuildOptimizer:
         role: str,
         enemy_comp: Optional[List[str]] = None,
         team_comp: Optional[List[str]] = None,
-    ) -> List[Tuple[Dict[str, Any], float]]:
-        """Score items using advanced god analysis."""
-        scored_items: List[Tuple[Dict[str, Any], float]] = []
+    ) -> Tuple[List[Dict[str, Any]], np.ndarray]:
+        """Score items using advanced god analysis.
+
+        Returns the items that survived filtering and a parallel array of their scores.
+
+        Everything that depends only on the item (category, tags, cost efficiency) is
+        computed for all items at once; god synergy is still evaluated per item.
+        """
         role_priorities = self.role_priorities.get(role, self.role_priorities["Mid"])
 
         # Get god info for damage type filtering
-        god = self.db.get_god(god_name)
+        god = self._get_god(god_name)
         god_damage_type = god.get("damage_type", "Magical") if god else "Magical"
+        # 🔥 REAL SMITE 2 SCALING DATA 🔥
+        god_stats = god.get("stats", {}) if god else {}
+        god_intelligence = god_stats.get("intelligence")
+        god_strength = god_stats.get("strength")
 
-        # DEBUG: Log god data
-        with open("scaling_debug.log", "a", encoding="utf-8") as f:
-            f.write(f"[DEBUG] Scoring items for god: {god_name}\n")
-            f.write(f"[DEBUG] God data: {god}\n")
-            f.write(f"[DEBUG] God damage_type: {god_damage_type}\n")
-            f.write(f"[DEBUG] God stats: {god.get('stats', {}) if god else {}}\n")
-            f.write(
-                f"[DEBUG] God intelligence: {god.get('intelligence', 'None') if god else 'None'}\n"
-            )
-            f.write(f"[DEBUG] God strength: {god.get('strength', 'None') if god else 'None'}\n")
-            f.write("-" * 50 + "\n")
-
-        for item in items:
-            if not item or "name" not in item:
-                continue
-
-            # 🔥 FILTER OUT INAPPROPRIATE ITEMS 🔥
-            item_category = item.get("category", "")
-            item_tags = item.get("tags", [])
-
-            # DEBUG: Log the first few items to see their categories
-            if len(scored_items) < 5:
-                print(
-                    f"[DEBUG] Item: {item.get('name', 'Unknown')} | Category: {item_category} | Tags: {item_tags}"
+        # DEBUG: Collect diagnostics in memory and write them once at the end
+        debug_lines: Optional[List[str]] = [] if self._debug else None
+        if debug_lines is not None:
+            debug_lines += [
+                f"[DEBUG] Scoring items for god: {god_name}\n",
+                f"[DEBUG] God data: {god}\n",
+                f"[DEBUG] God damage_type: {god_damage_type}\n",
+                f"[DEBUG] God stats: {god.get('stats', {}) if god else {}}\n",
+                f"[DEBUG] God intelligence: {god.get('intelligence', 'None') if god else 'None'}\n",
+                f"[DEBUG] God strength: {god.get('strength', 'None') if god else 'None'}\n",
+                "-" * 50 + "\n",
+            ]
+
+        matrix = self._build_item_matrix(items)
+        categories = matrix.categories
+        physical = (matrix.tags & ItemTag.PHYSICAL) != 0
+        magical = (matrix.tags & ItemTag.MAGICAL) != 0
+
+        # 🔥 FILTER OUT INAPPROPRIATE ITEMS 🔥
+        # Relics and consumables never go in main builds; starters only for Support
+        skip_category = np.array(
+            [c in _SKIP_CATEGORIES or (c == "Starter" and role != "Support") for c in categories],
+            dtype=bool,
+        )
+        skip = skip_category[matrix.category]
+        # Damage type compatibility: drop items whose only damage tag is the other type
+        off_type_tag = _OFF_TYPE_TAG.get(god_damage_type)
+        if off_type_tag is not None:
+            skip |= (matrix.tags & _DAMAGE_TAGS) == off_type_tag
+        keep = np.flatnonzero(~skip)
+
+        if debug_lines is not None:
+            for i in np.flatnonzero(skip):
+                if skip_category[matrix.category[i]]:
+                    reason = f"category: {categories[matrix.category[i]]}"
+                elif physical[i]:
+                    reason = "physical-only for magical god"
+                else:
+                    reason = "magical-only for physical god"
+                debug_lines.append(f"[DEBUG] Skipping {matrix.names[i]} - {reason}\n")
+
+        # Base role scoring
+        base_score = self._calculate_base_role_scores(
+            matrix,
+            role_priorities,
+            god_damage_type,
+            god_intelligence,
+            god_strength,
+            physical,
+            magical,
+            debug_lines,
+        )[keep]
+
+        # 🔥 ADVANCED GOD SYNERGY 🔥
+        if debug_lines is not None:
+            for item in (matrix.items[i] for i in keep[:5]):
+                debug_lines.append(
+                    f"[DEBUG] Item: {item['name']} | Category: {item.get('category', '')}"
+                    f" | Tags: {item.get('tags', [])}\n"
                 )
+        # Synergy depends only on (god, item, role), so repeat builds reuse earlier results
+        with self._synergy_cache_lock:
+            cached = [
+                self._synergy_cache.get((god_name, name, role)) for name in matrix.names[keep]
+            ]
+        synergy_score = np.array([0.5 if score is None else score for score in cached])
+        misses = [j for j, score in enumerate(cached) if score is None]
+        if misses:
+            miss_items = [matrix.items[keep[j]] for j in misses]
+            computed: Dict[Tuple[str, str, str], float] = {}
+            for j, item, score in zip(
+                misses, miss_items, self._compute_item_synergies(god_name, miss_items, role)
+            ):
+                if score is not None:  # Failures keep the default 0.5 and are not cached
+                    synergy_score[j] = score
+                    computed[(god_name, item["name"], role)] = score
+            with self._synergy_cache_lock:
+                self._synergy_cache.update(computed)
+
+        # Meta template bonus: core items 3.0, situational items 1.5
+        meta_template = self.god_analyzer.get_meta_template(god_name, role)
+        meta_bonus = np.zeros(len(keep))
+        if meta_template:
+            core_items = frozenset(meta_template.core_items)
+            situational_items = frozenset(meta_template.situational_items)
+            meta_bonus[:] = [
+                3.0 if name in core_items else 1.5 if name in situational_items else 0.0
+                for name in matrix.names[keep]
+            ]
+
+        # Role-specific bonuses
+        role_categories = _ROLE_BONUS_CATEGORIES.get(role, ())
+        role_bonus = np.array([1.0 if c in role_categories else 0.0 for c in categories])
+        role_bonus = role_bonus[matrix.category[keep]]
+
+        # Cost efficiency bonus
+        efficiency_bonus = np.minimum(matrix.efficiency[keep] * 0.5, 1.0)
+
+        # Combine scores with better weighting
+        total_score = (
+            base_score * 0.3
+            + synergy_score * 0.3
+            + meta_bonus * 0.2
+            + role_bonus * 0.1
+            + efficiency_bonus * 0.1
+        )
 
-            # Skip relics and consumables for main builds
-            if item_category in ["Relic", "Consumable"]:
-                print(f"[DEBUG] Skipping {item.get('name', 'Unknown')} - category: {item_category}")
-                continue
+        if debug_lines is not None:
+            with open(DEBUG_LOG_PATH, "a", encoding="utf-8") as f:
+                f.writelines(debug_lines)
 
-            # Skip starter items for main builds (unless it's a starter-focused role)
-            if item_category == "Starter" and role not in ["Support"]:
-                print(f"[DEBUG] Skipping {item.get('name', 'Unknown')} - starter item")
-                continue
+        return [matrix.items[i] for i in keep], total_score
 
-            # Filter by damage type compatibility
-            if god_damage_type == "Magical":
-                # For magical gods, prefer magical items, avoid physical-only items
-                if "Physical" in item_tags and "Magical" not in item_tags:
-                    print(
-                        f"[DEBUG] Skipping {item.get('name', 'Unknown')} - physical-only for magical god"
-                    )
-                    continue  # Skip physical-only items for magical gods
-            elif god_damage_type == "Physical":
-                # For physical gods, prefer physical items, avoid magical-only items
-                if "Magical" in item_tags and "Physical" not in item_tags:
-                    print(
-                        f"[DEBUG] Skipping {item.get('name', 'Unknown')} - magical-only for physical god"
-                    )
-                    continue  # Skip magical-only items for physical gods
+    def _compute_item_synergies(
+        self, god_name: str, items: List[Dict[str, Any]], role: str
+    ) -> List[Optional[float]]:
+        """Amplified god synergy score for each item, or None where the analyzer fails.
 
-            # Base role scoring
-            base_score = self._calculate_base_role_score(item, role_priorities, god_name)
+        The batch runs unguarded; only if it raises are the items retried one by one,
+        so a single malformed item does not cost the others their scores.
+        """
+        try:
+            # Amplify synergy importance
+            synergies = self.god_analyzer.calculate_item_synergies(god_name, items, role)
+            return (synergies * 2.0).tolist()
+        except Exception:
+            pass
 
-            # 🔥 ADVANCED GOD SYNERGY 🔥
+        calculate = self.god_analyzer.calculate_item_synergy
+
+        scores: List[Optional[float]] = []
+        for item in items:
             try:
-                synergy = self.god_analyzer.calculate_item_synergy(god_name, item, role)
-                synergy_score = synergy.total_synergy * 2.0  # Amplify synergy importance
+                scores.append(calculate(god_name, item, role).total_synergy * 2.0)
             except Exception as e:
-                print(
-                    f"[WARNING] Synergy calculation failed for {item.get('name', 'Unknown')}: {e}"
-                )
-                synergy_score = 0.5  # Default synergy score
-
-            # Meta template bonus
-            meta_template = self.god_analyzer.get_meta_template(god_name, role)
-            meta_bonus = 0.0
-            if meta_template and item["name"] in meta_template.core_items:
-                meta_bonus = 3.0  # Increased bonus for core items
-            elif meta_template and item["name"] in meta_template.situational_items:
-                meta_bonus = 1.5  # Increased bonus for situational items
-
-            # Role-specific bonuses
-            role_bonus = 0.0
-            if role == "Mid" and item_category in ["Magical", "Offensive"]:
-                role_bonus = 1.0
-            elif role == "Carry" and item_category in ["Physical", "Offensive"]:
-                role_bonus = 1.0
-            elif role == "Solo" and item_category in ["Defense", "Hybrid"]:
-                role_bonus = 1.0
-            elif role == "Support" and item_category in ["Defense", "Starter"]:
-                role_bonus = 1.0
-            elif role == "Jungle" and item_category in ["Physical", "Magical", "Offensive"]:
-                role_bonus = 1.0
-
-            # Cost efficiency bonus
-            cost_efficiency = self._calculate_item_efficiency(item)
-            efficiency_bonus = min(cost_efficiency * 0.5, 1.0)
-
-            # Combine scores with better weighting
-            total_score = (
-                base_score * 0.3
-                + synergy_score * 0.3
-                + meta_bonus * 0.2
-                + role_bonus * 0.1
-                + efficiency_bonus * 0.1
-            )
-
-            scored_items.append((item, total_score))
-
-        return scored_items
-
-    def _calculate_base_role_score(
-        self, item: Dict[str, Any], role_priorities: Dict[str, Any], god_name: str
-    ) -> float:
-        """Calculate base role-specific score with real Smite 2 Intelligence/Strength scaling."""
-        score = 0.0
-
-        # Get god info for damage type and real scaling stats
-        god = self.db.get_god(god_name)
-        god_damage_type = god.get("damage_type", "Magical") if god else "Magical"
-        god_stats = god.get("stats", {}) if god else {}
-
-        # 🔥 REAL SMITE 2 SCALING DATA 🔥
-        god_intelligence = god_stats.get("intelligence")
-        god_strength = god_stats.get("strength")
-
-        # DEBUG: Log scaling calculation for first few items
-        if item.get("name", "").startswith(
-            "A"
-        ):  # Only log for items starting with 'A' to avoid spam
-            with open("scaling_debug.log", "a", encoding="utf-8") as f:
-                f.write(f"[DEBUG] Scoring item: {item.get('name', 'Unknown')}\n")
-                f.write(f"[DEBUG] God intelligence: {god_intelligence}, strength: {god_strength}\n")
-                f.write(f"[DEBUG] Item stats: {item.get('stats', {})}\n")
-                f.write(f"[DEBUG] Item tags: {item.get('tags', [])}\n")
+                print(f"[WARNING] Synergy calculation failed for {item['name']}: {e}")
+                scores.append(None)
+        return scores
 
+    def _calculate_base_role_scores(
+        self,
+        matrix: ItemMatrix,
+        role_priorities: Dict[str, Any],
+        god_damage_type: str,
+        god_intelligence: Optional[float],
+        god_strength: Optional[float],
+        physical: np.ndarray,
+        magical: np.ndarray,
+        debug_lines: Optional[List[str]] = None,
+    ) -> np.ndarray:
+        """Calculate base role-specific scores with real Smite 2 Intelligence/Strength scaling.
+
+        The god's damage type and scaling stats are looked up once by the caller.
+        """
         # Category scoring
-        item_category = item.get("category", "")
-        preferred_categories = role_priorities.get("categories", [])
-        avoid_categories = role_priorities.get("avoid_categories", [])
-
-        if item_category in avoid_categories:
-            score -= 2.0  # Heavy penalty for avoided categories
-        elif item_category in preferred_categories:
-            score += 1.5  # Bonus for preferred categories
-
-        # Damage type scoring
-        item_tags = item.get("tags", [])
-        if god_damage_type == "Magical" and "Magical" in item_tags:
-            score += 2.0  # Strong bonus for matching damage type
-        elif god_damage_type == "Physical" and "Physical" in item_tags:
-            score += 2.0  # Strong bonus for matching damage type
-        elif god_damage_type == "Magical" and "Physical" in item_tags:
-            score -= 1.5  # Penalty for wrong damage type
-        elif god_damage_type == "Physical" and "Magical" in item_tags:
-            score -= 1.5  # Penalty for wrong damage type
+        category_scores = role_priorities["category_scores"]
+        category_score = np.array([category_scores.get(c, 0.0) for c in matrix.categories])
+        score = category_score[matrix.category]
+
+        # Damage type scoring: strong bonus for matching damage type, penalty for the wrong one
+        if god_damage_type == "Magical":
+            score += np.where(magical, 2.0, np.where(physical, -1.5, 0.0))
+        elif god_damage_type == "Physical":
+            score += np.where(physical, 2.0, np.where(magical, -1.5, 0.0))
 
         # 🔥 REAL INTELLIGENCE/STRENGTH SCALING BONUSES 🔥
         scaling_bonus = 0.0
@@ -467,54 +659,71 @@ class ProfessionalBuildOptimizer:
 
         score += scaling_bonus
 
-        # DEBUG: Log final score for first few items
-        if item.get("name", "").startswith(
-            "A"
-        ):  # Only log for items starting with 'A' to avoid spam
-            with open("scaling_debug.log", "a", encoding="utf-8") as f:
-                f.write(f"[DEBUG] Final score: {score:.2f} (scaling bonus: {scaling_bonus:.2f})\n")
-                f.write("-" * 30 + "\n")
-
-        # Stat scoring based on role
-        item_stats = item.get("stats", {})
-
-        if role_priorities.get("primary_stats"):
-            for stat in role_priorities["primary_stats"]:
-                if stat in item_stats:
-                    score += item_stats[stat] * 0.1  # Bonus for primary stats
-
-        if role_priorities.get("secondary_stats"):
-            for stat in role_priorities["secondary_stats"]:
-                if stat in item_stats:
-                    score += item_stats[stat] * 0.05  # Smaller bonus for secondary stats
+        # DEBUG: Log scaling calculation for items starting with 'A' to avoid spam
+        if debug_lines is not None:
+            for i in np.flatnonzero(np.char.startswith(matrix.names.astype(str), "A")):
+                item = matrix.items[i]
+                debug_lines += [
+                    f"[DEBUG] Scoring item: {item['name']}\n",
+                    f"[DEBUG] God intelligence: {god_intelligence}, strength: {god_strength}\n",
+                    f"[DEBUG] Item stats: {item.get('stats', {})}\n",
+                    f"[DEBUG] Item tags: {item.get('tags', [])}\n",
+                    f"[DEBUG] Final score: {score[i]:.2f} (scaling bonus: {scaling_bonus:.2f})\n",
+                    "-" * 30 + "\n",
+                ]
 
         return score
 
-    def _apply_counter_build_logic(
-        self, scored_items: List[Tuple[Dict[str, Any], float]], enemy_comp: List[str]
+    @staticmethod
+    def _top_scored(
+        items: List[Dict[str, Any]], scores: np.ndarray, count: int
     ) -> List[Tuple[Dict[str, Any], float]]:
+        """The count highest-scored items, best first, with ties in item order.
+
+        Same result as a stable sort by descending score cut to count, but only the
+        items scoring at least the count-th best are ever sorted.
+        """
+        if count < len(scores):
+            kth = len(scores) - count
+            threshold = np.partition(scores, kth)[kth]
+            candidates = np.flatnonzero(scores >= threshold)
+        else:
+            candidates = np.arange(len(scores))
+        top = candidates[np.argsort(-scores[candidates], kind="stable")][:count]
+        return [(items[i], score) for i, score in zip(top, scores[top].tolist())]
+
+    def _apply_counter_build_logic(
+        self, items: List[Dict[str, Any]], scores: np.ndarray, enemy_comp: List[str]
+    ) -> np.ndarray:
         """🔥 Apply intelligent counter-building 🔥"""
         # Analyze enemy composition
         enemy_analysis = self._analyze_enemy_composition(enemy_comp)
 
-        # Apply counter bonuses
-        for i, (item, score) in enumerate(scored_items):
-            item_name = item.get("name", "")
-
-            # Check if item counters enemy composition
-            for threat_type, counter_rule in self.counter_rules.items():
-                if threat_type in enemy_analysis and item_name in counter_rule["items"]:
-                    scored_items[i] = (item, score + 1.5)  # Counter bonus
+        # Items that counter any threat in the enemy composition; the bonus applies once
+        counter_items = frozenset(
+            chain.from_iterable(
+                counter_rule["items"]
+                for threat_type, counter_rule in self.counter_rules.items()
+                if threat_type in enemy_analysis
+            )
+        )
+        if counter_items:
+            counters = np.fromiter(
+                (item.get("name", "") in counter_items for item in items),
+                dtype=bool,
+                count=len(items),
+            )
+            scores[counters] += 1.5  # Counter bonus
 
-        return scored_items
+        return scores
 
     def _analyze_enemy_composition(self, enemy_comp: List[str]) -> List[str]:
         """Analyze enemy composition for threats."""
         threats = []
 
         # Simple analysis (can be enhanced with god database)
-        physical_count = sum(1 for god in enemy_comp if god in ["Apollo", "Artemis", "Achilles"])
-        magical_count = sum(1 for god in enemy_comp if god in ["Agni", "Scylla", "Zeus"])
+        physical_count = sum(map(_PHYSICAL_THREAT_GODS.__contains__, enemy_comp))
+        magical_count = sum(map(_MAGICAL_THREAT_GODS.__contains__, enemy_comp))
 
         if physical_count >= 3:
             threats.append("heavy_physical")
@@ -522,23 +731,24 @@ class ProfessionalBuildOptimizer:
             threats.append("heavy_magical")
 
         # Check for specific threats
-        healing_gods = ["Chang'e", "Hel", "Aphrodite", "Ra"]
-        if any(god in enemy_comp for god in healing_gods):
+        if not _HEALING_GODS.isdisjoint(enemy_comp):
             threats.append("heavy_healing")
 
         return threats
 
     def _apply_team_synergy_bonuses(
-        self, scored_items: List[Tuple[Dict[str, Any], float]], team_comp: List[str]
-    ) -> List[Tuple[Dict[str, Any], float]]:
+        self, items: List[Dict[str, Any]], scores: np.ndarray, team_comp: List[str]
+    ) -> np.ndarray:
         """Apply team composition synergy bonuses."""
         # Simple team analysis (can be enhanced)
-        for i, (item, score) in enumerate(scored_items):
-            # Aura items get bonus with team-focused gods
-            if "aura" in item.get("tags", []) and len(team_comp) > 2:
-                scored_items[i] = (item, score + 0.5)
+        # Aura items get bonus with team-focused gods
+        if len(team_comp) > 2:
+            auras = np.fromiter(
+                ("aura" in item.get("tags", []) for item in items), dtype=bool, count=len(items)
+            )
+            scores[auras] += 0.5
 
-        return scored_items
+        return scores
 
     def _generate_professional_analysis(
         self, items: List[Dict[str, Any]], god_name: str, role: str, meta_template
@@ -565,26 +775,13 @@ class ProfessionalBuildOptimizer:
         # Calculate traditional metrics
         total_cost = sum(item.get("cost", 0) for item in items)
 
-        # Calculate damage/survivability/utility
-        damage_stats = [
-            "physical_power",
-            "magical_power",
-            "attack_speed",
-            "critical_chance",
-            "penetration",
-        ]
-        defense_stats = ["physical_protection", "magical_protection", "health"]
-        utility_stats = ["cooldown_reduction", "movement_speed", "mana"]
-
-        damage_total = sum(
-            sum(item.get("stats", {}).get(stat, 0) for stat in damage_stats) for item in items
-        )
-        defense_total = sum(
-            sum(item.get("stats", {}).get(stat, 0) for stat in defense_stats) for item in items
-        )
-        utility_total = sum(
-            sum(item.get("stats", {}).get(stat, 0) for stat in utility_stats) for item in items
-        )
+        # Calculate damage/survivability/utility from one (items, stats) matrix
+        stats = np.array(
+            [_stats_values(StatsRow.from_item(item)) for item in items], dtype=np.float64
+        ).reshape(len(items), len(_ANALYSIS_STATS))
+        damage_total = float(stats[:, _DAMAGE_COLS].sum())
+        defense_total = float(stats[:, _DEFENSE_COLS].sum())
+        utility_total = float(stats[:, _UTILITY_COLS].sum())
 
         damage_potential = min(1.0, damage_total / 400.0)
         survivability = min(1.0, defense_total / 500.0)
@@ -595,13 +792,10 @@ class ProfessionalBuildOptimizer:
         weaknesses = []
 
         # Analyze build composition
-        item_categories = [item.get("category", "Other") for item in items]
-        category_counts: Dict[str, int] = {}
-        for category in item_categories:
-            category_counts[category] = category_counts.get(category, 0) + 1
+        distinct_categories = {item.get("category", "Other") for item in items}
 
         # Check for good category distribution
-        if len(category_counts) >= 3:
+        if len(distinct_categories) >= 3:
             strengths.append("Well-rounded item selection")
         else:
             weaknesses.append("Limited item variety")
@@ -680,15 +874,19 @@ class ProfessionalBuildOptimizer:
         weaknesses: List[str],
     ) -> str:
         """Generate intelligent build recommendation."""
-        if synergy > 0.8 and meta_compliance > 0.8 and damage["dps"] > 1000:
+        # Each condition below is checked by more than one branch
+        high_damage = damage["dps"] > 1000
+        more_strengths = len(strengths) > len(weaknesses)
+
+        if synergy > 0.8 and meta_compliance > 0.8 and high_damage:
             return "🔥 ELITE BUILD - Professional meta with perfect synergy and high damage!"
-        elif synergy > 0.7 and len(strengths) > len(weaknesses):
+        elif synergy > 0.7 and more_strengths:
             return "💪 STRONG BUILD - Excellent item synergies and good composition!"
         elif meta_compliance > 0.7:
             return "📊 META BUILD - Follows professional strategies effectively!"
-        elif damage["dps"] > 1000:
+        elif high_damage:
             return "⚔️ HIGH DAMAGE - Massive damage potential with this build!"
-        elif len(strengths) > len(weaknesses):
+        elif more_strengths:
             return "✅ SOLID BUILD - Good overall composition with minor improvements possible!"
         else:
             return "🔧 NEEDS IMPROVEMENT - Consider better item synergies and role optimization!"
@@ -696,10 +894,12 @@ class ProfessionalBuildOptimizer:
     def _optimize_build_order(self, items: List[Dict[str, Any]], god_name: str) -> List[str]:
         """Optimize item build order for power progression."""
         # Sort by cost and power efficiency
-        ordered_items = sorted(
-            items, key=lambda x: (x.get("cost", 0), -self._calculate_item_efficiency(x))
-        )
-        return [item["name"] for item in ordered_items]
+        decorated = [
+            (item.get("cost", 0), -self._calculate_item_efficiency(item), item["name"])
+            for item in items
+        ]
+        decorated.sort(key=operator.itemgetter(0, 1))
+        return [name for _, _, name in decorated]
 
     def _calculate_item_efficiency(self, item: Dict[str, Any]) -> float:
         """Calculate item stat efficiency per gold."""
@@ -717,30 +917,54 @@ class ProfessionalBuildOptimizer:
 
         alternatives: Dict[str, List[str]] = {}
         for item, score in alternative_items[:6]:
-            category = item.get("category", "Other")
-            if category not in alternatives:
-                alternatives[category] = []
-            alternatives[category].append(item["name"])
+            alternatives.setdefault(item.get("category", "Other"), []).append(item["name"])
 
         return alternatives
 
     def _analyze_counters(
         self, items: List[Dict[str, Any]], enemy_comp: Optional[List[str]]
     ) -> Dict[str, Any]:
-        """Analyze what this build counters and what counters it."""
-        counters: Dict[str, List[str]] = {"strong_against": [], "weak_against": [], "counter_items_needed": []}
+        """Analyze what this build counters and what counters it.
+
+        Results only depend on which items and enemies are present, so builds of three
+        or more items are cached by those sets; callers always get their own copy.
+        """
+        if len(items) < 3:
+            return self._scan_counters(items, enemy_comp)
+
+        key = (frozenset(item.get("name", "") for item in items), frozenset(enemy_comp or ()))
+        with self._counters_cache_lock:
+            counters = self._counters_cache.get(key)
+        if counters is None:
+            counters = self._scan_counters(items, enemy_comp)
+            with self._counters_cache_lock:
+                self._counters_cache[key] = counters
+        return {category: list(entries) for category, entries in counters.items()}
+
+    def _scan_counters(
+        self, items: List[Dict[str, Any]], enemy_comp: Optional[List[str]]
+    ) -> Dict[str, List[str]]:
+        """Work out the counter analysis for _analyze_counters."""
+        counters: Dict[str, List[str]] = {
+            "strong_against": [],
+            "weak_against": [],
+            "counter_items_needed": [],
+        }
 
-        # Simple counter analysis
-        has_anti_heal = any(
-            "divine" in item.get("name", "").lower() or "pestilence" in item.get("name", "").lower()
-            for item in items
-        )
-        has_physical_defense = any(
-            item.get("stats", {}).get("physical_protection", 0) > 50 for item in items
-        )
-        has_magical_defense = any(
-            item.get("stats", {}).get("magical_protection", 0) > 50 for item in items
-        )
+        # Simple counter analysis, in one pass that stops once every flag is set
+        has_anti_heal = has_physical_defense = has_magical_defense = False
+        for item in items:
+            if not has_anti_heal:
+                name = item.get("name", "").lower()
+                has_anti_heal = any(marker in name for marker in _ANTI_HEAL_MARKERS)
+            if not (has_physical_defense and has_magical_defense):
+                stats = item.get("stats", {})
+                has_physical_defense = (
+                    has_physical_defense or stats.get("physical_protection", 0) > 50
+                )
+                has_magical_defense = has_magical_defense or stats.get("magical_protection", 0) > 50
+            if has_anti_heal and has_physical_defense and has_magical_defense:
+                break
 
         if has_anti_heal:
             counters["strong_against"].append("Healing compositions")
@@ -750,8 +974,8 @@ class ProfessionalBuildOptimizer:
             counters["strong_against"].append("Magical damage dealers")
 
         # Suggest needed counters
-        if enemy_comp:
-            if any("heal" in god.lower() for god in enemy_comp) and not has_anti_heal:
+        if enemy_comp and not has_anti_heal:
+            if any("heal" in god.lower() for god in enemy_comp):
                 counters["counter_items_needed"].append("Anti-heal items")
 
         return counters
@@ -764,56 +988,59 @@ class ProfessionalBuildOptimizer:
             return []
 
         # Take top 20 items for variety (increased from 15)
-        top_items = items[: min(20, len(items))]
-
-        selected_items: List[Dict[str, Any]] = []
-        used_categories = set()
-
-        # First pass: select core items for the role
-        role_core_items = self._get_role_core_items(top_items)
-        for item in role_core_items:
-            if len(selected_items) >= count:
-                break
-            selected_items.append(item)
-            used_categories.add(item.get("category", "Other"))
+        top_items = items[:CANDIDATE_POOL_SIZE]
+
+        # Each candidate's category is read once and shared with the core item pick
+        categories = [item.get("category", "Other") for item, score in top_items]
+
+        # Core items for the role go first
+        selected_items = self._get_role_core_items(top_items, categories)[:count]
+        selected_ids = {id(item) for item in selected_items}
+        used_categories = {
+            category
+            for (item, score), category in zip(top_items, categories)
+            if id(item) in selected_ids
+        }
 
-        # Second pass: select one item from each remaining category from top items
-        for item, score in top_items:
+        # Then one item from each remaining category; items from categories already
+        # covered are kept, best first, to fill whatever slots are left afterwards
+        spare_items: List[Dict[str, Any]] = []
+        for (item, score), category in zip(top_items, categories):
             if len(selected_items) >= count:
                 break
-            category = item.get("category", "Other")
-            if category not in used_categories and item not in selected_items:
+            if id(item) in selected_ids:
+                continue
+            if category in used_categories:
+                spare_items.append(item)
+            else:
                 selected_items.append(item)
                 used_categories.add(category)
 
-        # Third pass: fill remaining slots with best remaining items
-        remaining_slots = count - len(selected_items)
-        if remaining_slots > 0:
-            available_items = [item for item, score in top_items if item not in selected_items]
-            selected_items.extend(available_items[:remaining_slots])
-
+        selected_items.extend(spare_items[: count - len(selected_items)])
         return selected_items
 
     def _get_role_core_items(
-        self, top_items: List[Tuple[Dict[str, Any], float]]
+        self, top_items: List[Tuple[Dict[str, Any], float]], categories: List[Any]
     ) -> List[Dict[str, Any]]:
-        """Get core items that should be included for the role."""
-        core_items = []
+        """Get core items that should be included for the role.
 
+        categories holds the category of each entry in top_items.
+        """
         # Get the role from the first item's context (we'll need to pass role to this method)
         # For now, we'll select based on item categories and scores
 
-        # Always include at least one high-scoring item from each major category
-        categories_found = set()
-        for item, score in top_items:
-            category = item.get("category", "Other")
-            if category not in categories_found and score > 2.0:  # High score threshold
-                core_items.append(item)
-                categories_found.add(category)
-                if len(core_items) >= 3:  # Limit core items
-                    break
-
-        return core_items
+        # Always include at least one high-scoring item from each major category:
+        # the best-scored item per category, whatever order top_items arrives in
+        best_in_category: Dict[Any, Tuple[float, Dict[str, Any]]] = {}
+        for (item, score), category in zip(top_items, categories):
+            if score > 2.0:  # High score threshold
+                best = best_in_category.get(category)
+                if best is None or best[0] < score:
+                    best_in_category[category] = (score, item)
+
+        # Limit core items to the three best categories
+        core = heapq.nlargest(3, best_in_category.values(), key=operator.itemgetter(0))
+        return [item for score, item in core]
 
 
 # Keep the original class name for compatibility
@@ -57,12 +57,19 @@ def main():
         env = os.environ.copy()
         env["FLASK_PORT"] = "5000"
 
-        # Launch the enhanced server
-        result = subprocess.run([sys.executable, "app.py"], env=env, check=True)
+        if os.name == "nt":
+            # Windows has no real exec: os.exec* spawns a child and exits at once, so callers
+            # waiting on this launcher would return early. Run the server as a child there.
+            subprocess.run([sys.executable, "app.py"], env=env, check=True)
+        else:
+            # Replace this process with the enhanced server; it handles Ctrl+C itself.
+            # Flush first, since buffered output is lost when the process image is replaced.
+            sys.stdout.flush()
+            os.execve(sys.executable, [sys.executable, "app.py"], env)
 
     except KeyboardInterrupt:
         print("\n🛑 Server shutdown requested by user")
-    except subprocess.CalledProcessError as e:
+    except (OSError, subprocess.CalledProcessError) as e:
         print(f"❌ Error starting server: {e}")
     except Exception as e:
         print(f"❌ Unexpected error: {e}")
@@ -0,0 +1,230 @@
+"""Tests for the statistical analyzer module."""
+
+import os
+import sqlite3
+import tempfile
+import unittest
+from dataclasses import replace
+
+from divine_arsenal.backend.statistical_analyzer import (
+    GodPerformance,
+    MatchData,
+    StatisticalAnalyzer,
+)
+
+
+def make_match(match_id, items, win, god_name="Zeus", role="Mid", patch_version="OB12"):
+    """Create a match record with fixed performance numbers."""
+    return MatchData(
+        match_id=match_id,
+        god_name=god_name,
+        role=role,
+        items=items,
+        win=win,
+        kills=10,
+        deaths=2,
+        assists=8,
+        damage_dealt=45000,
+        damage_mitigated=25000,
+        healing=1000,
+        match_duration=1800,
+        enemy_comp=["Thor", "Ares"],
+        patch_version=patch_version,
+    )
+
+
+class TestStatisticalAnalyzer(unittest.TestCase):
+    """Test cases for the StatisticalAnalyzer class."""
+
+    def setUp(self):
+        """Set up an analyzer backed by a temporary database."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.analyzer = StatisticalAnalyzer(os.path.join(self.tmp_dir.name, "stats.db"))
+
+    def tearDown(self):
+        """Clean up the temporary database."""
+        self.analyzer.close()
+        self.tmp_dir.cleanup()
+
+    def test_analyze_item_synergies_finds_winning_pair(self):
+        """A pair that always wins together is reported as a synergy."""
+        matches = []
+        for i in range(20):
+            matches.append(make_match(f"pair_{i}", ["Rod of Tahuti", "Soul Reaver"], True))
+            matches.append(make_match(f"rod_{i}", ["Rod of Tahuti", "Doom Orb"], False))
+            matches.append(make_match(f"reaver_{i}", ["Soul Reaver", "Divine Ruin"], False))
+        self.analyzer.match_data.extend(matches)
+
+        synergies = self.analyzer.analyze_item_synergies(min_matches=10)
+
+        self.assertEqual(len(synergies), 1)
+        synergy = synergies[0]
+        self.assertEqual((synergy.item1, synergy.item2), ("Rod of Tahuti", "Soul Reaver"))
+        self.assertEqual(synergy.matches_analyzed, 20)
+        self.assertAlmostEqual(synergy.win_rate_boost, 50.0)
+        self.assertEqual(synergy.patch_relevant, "OB12")
+
+    def test_analyze_item_synergies_includes_ingested_matches(self):
+        """Matches added after an analysis are reflected in the next one."""
+        for i in range(10):
+            self.analyzer.ingest_match(make_match(f"pair_{i}", ["Doom Orb", "Soul Reaver"], True))
+            self.analyzer.ingest_match(make_match(f"orb_{i}", ["Doom Orb"], False))
+            self.analyzer.ingest_match(make_match(f"reaver_{i}", ["Soul Reaver"], False))
+        first = self.analyzer.analyze_item_synergies(min_matches=10)
+
+        self.analyzer.match_data.extend(
+            make_match(f"more_{i}", ["Doom Orb", "Soul Reaver"], True) for i in range(5)
+        )
+        second = self.analyzer.analyze_item_synergies(min_matches=10)
+
+        self.assertEqual([s.matches_analyzed for s in first], [10])
+        self.assertEqual([s.matches_analyzed for s in second], [15])
+
+    def test_analyze_item_synergies_after_replacing_match_data(self):
+        """A replaced match list is re-indexed rather than folded onto the old pairs."""
+        for i in range(10):
+            self.analyzer.ingest_match(make_match(f"pair_{i}", ["Doom Orb", "Soul Reaver"], True))
+            self.analyzer.ingest_match(make_match(f"orb_{i}", ["Doom Orb"], False))
+            self.analyzer.ingest_match(make_match(f"reaver_{i}", ["Soul Reaver"], False))
+        self.analyzer.analyze_item_synergies(min_matches=10)
+
+        self.analyzer.match_data = [
+            make_match(f"new_{i}", ["Doom Orb", "Soul Reaver"], False) for i in range(30)
+        ]
+
+        self.assertEqual(self.analyzer.analyze_item_synergies(min_matches=10), [])
+
+    def test_analyze_item_synergies_ignores_duplicate_items(self):
+        """Repeated items in one match do not produce self-pairs."""
+        self.analyzer.match_data.extend(
+            make_match(f"dup_{i}", ["Doom Orb", "Doom Orb"], True) for i in range(20)
+        )
+
+        self.assertEqual(self.analyzer.analyze_item_synergies(min_matches=10), [])
+
+    def test_analyze_item_synergies_without_data(self):
+        """No match data yields no synergies."""
+        self.assertEqual(self.analyzer.analyze_item_synergies(), [])
+
+    def test_predict_build_success_falls_back_to_heuristic(self):
+        """Too few matches for a god/role uses the heuristic baseline."""
+        self.analyzer.load_sample_data()
+        prediction = self.analyzer.predict_build_success(
+            "Hecate", "Mid", ["Rod of Tahuti"], ["Thor"]
+        )
+
+        self.assertEqual(prediction["win_probability"], 0.52)
+        self.assertEqual(prediction["confidence"], 30)
+
+    def test_predict_build_success_refreshes_after_new_matches(self):
+        """Memoized predictions are recomputed once more match data arrives."""
+        before = self.analyzer.predict_build_success("Zeus", "Mid", ["Doom Orb"], ["Thor"])
+        self.analyzer.match_data.extend(
+            make_match(f"zeus_{i}", ["Doom Orb"], True) for i in range(60)
+        )
+        after = self.analyzer.predict_build_success("Zeus", "Mid", ["Doom Orb"], ["Thor"])
+
+        self.assertEqual(before["confidence"], 30)
+        self.assertEqual(after["sample_size"], 60)
+        self.assertAlmostEqual(after["win_probability"], 0.9)
+        self.assertAlmostEqual(after["predicted_kda"], 9.0)
+
+    def test_predict_build_success_refreshes_after_same_length_replacement(self):
+        """Replacing match_data with as many different matches is not served from cache."""
+        self.analyzer.match_data.extend(
+            make_match(f"win_{i}", ["Doom Orb"], True) for i in range(60)
+        )
+        before = self.analyzer.predict_build_success("Zeus", "Mid", ["Doom Orb"], ["Thor"])
+
+        self.analyzer.match_data = [make_match(f"loss_{i}", ["Doom Orb"], False) for i in range(60)]
+        after = self.analyzer.predict_build_success("Zeus", "Mid", ["Doom Orb"], ["Thor"])
+
+        self.assertAlmostEqual(before["win_probability"], 0.9)
+        self.assertAlmostEqual(after["win_probability"], 0.1)
+
+    def test_store_matches_normalizes_items(self):
+        """Stored matches can be looked up by item through match_items."""
+        self.analyzer.store_matches(
+            [
+                make_match("m1", ["Doom Orb", "Soul Reaver", "Doom Orb"], True),
+                make_match("m2", ["Soul Reaver"], False),
+            ]
+        )
+        self.analyzer.store_matches([make_match("m1", ["Divine Ruin"], True)])
+
+        conn = sqlite3.connect(os.path.join(self.tmp_dir.name, "stats.db"))
+        try:
+            rows = conn.execute(
+                "SELECT match_id, item FROM match_items ORDER BY match_id, item"
+            ).fetchall()
+        finally:
+            conn.close()
+        self.assertEqual(rows, [("m1", "Divine Ruin"), ("m2", "Soul Reaver")])
+
+    def test_cluster_gods_by_playstyle_uses_first_matching_cluster(self):
+        """A god matching several clusters is only placed in the first one."""
+        for name, role, mitigated in (("Sylvanus", "Support", 35000), ("Ra", "Support", 0)):
+            self.analyzer.god_performance[name] = GodPerformance(
+                god_name=name,
+                role=role,
+                win_rate=0.55,
+                avg_kda=2.0,
+                avg_damage=20000,
+                avg_mitigated=mitigated,
+                pick_rate=0.1,
+                ban_rate=0.0,
+                matches_analyzed=100,
+                patch_version="OB12",
+                meta_tier="A",
+            )
+
+        clusters = self.analyzer.cluster_gods_by_playstyle()
+
+        self.assertEqual(clusters["sustain_tanks"], ["Sylvanus"])
+        self.assertEqual(clusters["utility_supports"], ["Ra"])
+
+    def test_cluster_gods_by_playstyle_sees_replaced_god(self):
+        """Replacing an existing god's record updates the clusters."""
+        self.analyzer.god_performance["Zeus"] = GodPerformance(
+            god_name="Zeus",
+            role="Mid",
+            win_rate=0.55,
+            avg_kda=2.0,
+            avg_damage=50000,
+            avg_mitigated=5000,
+            pick_rate=0.1,
+            ban_rate=0.0,
+            matches_analyzed=100,
+            patch_version="OB12",
+            meta_tier="A",
+        )
+        self.assertEqual(self.analyzer.cluster_gods_by_playstyle()["burst_mages"], ["Zeus"])
+
+        zeus = self.analyzer.god_performance["Zeus"]
+        self.analyzer.god_performance["Zeus"] = replace(zeus, avg_damage=10)
+
+        self.assertEqual(self.analyzer.cluster_gods_by_playstyle()["burst_mages"], [])
+
+    def test_snapshot_round_trip(self):
+        """A saved snapshot restores match data and the synergy index."""
+        for i in range(12):
+            self.analyzer.ingest_match(make_match(f"pair_{i}", ["Doom Orb", "Soul Reaver"], True))
+            self.analyzer.ingest_match(make_match(f"orb_{i}", ["Doom Orb"], False))
+        snapshot = os.path.join(self.tmp_dir.name, "snapshot")
+        self.analyzer.save_snapshot(snapshot)
+
+        restored = StatisticalAnalyzer(os.path.join(self.tmp_dir.name, "restored.db"))
+        try:
+            restored.load_snapshot(snapshot)
+            self.assertEqual(restored.match_data, self.analyzer.match_data)
+            self.assertEqual(restored._indexed_matches, 24)
+            self.assertEqual(
+                restored.analyze_item_synergies(min_matches=10),
+                self.analyzer.analyze_item_synergies(min_matches=10),
+            )
+        finally:
+            restored.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,166 @@
+"""Tests for the Tracker.gg real-time collector."""
+
+import asyncio
+import json
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from divine_arsenal.backend import tracker_realtime
+from divine_arsenal.backend.tracker_realtime import (
+    RATE_LIMIT_BACKOFF,
+    MatchData,
+    TrackerRealtimeCollector,
+)
+
+PROFILE_URL = "https://public-api.tracker.gg/v2/smite2/profile/Player"
+
+
+class FakeResponse:
+    """Minimal stand-in for an aiohttp response."""
+
+    def __init__(self, status, body=None, headers=None):
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def read(self):
+        return json.dumps(self.body).encode()
+
+    async def json(self):
+        return self.body
+
+    async def text(self):
+        return json.dumps(self.body)
+
+
+class FakeSession:
+    """Answers each get() with the next queued response and records the request headers."""
+
+    closed = False
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.request_headers = []
+
+    def get(self, url, params=None, headers=None):
+        self.request_headers.append(headers)
+        return self.responses.pop(0)
+
+
+def _match(match_id, items):
+    return MatchData(
+        match_id=match_id,
+        player_name="Player",
+        god_name="Zeus",
+        role="Mid",
+        team_players=[],
+        enemy_players=[{"playerName": "Enemy", "godName": "Ares"}],
+        detected_items={"Enemy": items},
+        match_duration=0,
+        game_mode="conquest",
+        timestamp=datetime.now(),
+    )
+
+
+class TestTrackerRealtimeCollector(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the TrackerRealtimeCollector class."""
+
+    def setUp(self):
+        """Set up a collector whose rate limiting and retry backoff never sleep."""
+        self.collector = TrackerRealtimeCollector(api_key="test")
+        self.collector._respect_rate_limit = mock.AsyncMock()
+        patcher = mock.patch.object(
+            TrackerRealtimeCollector._fetch_json.retry, "sleep", mock.AsyncMock()
+        )
+        self.retry_sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_not_modified_reuses_stored_body(self):
+        """Test that a 304 answers with the body stored from the earlier 200."""
+        body = {"data": {"currentMatch": None}}
+        session = FakeSession(
+            FakeResponse(200, body, {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024"}),
+            FakeResponse(304),
+        )
+        self.collector.session = session
+
+        self.assertEqual(await self.collector._make_api_request(PROFILE_URL), body)
+        self.assertEqual(await self.collector._make_api_request(PROFILE_URL), body)
+        self.assertEqual(session.request_headers[0], {})
+        self.assertEqual(
+            session.request_headers[1],
+            {"If-None-Match": '"v1"', "If-Modified-Since": "Mon, 01 Jan 2024"},
+        )
+
+    async def test_server_error_is_retried(self):
+        """Test that a 5xx is retried and the later success returned."""
+        body = {"data": {}}
+        self.collector.session = FakeSession(FakeResponse(503), FakeResponse(200, body))
+
+        self.assertEqual(await self.collector._make_api_request(PROFILE_URL), body)
+        self.assertEqual(self.retry_sleep.await_count, 1)
+
+    async def test_rate_limit_waits_full_window(self):
+        """Test that a 429 is retried after the rate limit backoff."""
+        body = {"data": {}}
+        self.collector.session = FakeSession(FakeResponse(429), FakeResponse(200, body))
+
+        self.assertEqual(await self.collector._make_api_request(PROFILE_URL), body)
+        self.retry_sleep.assert_awaited_once_with(RATE_LIMIT_BACKOFF)
+
+    async def test_exhausted_retries_return_none(self):
+        """Test that None comes back once every attempt has failed."""
+        session = FakeSession(FakeResponse(500), FakeResponse(429), FakeResponse(502))
+        self.collector.session = session
+
+        self.assertIsNone(await self.collector._make_api_request(PROFILE_URL))
+        self.assertEqual(len(session.request_headers), self.collector.max_retries)
+        self.assertEqual(session.responses, [])
+
+    async def test_client_error_is_not_retried(self):
+        """Test that a 4xx other than 429 gives up straight away."""
+        session = FakeSession(FakeResponse(404, {"errors": []}), FakeResponse(200, {}))
+        self.collector.session = session
+
+        self.assertIsNone(await self.collector._make_api_request(PROFILE_URL))
+        self.retry_sleep.assert_not_awaited()
+        self.assertEqual(len(session.responses), 1)
+
+    async def test_unchanged_match_skips_callback(self):
+        """Test that the callback only fires when the match or its items change."""
+        polls = [
+            _match("m1", ["Boots"]),
+            _match("m1", ["Boots"]),
+            _match("m1", ["Boots", "Rod of Tahuti"]),
+            _match("m1", ["Boots", "Rod of Tahuti"]),
+            _match("m2", ["Boots", "Rod of Tahuti"]),
+            asyncio.CancelledError(),
+        ]
+        self.collector.get_player_current_match = mock.AsyncMock(side_effect=polls)
+        callback = mock.Mock()
+        no_wait = dict.fromkeys(tracker_realtime._PHASE_POLLING_INTERVALS, 0)
+
+        with mock.patch.dict(tracker_realtime._PHASE_POLLING_INTERVALS, no_wait):
+            with self.assertRaises(asyncio.CancelledError):
+                await self.collector.start_realtime_monitoring("Player", callback)
+
+        updates = [call.args[0]["match_data"] for call in callback.call_args_list]
+        self.assertEqual(
+            [(match.match_id, match.detected_items["Enemy"]) for match in updates],
+            [
+                ("m1", ["Boots"]),
+                ("m1", ["Boots", "Rod of Tahuti"]),
+                ("m2", ["Boots", "Rod of Tahuti"]),
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+"""Tests for the SQLite user authentication module."""
+
+import hashlib
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from divine_arsenal.backend.user_auth import UserAuth
+
+
+class TestUserAuth(unittest.TestCase):
+    """Test cases for the UserAuth class."""
+
+    def setUp(self):
+        """Set up an auth store backed by a temporary database."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.auth = UserAuth(os.path.join(self.tmp_dir.name, "auth.db"))
+
+    def tearDown(self):
+        """Close connections and remove the temporary database."""
+        self.auth.cleanup()
+        self.tmp_dir.cleanup()
+
+    def test_register_and_authenticate(self):
+        """A registered user can log in only with the right password."""
+        registered = self.auth.register_user("hel_main", "hel@example.com", "s3cret")
+        self.assertTrue(registered["success"])
+
+        self.assertTrue(self.auth.authenticate_with_credentials("hel_main", "s3cret")["success"])
+        self.assertEqual(
+            self.auth.authenticate_with_credentials("hel_main", "wrong"),
+            {"error": "Invalid username or password"},
+        )
+
+    def test_legacy_sha256_hash_is_upgraded_on_login(self):
+        """Accounts stored with an unsalted SHA-256 hash move to bcrypt after login."""
+        user_id = self.auth.register_user("old_timer", "old@example.com", "hunter2")["user"][
+            "user_id"
+        ]
+        legacy_hash = hashlib.sha256(b"hunter2").hexdigest()
+        with self.auth._write() as conn:
+            conn.execute(
+                "UPDATE users SET password_hash = ? WHERE user_id = ?", (legacy_hash, user_id)
+            )
+
+        self.assertTrue(self.auth.authenticate_with_credentials("old_timer", "hunter2")["success"])
+
+        with self.auth._read() as conn:
+            stored = conn.execute(
+                "SELECT password_hash FROM users WHERE user_id = ?", (user_id,)
+            ).fetchone()[0]
+        self.assertTrue(stored.startswith("$2"))
+        self.assertTrue(self.auth.authenticate_with_credentials("old_timer", "hunter2")["success"])
+
+    def test_validate_token_reflects_status_changes(self):
+        """A cached token still returns the user's current status."""
+        result = self.auth.register_user("ra_main", "ra@example.com", "pw")
+        token = result["token"]
+
+        self.assertEqual(self.auth.validate_token(token)["status"], "online")
+        self.auth.set_user_online(result["user"]["user_id"], "busy")
+        self.assertEqual(self.auth.validate_token(token)["status"], "busy")
+
+        self.assertTrue(self.auth.logout(token))
+        self.assertIsNone(self.auth.validate_token(token))
+
+    def test_logout_through_another_instance_revokes_cached_token(self):
+        """A token cached by one instance is rejected once another logs it out."""
+        db_path = os.path.join(self.tmp_dir.name, "shared.db")
+        with mock.patch.dict(os.environ, {"JWT_SECRET_KEY": "a" * 64}):
+            issuer = UserAuth(db_path)
+            validator = UserAuth(db_path)
+        try:
+            token = issuer.register_user("thor_main", "thor@example.com", "pw")["token"]
+            self.assertEqual(validator.validate_token(token)["username"], "thor_main")
+
+            self.assertTrue(issuer.logout(token))
+            self.assertIsNone(validator.validate_token(token))
+        finally:
+            issuer.cleanup()
+            validator.cleanup()
+
+
+if __name__ == "__main__":
+    unittest.main()
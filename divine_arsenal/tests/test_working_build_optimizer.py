@@ -0,0 +1,227 @@
+"""Tests for the professional build optimizer's scoring and selection path."""
+
+import copy
+import unittest
+
+import numpy as np
+
+from divine_arsenal.backend.working_build_optimizer import ProfessionalBuildOptimizer
+
+GODS = {
+    "Zeus": {
+        "name": "Zeus",
+        "role": "Mage",
+        "damage_type": "Magical",
+        "stats": {"intelligence": 3},
+    },
+}
+
+ITEMS = [
+    {
+        "name": "Book of Thoth",
+        "cost": 2700,
+        "category": "Magical",
+        "tags": ["Magical"],
+        "stats": {"magical_power": 80, "mana": 200},
+    },
+    {
+        "name": "Rod of Tahuti",
+        "cost": 3000,
+        "category": "Magical",
+        "tags": ["Magical", "Power"],
+        "stats": {"magical_power": 120},
+    },
+    {
+        "name": "Spear of Desolation",
+        "cost": 2600,
+        "category": "Magical",
+        "tags": ["Magical", "Penetration"],
+        "stats": {"magical_power": 80, "penetration": 10},
+    },
+    {
+        "name": "Divine Ruin",
+        "cost": 2300,
+        "category": "Magical",
+        "tags": ["Magical"],
+        "stats": {"magical_power": 50},
+    },
+    {
+        "name": "Breastplate of Valor",
+        "cost": 2300,
+        "category": "Defense",
+        "tags": ["Physical"],
+        "stats": {"physical_protection": 60, "mana": 200},
+    },
+    {
+        "name": "Genji's Guard",
+        "cost": 2300,
+        "category": "Defense",
+        "tags": ["Magical"],
+        "stats": {"magical_protection": 60},
+    },
+    {
+        "name": "Deathbringer",
+        "cost": 3000,
+        "category": "Physical",
+        "tags": ["Physical", "Power"],
+        "stats": {"physical_power": 50, "crit_chance": 20},
+    },
+    {
+        "name": "Sacrificial Shroud",
+        "cost": 700,
+        "category": "Starter",
+        "tags": ["Magical"],
+        "stats": {"magical_power": 20},
+    },
+    {"name": "Purification Beads", "cost": 0, "category": "Relic", "tags": [], "stats": {}},
+    {
+        "name": "Healing Potion",
+        "cost": 50,
+        "category": "Consumable",
+        "tags": [],
+        "stats": {"health": 100},
+    },
+]
+
+
+class FakeDatabase:
+    """Serves the fixture gods and a fresh copy of the fixture catalog."""
+
+    def get_god(self, name):
+        return GODS.get(name)
+
+    def get_all_items(self):
+        return copy.deepcopy(ITEMS)
+
+
+def _item(name, category):
+    return {"name": name, "category": category}
+
+
+def _names(items):
+    return [item["name"] for item in items]
+
+
+class TestProfessionalBuildOptimizer(unittest.TestCase):
+    """Test cases for the ProfessionalBuildOptimizer class."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up one optimizer over the fixture catalog."""
+        cls.optimizer = ProfessionalBuildOptimizer(FakeDatabase())
+
+    def test_optimize_build_fixture_catalog(self):
+        """Test the build picked for a mid-lane mage from the fixture catalog."""
+        result = self.optimizer.optimize_build("Zeus", "Mid")
+
+        self.assertEqual(
+            [item["item_name"] for item in result["items"]],
+            [
+                "Book of Thoth",
+                "Genji's Guard",
+                "Spear of Desolation",
+                "Rod of Tahuti",
+                "Divine Ruin",
+            ],
+        )
+        self.assertEqual(
+            result["build_order"],
+            [
+                "Genji's Guard",
+                "Divine Ruin",
+                "Spear of Desolation",
+                "Book of Thoth",
+                "Rod of Tahuti",
+            ],
+        )
+        self.assertEqual(result["total_cost"], 12900)
+        self.assertEqual(
+            result["counters"],
+            {
+                "strong_against": ["Healing compositions", "Magical damage dealers"],
+                "weak_against": [],
+                "counter_items_needed": [],
+            },
+        )
+        self.assertAlmostEqual(result["synergy_score"], 0.642)
+
+    def test_optimize_build_support_takes_starter(self):
+        """Test that a support build opens with the starter item."""
+        result = self.optimizer.optimize_build("Zeus", "Support", enemy_comp=["Ares"])
+
+        self.assertEqual(result["build_order"][0], "Sacrificial Shroud")
+        self.assertEqual(len(result["items"]), 6)
+        self.assertEqual(result["total_cost"], 13600)
+
+    def test_optimize_build_unknown_god(self):
+        """Test that an unknown god is reported instead of built for."""
+        result = self.optimizer.optimize_build("Nobody", "Mid")
+        self.assertEqual(result, {"error": "God 'Nobody' not found"})
+
+    def test_top_scored_keeps_ties_in_item_order(self):
+        """Test that equal scores come back in the order the items were given."""
+        items = [_item(name, "Magical") for name in "abcde"]
+        scores = np.array([1.0, 3.0, 3.0, 2.0, 3.0])
+
+        top_two = ProfessionalBuildOptimizer._top_scored(items, scores, 2)
+        self.assertEqual(
+            [(item["name"], score) for item, score in top_two], [("b", 3.0), ("c", 3.0)]
+        )
+
+        everything = ProfessionalBuildOptimizer._top_scored(items, scores, 10)
+        self.assertEqual([item["name"] for item, score in everything], ["b", "c", "e", "d", "a"])
+
+    def test_role_core_items_best_per_category(self):
+        """Test that core items are the best item of the three best categories."""
+        top_items = [
+            (_item("staff", "Magical"), 2.5),
+            (_item("tome", "Magical"), 4.0),
+            (_item("blade", "Physical"), 3.0),
+            (_item("shield", "Defense"), 2.2),
+            (_item("charm", "Utility"), 2.1),
+            (_item("bow", "Hybrid"), 1.5),
+        ]
+        categories = [item["category"] for item, score in top_items]
+
+        core = self.optimizer._get_role_core_items(top_items, categories)
+        self.assertEqual(_names(core), ["tome", "blade", "shield"])
+
+    def test_select_diverse_items_order(self):
+        """Test core items first, then new categories, then the best spares."""
+        scored = [
+            (_item("A", "Magical"), 5.0),
+            (_item("B", "Magical"), 4.0),
+            (_item("C", "Physical"), 3.0),
+            (_item("D", "Defense"), 1.0),
+            (_item("F", "Hybrid"), 0.8),
+            (_item("E", "Magical"), 0.5),
+        ]
+
+        self.assertEqual(
+            _names(self.optimizer._select_diverse_items(scored, 6)), ["A", "C", "D", "F", "B", "E"]
+        )
+        self.assertEqual(_names(self.optimizer._select_diverse_items(scored, 3)), ["A", "C", "D"])
+        self.assertEqual(_names(self.optimizer._select_diverse_items(scored, 1)), ["A"])
+        self.assertEqual(self.optimizer._select_diverse_items([], 6), [])
+
+    def test_analyze_counters_returns_independent_copies(self):
+        """Test that mutating cached counter results does not leak into later calls."""
+        items = [
+            {"name": "Divine Ruin", "stats": {}},
+            {"name": "Rod of Tahuti", "stats": {"magical_power": 120}},
+            {"name": "Genji's Guard", "stats": {"magical_protection": 60}},
+        ]
+        enemies = ["Aphrodite healer"]
+
+        first = self.optimizer._analyze_counters(items, enemies)
+        expected = copy.deepcopy(first)
+        first["strong_against"].append("Everything")
+        first["weak_against"].clear()
+
+        second = self.optimizer._analyze_counters(list(reversed(items)), enemies)
+        self.assertEqual(second, expected)
+        self.assertEqual(second, self.optimizer._scan_counters(items, enemies))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,6 +4,7 @@ Divine Arsenal System Status Checker
 Checks the health and structure of the divine-arsenal system after cleanup
 """
 
+import os
 import sys
 from pathlib import Path
 
@@ -42,10 +43,14 @@ def check_system_status():
     missing_files = []
     total_size = 0
 
+    # One directory listing serves every file and directory check below
+    with os.scandir(backend_path) as it:
+        backend_entries = {entry.name: entry for entry in it}
+
     for file_name, description in essential_files.items():
-        file_path = backend_path / file_name
-        if file_path.exists():
-            size = file_path.stat().st_size / 1024  # KB
+        entry = backend_entries.get(file_name)
+        if entry is not None:
+            size = entry.stat().st_size / 1024  # KB
             total_size += size
             print(f"  ✅ {file_name:<35} ({size:6.1f} KB) - {description}")
         else:
@@ -59,9 +64,11 @@ def check_system_status():
     missing_dirs = []
 
     for dir_name, description in essential_dirs.items():
-        dir_path = backend_path / dir_name
-        if dir_path.exists():
-            file_count = len(list(dir_path.glob("*")))
+        entry = backend_entries.get(dir_name)
+        if entry is not None and entry.is_dir():
+            # Count like glob("*"), which skips hidden entries
+            with os.scandir(entry.path) as it:
+                file_count = sum(1 for child in it if not child.name.startswith("."))
             print(f"  ✅ {dir_name:<15} ({file_count} files) - {description}")
         else:
             print(f"  ❌ {dir_name:<15} (MISSING) - {description}")
@@ -70,10 +77,10 @@ def check_system_status():
     # Check data directory
     data_path = divine_path / "data"
     if data_path.exists():
-        gods_file = data_path / "gods.json"
-        items_file = data_path / "items.json"
-        gods_exists = gods_file.exists()
-        items_exists = items_file.exists()
+        with os.scandir(data_path) as it:
+            data_names = {entry.name for entry in it}
+        gods_exists = "gods.json" in data_names
+        items_exists = "items.json" in data_names
         print(f"\n✅ DATA FILES CHECK:")
         print(f"  {'✅' if gods_exists else '❌'} gods.json - Gods data")
         print(f"  {'✅' if items_exists else '❌'} items.json - Items data")